@@ -0,0 +1,67 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from app.core.config import settings
+from app.core.db import ReadSessionLocal
+
+# Shared pool for running independent queries of one request in parallel.
+# Every worker holds a DB connection while it runs, so in queue mode the
+# pool never outgrows the connection pool. A task only goes to the pool
+# when a worker is free (a slot); otherwise the request runs it itself, so
+# requests never queue behind another request's fan-out.
+
+
+def fanout_workers():
+    workers = settings.DB_FANOUT_WORKERS
+    if settings.DB_POOL_MODE == "queue":
+        workers = min(workers, settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW)
+    return max(0, workers)
+
+
+_workers = fanout_workers()
+_executor = ThreadPoolExecutor(max_workers=max(1, _workers), thread_name_prefix="db-fanout")
+_slots = threading.BoundedSemaphore(max(1, _workers))
+
+
+def _run_with_session(fn):
+    db = ReadSessionLocal()
+    try:
+        return fn(db)
+    finally:
+        db.close()
+
+
+def _run_in_slot(fn):
+    try:
+        return _run_with_session(fn)
+    finally:
+        _slots.release()
+
+
+def run_in_sessions(tasks: dict):
+    """
+    Run each `fn(db)` in `tasks` concurrently, every one with its own read-only session.
+    Returns the results under the same keys. The calling thread takes the first
+    task; the others go to free pool workers (at most DB_FANOUT_PER_REQUEST) and
+    whatever finds no free worker runs in the calling thread too. Latency is
+    max() of the tasks when the pool is idle and degrades towards sum() under
+    load instead of waiting in a queue; with DB_FANOUT_WORKERS <= 1 they simply
+    run in order.
+    """
+    items = list(tasks.items())
+    if _workers <= 1 or len(items) <= 1:
+        return {key: _run_with_session(fn) for key, fn in items}
+
+    futures, inline = {}, [items[0]]
+    budget = settings.DB_FANOUT_PER_REQUEST
+    for key, fn in items[1:]:
+        if len(futures) < budget and _slots.acquire(blocking=False):
+            futures[key] = _executor.submit(_run_in_slot, fn)
+        else:
+            inline.append((key, fn))
+
+    try:
+        results = {key: _run_with_session(fn) for key, fn in inline}
+    finally:
+        wait(futures.values())  # an inline failure still lets the workers finish first
+    results.update({key: future.result() for key, future in futures.items()})
+    return {key: results[key] for key, _ in items}
@@ -1,8 +1,73 @@
+from typing import Literal
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     DATABASE_URL: str
 
+    # Optional read replica: GET endpoints read from here, loaders write to DATABASE_URL
+    DATABASE_REPLICA_URL: str | None = None
+    # Read sessions run SET TRANSACTION READ ONLY (PostgreSQL)
+    DB_READ_ONLY_SESSIONS: bool = True
+    DB_READ_ONLY_DEFERRABLE: bool = False
+
+    # Connection pool
+    # "serverless" -> NullPool, pooling is done by the proxy (Neon pooler / PgBouncer)
+    # "queue"      -> QueuePool, warm connections kept inside the process
+    DB_POOL_MODE: Literal["serverless", "queue"] = "serverless"
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+
+    # Async stack: async handlers for the hot routers over asyncpg
+    DB_ASYNC_ENABLED: bool = False
+
+    # Parallel per-request queries (search / journey fan-out), one connection each.
+    # DB_FANOUT_WORKERS: process-wide worker threads (capped at DB_POOL_SIZE +
+    # DB_MAX_OVERFLOW in queue mode); DB_FANOUT_PER_REQUEST: workers one request
+    # may take. Tasks that find no free worker run in the request thread.
+    DB_FANOUT_WORKERS: int = 12
+    DB_FANOUT_PER_REQUEST: int = 5
+
+    # Global search: "auto" uses pg_trgm on PostgreSQL, the in-process index elsewhere
+    SEARCH_BACKEND: Literal["auto", "postgres", "memory"] = "auto"
+    SEARCH_INDEX_TTL: int = 300
+
+    # Cached model metadata: seconds between dataset version checks
+    DATASET_VERSION_CHECK_INTERVAL: int = 30
+
+    # Serve /wp and /ep from an in-memory snapshot of the prediction tables
+    PREDICTION_SNAPSHOT_ENABLED: bool = False
+
+    # Response cache for GET endpoints ("memory" or "package.module:factory")
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_BACKEND: str = "memory"
+    RESPONSE_CACHE_MAX_ENTRIES: int = 1024
+    RESPONSE_CACHE_TTL: int = 600
+
+    # Startup
+    # routers to register, comma separated names from app.main.ROUTERS ("*" = all);
+    # a function that only serves /wp can skip importing the rest
+    APP_ROUTERS: str = "*"
+    # pre-open the pool (queue mode) and fill the metadata caches before serving
+    STARTUP_WARMUP: bool = False
+    # run app.scripts.migrate in the lifespan hook (local development; deployments
+    # run `python -m app.scripts.migrate` as a release step)
+    DB_MIGRATE_ON_STARTUP: bool = False
+
+    # Win probability model artifact for app.scripts.rescore_wp and POST /wp/simulate
+    # (.json linear export, or a pickled estimator with predict_proba)
+    WP_MODEL_PATH: str | None = None
+    # scenario results kept by POST /wp/simulate (LRU)
+    WP_SIMULATION_CACHE_SIZE: int = 50_000
+
+    # Loader scripts
+    LOAD_BATCH_SIZE: int = 5000
+    LOAD_MODE: Literal["upsert", "append"] = "upsert"
+    # keep the full pipeline row in ep_predictions.raw_json (backup only, never served)
+    EP_STORE_RAW_JSON: bool = False
+
     class Config:
         env_file = ".env"
 
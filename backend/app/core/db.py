@@ -1,29 +1,254 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
-from sqlalchemy.pool import NullPool
+import threading
+import time
+from sqlalchemy import create_engine, event, exc
+from sqlalchemy.engine import make_url
+from fastapi import Request
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
+from sqlalchemy.pool import NullPool, QueuePool
 from app.core.config import settings
 
 # DATABASE URL
 DATABASE_URL = settings.DATABASE_URL
 
-# Create engine (Neon requires NullPool to avoid timeout)
-engine = create_engine(
-    DATABASE_URL,
-    poolclass=NullPool,
-    echo=False,
-    future=True
-)
 
-# Session
+# ============================================================
+# Pool metrics (checkout count, wait time, timeouts)
+# ============================================================
+class PoolMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def record_wait(self, seconds: float):
+        with self._lock:
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+
+    def incr(self, name: str):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def attach(self, engine):
+        event.listen(engine, "connect", lambda *_: self.incr("connects"))
+        event.listen(engine, "checkout", lambda *_: self.incr("checkouts"))
+        event.listen(engine, "checkin", lambda *_: self.incr("checkins"))
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "timeouts": self.timeouts,
+                "wait_total_ms": round(self.wait_total * 1000, 3),
+                "wait_avg_ms": round(self.wait_total * 1000 / self.checkouts, 3) if self.checkouts else 0.0,
+                "wait_max_ms": round(self.wait_max * 1000, 3),
+            }
+
+
+class _MeteredPoolMixin:
+    """Measures how long a checkout waits for a connection (queue wait + connect)."""
+    metrics: PoolMetrics
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.incr("timeouts")
+            raise
+        finally:
+            self.metrics.record_wait(time.perf_counter() - start)
+
+
+def _metered(pool_cls, metrics: PoolMetrics):
+    # class attribute so the metrics survive pool.recreate() / engine.dispose()
+    return type(f"Metered{pool_cls.__name__}", (_MeteredPoolMixin, pool_cls), {"metrics": metrics})
+
+
+def build_engine(url: str, metrics: PoolMetrics):
+    if settings.DB_POOL_MODE == "queue":
+        pool_kwargs = {
+            "poolclass": _metered(QueuePool, metrics),
+            "pool_size": settings.DB_POOL_SIZE,
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+            "pool_timeout": settings.DB_POOL_TIMEOUT,
+            "pool_recycle": settings.DB_POOL_RECYCLE,
+            "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        }
+    else:
+        # Serverless proxy (Neon requires NullPool to avoid timeout)
+        pool_kwargs = {"poolclass": _metered(NullPool, metrics)}
+
+    new_engine = create_engine(url, echo=False, future=True, **pool_kwargs)
+    metrics.attach(new_engine)
+    return new_engine
+
+
+# Create engine (primary)
+pool_metrics = PoolMetrics()
+engine = build_engine(DATABASE_URL, pool_metrics)
+
+# Read engine: the replica when DATABASE_REPLICA_URL is set, else the primary
+if settings.DATABASE_REPLICA_URL:
+    replica_pool_metrics = PoolMetrics()
+    read_engine = build_engine(settings.DATABASE_REPLICA_URL, replica_pool_metrics)
+else:
+    replica_pool_metrics = None
+    read_engine = engine
+
+
+# ============================================================
+# Sessions
+#   SessionLocal     : read-write, primary (loaders, migrations)
+#   ReadSessionLocal : read-only transactions on the read engine
+# ============================================================
+class ReadOnlySession(Session):
+    """Session whose transactions are opened READ ONLY (PostgreSQL)."""
+
+
+def _begin_read_only(session, transaction, connection):
+    if not settings.DB_READ_ONLY_SESSIONS or connection.dialect.name != "postgresql":
+        return
+    mode = "READ ONLY, DEFERRABLE" if settings.DB_READ_ONLY_DEFERRABLE else "READ ONLY"
+    connection.exec_driver_sql(f"SET TRANSACTION {mode}")
+
+
+event.listen(ReadOnlySession, "after_begin", _begin_read_only)
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine, class_=ReadOnlySession)
 
 # Base Model
 Base = declarative_base()
 
-# Dependency for FastAPI
-def get_db():
-    db = SessionLocal()
+
+def _session_scope(factory):
+    db = factory()
     try:
         yield db
     finally:
         db.close()
+
+
+# Dependency for FastAPI: GET/HEAD -> read-only session on the read engine,
+# anything else -> primary
+def get_db(request: Request):
+    read = request.method in ("GET", "HEAD")
+    yield from _session_scope(ReadSessionLocal if read else SessionLocal)
+
+
+# For read-only endpoints that are not GET (e.g. batch lookups sent as POST)
+def get_read_db():
+    yield from _session_scope(ReadSessionLocal)
+
+
+# ============================================================
+# Async engine (asyncpg), only built when DB_ASYNC_ENABLED.
+# sqlalchemy.ext.asyncio needs greenlet, so it is imported lazily.
+# ============================================================
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+# libpq URL options asyncpg does not accept as keyword arguments
+LIBPQ_ONLY_OPTIONS = ("sslmode", "channel_binding")
+
+
+def async_database_url(url: str):
+    """
+    Sync URL -> (async URL, connect_args).
+    postgresql://u:p@host/db?sslmode=require&channel_binding=require
+    -> postgresql+asyncpg://u:p@host/db, {"ssl": "require"}
+    """
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for '{backend}'")
+
+    connect_args = {}
+    sslmode = parsed.query.get("sslmode")
+    if backend == "postgresql" and sslmode and sslmode != "disable":
+        connect_args["ssl"] = sslmode
+    query = {k: v for k, v in parsed.query.items() if k not in LIBPQ_ONLY_OPTIONS}
+
+    async_url = parsed.set(drivername=ASYNC_DRIVERS[backend], query=query)
+    return async_url.render_as_string(hide_password=False), connect_args
+
+
+def build_async_engine(url: str):
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    async_url, connect_args = async_database_url(url)
+    if settings.DB_POOL_MODE == "queue":
+        pool_kwargs = {
+            "pool_size": settings.DB_POOL_SIZE,
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+            "pool_timeout": settings.DB_POOL_TIMEOUT,
+            "pool_recycle": settings.DB_POOL_RECYCLE,
+            "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        }
+    else:
+        pool_kwargs = {"poolclass": NullPool}
+
+    return create_async_engine(async_url, echo=False, connect_args=connect_args, **pool_kwargs)
+
+
+_async_engine = None
+_async_sessionmaker = None
+_async_lock = threading.Lock()
+
+
+def get_async_sessionmaker():
+    global _async_engine, _async_sessionmaker
+    with _async_lock:
+        if _async_sessionmaker is None:
+            from sqlalchemy.ext.asyncio import async_sessionmaker
+
+            # the async routers only read: replica + read-only transactions
+            _async_engine = build_async_engine(settings.DATABASE_REPLICA_URL or DATABASE_URL)
+            _async_sessionmaker = async_sessionmaker(
+                _async_engine, autoflush=False, expire_on_commit=False, sync_session_class=ReadOnlySession,
+            )
+        return _async_sessionmaker
+
+
+# Async dependency for FastAPI
+async def get_async_db():
+    async with get_async_sessionmaker()() as db:
+        yield db
+
+
+async def dispose_async_engine():
+    if _async_engine is not None:
+        await _async_engine.dispose()
+
+
+def _engine_status(target, metrics: PoolMetrics):
+    pool = target.pool
+    status = {
+        "mode": settings.DB_POOL_MODE,
+        "pool": pool.status(),
+        "metrics": metrics.snapshot(),
+    }
+    if isinstance(pool, QueuePool):
+        status.update({
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+        })
+    return status
+
+
+def get_pool_status():
+    status = _engine_status(engine, pool_metrics)
+    if replica_pool_metrics is not None:
+        status["replica"] = _engine_status(read_engine, replica_pool_metrics)
+    return status
@@ -0,0 +1,228 @@
+import hashlib
+import importlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from email.utils import format_datetime, parsedate_to_datetime
+from datetime import timezone
+from starlette.concurrency import run_in_threadpool
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import Response
+from app.core.config import settings
+from app.services import version_service
+
+# ============================================================
+# Response cache for the read-only GET endpoints.
+# Key: route + query string + versions of the datasets behind the
+# route, so a loader run (version bump) makes every old entry
+# unreachable. Responses carry a strong ETag; If-None-Match /
+# If-Modified-Since are answered with 304 Not Modified.
+# ============================================================
+
+# path prefix -> datasets the response is built from
+ROUTE_DATASETS = {
+    "/orientasi": (version_service.SHEETS,),
+    "/pelaksanaan": (version_service.SHEETS,),
+    "/kinerja": (version_service.SHEETS,),
+    "/evaluasi": (version_service.SHEETS,),
+    "/pengembangan": (version_service.SHEETS,),
+    "/project": (version_service.SHEETS,),
+    "/search": (version_service.SHEETS,),
+    "/stats": (version_service.SHEETS,),
+    "/journey": (version_service.SHEETS, version_service.WP, version_service.EP),
+    "/wp": (version_service.WP,),
+    "/ep": (version_service.EP,),
+    "/fi": (version_service.FI,),
+}
+
+# response headers stored with the body
+KEPT_HEADERS = ("content-type", "x-total-count", "x-next-cursor")
+
+
+@dataclass
+class CachedResponse:
+    body: bytes
+    headers: dict
+    etag: str
+    last_modified: str | None
+
+
+# ------------------------------------------------
+# Backends
+# ------------------------------------------------
+
+class MemoryBackend:
+    """In-process LRU with a per-entry TTL."""
+
+    def __init__(self, max_entries: int = 1024, ttl: int = 600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key: str):
+        with self.lock:
+            item = self.entries.get(key)
+            if item is None:
+                return None
+            expires, value = item
+            if expires < time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: CachedResponse):
+        with self.lock:
+            self.entries[key] = (time.monotonic() + self.ttl, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+def load_backend(spec: str):
+    """
+    "memory" or "package.module:factory". The factory is called without
+    arguments and must return an object with get(key) / set(key, value) / clear().
+    """
+    if spec == "memory":
+        return MemoryBackend(settings.RESPONSE_CACHE_MAX_ENTRIES, settings.RESPONSE_CACHE_TTL)
+    module_name, _, attr = spec.partition(":")
+    return getattr(importlib.import_module(module_name), attr)()
+
+
+_backend = None
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        _backend = load_backend(settings.RESPONSE_CACHE_BACKEND)
+    return _backend
+
+
+def set_backend(backend):
+    global _backend
+    _backend = backend
+
+
+def clear_response_cache():
+    get_backend().clear()
+
+
+# ------------------------------------------------
+# Helpers
+# ------------------------------------------------
+
+def route_datasets(path: str):
+    for prefix, datasets in ROUTE_DATASETS.items():
+        if path == prefix or path.startswith(prefix + "/"):
+            return datasets
+    return None
+
+
+def strong_etag(body: bytes):
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def last_modified(datasets):
+    stamps = [version_service.dataset_updated_at(d) for d in datasets]
+    stamps = [s for s in stamps if s is not None]
+    if not stamps:
+        return None
+    latest = max(stamps)
+    if latest.tzinfo is None:
+        latest = latest.replace(tzinfo=timezone.utc)
+    return format_datetime(latest, usegmt=True)
+
+
+def is_not_modified(request, entry: CachedResponse):
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [t.strip() for t in if_none_match.split(",")]
+        return "*" in tags or entry.etag in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and entry.last_modified:
+        try:
+            return parsedate_to_datetime(entry.last_modified) <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def validator_headers(entry: CachedResponse):
+    headers = {"ETag": entry.etag, "Cache-Control": "no-cache"}
+    if entry.last_modified:
+        headers["Last-Modified"] = entry.last_modified
+    return headers
+
+
+def build_response(request, entry: CachedResponse, status: str):
+    headers = validator_headers(entry)
+    headers["X-Cache"] = status
+    if is_not_modified(request, entry):
+        return Response(status_code=304, headers=headers)
+    headers.update(entry.headers)
+    return Response(content=entry.body, headers=headers)
+
+
+def is_cacheable(request):
+    if request.method != "GET":
+        return False
+    if "application/x-ndjson" in request.headers.get("accept", ""):
+        return False
+    if request.query_params.get("stream", "").lower() in ("1", "true", "yes", "on"):
+        return False
+    return True
+
+
+# ------------------------------------------------
+# Middleware
+# ------------------------------------------------
+
+class ResponseCacheMiddleware(BaseHTTPMiddleware):
+    def __init__(self, app):
+        super().__init__(app)
+        self.seen_versions = None
+
+    async def dispatch(self, request, call_next):
+        datasets = route_datasets(request.url.path)
+        if datasets is None or not is_cacheable(request):
+            return await call_next(request)
+
+        versions = await run_in_threadpool(version_service.dataset_versions)
+        backend = get_backend()
+        if versions != self.seen_versions:
+            # a loader ran: old entries can never be hit again
+            backend.clear()
+            self.seen_versions = dict(versions)
+
+        key = "|".join([
+            request.url.path,
+            str(sorted(request.query_params.multi_items())),
+            *(f"{d}={versions.get(d, 0)}" for d in datasets),
+        ])
+
+        entry = backend.get(key)
+        if entry is not None:
+            return build_response(request, entry, "HIT")
+
+        response = await call_next(request)
+        if response.status_code != 200 or "application/x-ndjson" in response.headers.get("content-type", ""):
+            return response
+
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        entry = CachedResponse(
+            body=body,
+            headers={k: v for k, v in response.headers.items() if k in KEPT_HEADERS},
+            etag=strong_etag(body),
+            last_modified=last_modified(datasets),
+        )
+        backend.set(key, entry)
+        return build_response(request, entry, "MISS")
@@ -1,20 +1,85 @@
+import importlib
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from app.routers.feature_importance import router as fi_router
-from app.routers.win_probability import router as wp_router
-from app.routers.evaluation_prediction_router import router as ep_router
-from app.routers.orientasi_router import router as ori_router
-from app.routers.pelaksanaan_router import router as pel_router
-from app.routers.kinerja_router import router as kin_router
-from app.routers.evaluasi_router import router as eva_router
-from app.routers.pengembangan_router import router as peng_router
-from app.routers.project_router import router as proj_router
-from app.routers.search_router import router as search_router
-from app.core.db import Base, engine
+from starlette.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.core.response_cache import ResponseCacheMiddleware
+from app.utils.pagination import PAGE_HEADERS
+from app.utils.serialization import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 
-Base.metadata.create_all(bind=engine)
+# Schema changes are not applied at import any more: run
+# `python -m app.scripts.migrate` before starting the server
+# (or set DB_MIGRATE_ON_STARTUP for local development).
 
-app = FastAPI(title="KAMs Journey Backend")
+# ============================================================
+# Routers: name -> module, imported only when enabled (APP_ROUTERS)
+# ============================================================
+ROUTERS = {
+    "fi": "app.routers.feature_importance",
+    "wp": "app.routers.win_probability",
+    "ep": "app.routers.evaluation_prediction_router",
+    "orientasi": "app.routers.orientasi_router",
+    "pelaksanaan": "app.routers.pelaksanaan_router",
+    "kinerja": "app.routers.kinerja_router",
+    "evaluasi": "app.routers.evaluasi_router",
+    "pengembangan": "app.routers.pengembangan_router",
+    "project": "app.routers.project_router",
+    "search": "app.routers.search_router",
+    "stats": "app.routers.stats_router",
+    "journey": "app.routers.journey_router",
+    "health": "app.routers.health_router",
+}
+
+# hot routers: async handlers over asyncpg when DB_ASYNC_ENABLED
+ASYNC_ROUTERS = {
+    "wp": "app.routers.win_probability_async",
+    "ep": "app.routers.evaluation_prediction_router_async",
+    "project": "app.routers.project_router_async",
+    "search": "app.routers.search_router_async",
+}
+
+
+def enabled_routers():
+    names = [n.strip() for n in settings.APP_ROUTERS.split(",") if n.strip()]
+    if not names or "*" in names:
+        return list(ROUTERS)
+    unknown = [n for n in names if n not in ROUTERS]
+    if unknown:
+        raise ValueError(f"Unknown router(s) in APP_ROUTERS: {', '.join(unknown)}")
+    return names
+
+
+def include_routers(app: FastAPI):
+    for name in enabled_routers():
+        module = ROUTERS[name]
+        if settings.DB_ASYNC_ENABLED:
+            module = ASYNC_ROUTERS.get(name, module)
+        app.include_router(importlib.import_module(module).router)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.DB_MIGRATE_ON_STARTUP:
+        from app.scripts.migrate import run_migrations
+        await run_in_threadpool(run_migrations)
+    if settings.STARTUP_WARMUP:
+        from app.core.warmup import warm_up
+        await run_in_threadpool(warm_up)
+    if settings.PREDICTION_SNAPSHOT_ENABLED:
+        from app.services.prediction_snapshot import load_snapshot, start_snapshot_refresher, stop_snapshot_refresher
+        await run_in_threadpool(load_snapshot)
+        start_snapshot_refresher()
+    yield
+    if settings.PREDICTION_SNAPSHOT_ENABLED:
+        stop_snapshot_refresher()
+
+
+app = FastAPI(title="KAMs Journey Backend", default_response_class=ORJSONResponse, lifespan=lifespan)
+
+# added first so CORS (outermost) also wraps cached responses
+if settings.RESPONSE_CACHE_ENABLED:
+    app.add_middleware(ResponseCacheMiddleware)
 
 app.add_middleware(
     CORSMiddleware,
@@ -22,15 +87,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=PAGE_HEADERS + ["ETag", "Last-Modified", "X-Cache"],
 )
 
-app.include_router(fi_router)
-app.include_router(wp_router)
-app.include_router(ep_router)
-app.include_router(ori_router)
-app.include_router(pel_router)
-app.include_router(kin_router)
-app.include_router(eva_router)
-app.include_router(peng_router)
-app.include_router(proj_router)
-app.include_router(search_router)
\ No newline at end of file
+include_routers(app)
@@ -0,0 +1,28 @@
+from sqlalchemy import DDL, Column, Index, Integer, String, event
+from app.core.db import Base
+
+class AEDirectory(Base):
+    """One row per AE, rebuilt from the sheet tables after every load (search index source)."""
+    __tablename__ = "ae_directory"
+    __table_args__ = (
+        # trigram GIN index on PostgreSQL, plain btree elsewhere
+        Index(
+            "ix_ae_directory_name_trgm",
+            "name_search",
+            postgresql_using="gin",
+            postgresql_ops={"name_search": "gin_trgm_ops"},
+        ),
+    )
+
+    nik = Column(Integer, primary_key=True, autoincrement=False)
+    name = Column(String)
+    name_search = Column(String)   # normalized name (lowercase, no accents)
+    unit = Column(String)
+    quarters = Column(String)      # "|Q1 2025|Q2 2025|"
+
+
+event.listen(
+    AEDirectory.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
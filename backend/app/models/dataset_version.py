@@ -0,0 +1,10 @@
+from sqlalchemy import Column, DateTime, Integer, String, func
+from app.core.db import Base
+
+class DatasetVersion(Base):
+    """Version counter per loaded dataset, bumped by the loader scripts (cache invalidation)."""
+    __tablename__ = "dataset_versions"
+
+    name = Column(String, primary_key=True)    # "sheets", "wp", "ep", "fi"
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
@@ -1,8 +1,47 @@
-from sqlalchemy import Column, Integer, String, Float, JSON
+from sqlalchemy import Column, Index, Integer, String, Float, JSON
+from sqlalchemy.orm import deferred
 from app.core.db import Base
 
+# the 11 regression outputs of the evaluation pipeline (one Float column each)
+REGRESSION_FIELDS = [
+    "revenue_sales_achievement",
+    "sales_achievement_datin",
+    "sales_achievement_wifi",
+    "sales_achievement_hsi",
+    "sales_achievement_wireline",
+    "profitability_achievement",
+    "collection_rate_achievement",
+    "ae_tools_achievement",
+    "capability_achievement",
+    "behaviour_achievement",
+    "nps_achievement",
+]
+
+# columns needed to build the API payload (raw_json / predictions_json not included)
+PAYLOAD_COLUMNS = [
+    "nik", "name", "prediction_quarter", "prediction_year",
+    "predicted_kuadran", "prediction_confidence", *REGRESSION_FIELDS,
+]
+
+
+def prediction_payload(row: dict):
+    """API layout of one prediction, same shape as a row of the pipeline JSON."""
+    return {
+        # the pipeline JSON carries nik as a string
+        "nik": str(row["nik"]) if row["nik"] is not None else None,
+        "name": row["name"],
+        "prediction_quarter": row["prediction_quarter"],
+        "prediction_year": row["prediction_year"],
+        "predicted_kuadran": row["predicted_kuadran"],
+        "prediction_confidence": row["prediction_confidence"],
+        "predictions": {f: row[f] for f in REGRESSION_FIELDS},
+    }
+
 class EvaluationPredictionMeta(Base):
     __tablename__ = "ep_meta"
+    __table_args__ = (
+        Index("uq_ep_meta_quarter_year", "prediction_quarter", "prediction_year", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     prediction_quarter = Column(String, index=True)
@@ -11,10 +50,14 @@ class EvaluationPredictionMeta(Base):
     best_regressor = Column(String)
     best_classifier = Column(String)
     model_metrics = Column(JSON)
+    row_hash = Column(String)
 
 
 class EvaluationPrediction(Base):
     __tablename__ = "ep_predictions"
+    __table_args__ = (
+        Index("uq_ep_predictions_nik_quarter_year", "nik", "prediction_quarter", "prediction_year", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
 
@@ -28,5 +71,24 @@ class EvaluationPrediction(Base):
     predicted_kuadran = Column(Integer)
     prediction_confidence = Column(Float)
 
-    predictions_json = Column(JSON)  # all 11 regression results
-    raw_json = Column(JSON)          # optional, full row backup
\ No newline at end of file
+    # regression outputs
+    revenue_sales_achievement = Column(Float)
+    sales_achievement_datin = Column(Float)
+    sales_achievement_wifi = Column(Float)
+    sales_achievement_hsi = Column(Float)
+    sales_achievement_wireline = Column(Float)
+    profitability_achievement = Column(Float)
+    collection_rate_achievement = Column(Float)
+    ae_tools_achievement = Column(Float)
+    capability_achievement = Column(Float)
+    behaviour_achievement = Column(Float)
+    nps_achievement = Column(Float)
+
+    # legacy JSON copies, never loaded unless accessed
+    predictions_json = deferred(Column(JSON))  # superseded by the typed columns above
+    raw_json = deferred(Column(JSON))          # optional full row backup (EP_STORE_RAW_JSON)
+
+    row_hash = Column(String)
+
+    def to_dict(self):
+        return prediction_payload({c: getattr(self, c) for c in PAYLOAD_COLUMNS})
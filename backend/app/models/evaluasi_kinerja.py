@@ -1,11 +1,14 @@
-from sqlalchemy import Column, Integer, String, Float
+from sqlalchemy import Column, Index, Integer, String, Float
 from app.core.db import Base
 
 class EvaluasiKinerja(Base):
     __tablename__ = "evaluasi_kinerja"
+    __table_args__ = (
+        Index("uq_evaluasi_kinerja_nik_quarter", "nik", "quarter", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    quarter = Column(String)
+    quarter = Column(String, index=True)
     sheet = Column(String)
 
     nik = Column(Integer)
@@ -28,3 +31,5 @@ class EvaluasiKinerja(Base):
 
     periode = Column(String)
     unit = Column(String)
+
+    row_hash = Column(String)
@@ -1,9 +1,12 @@
-from sqlalchemy import Column, Integer, String, Float, JSON, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Index, Integer, String, Float, JSON, ForeignKey
+from sqlalchemy.orm import deferred, relationship
 from app.core.db import Base
 
 class FeatureImportanceMeta(Base):
     __tablename__ = "fi_meta"
+    __table_args__ = (
+        Index("uq_fi_meta_phase", "phase", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     phase = Column(String, index=True)
@@ -11,6 +14,9 @@ class FeatureImportanceMeta(Base):
     best_regressor = Column(String)
     metrics_overall = Column(JSON)
     metrics_by_quarter = Column(JSON)
+    # feature x quarter importance matrix, built at load (see fi_service.build_pivot)
+    pivot = deferred(Column(JSON))
+    row_hash = Column(String)
 
     features = relationship(
         "FeatureImportance",
@@ -31,6 +37,10 @@ class FeatureImportanceMeta(Base):
 
 class FeatureImportance(Base):
     __tablename__ = "fi_features"
+    __table_args__ = (
+        Index("uq_fi_features_phase_quarter_feature", "phase", "quarter", "feature", unique=True),
+        Index("ix_fi_features_phase_quarter_rank", "phase", "quarter", "rank"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     meta_id = Column(Integer, ForeignKey("fi_meta.id"))
@@ -38,7 +48,9 @@ class FeatureImportance(Base):
     quarter = Column(String)
     feature = Column(String)
     importance = Column(Float)
+    rank = Column(Integer)  # 1 = most important within (phase, quarter), set at load
     description = Column(String)
+    row_hash = Column(String)
 
     meta = relationship("FeatureImportanceMeta", back_populates="features")
 
@@ -48,5 +60,6 @@ class FeatureImportance(Base):
             "quarter": self.quarter,
             "feature": self.feature,
             "importance": self.importance,
+            "rank": self.rank,
             "description": self.description
         }
@@ -1,13 +1,16 @@
-from sqlalchemy import Column, Integer, String, Float
+from sqlalchemy import Column, Index, Integer, String, Float
 from app.core.db import Base
 
 class Kinerja(Base):
     __tablename__ = "kinerja"
+    __table_args__ = (
+        Index("uq_kinerja_nik_quarter", "nik", "quarter", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
 
     # metadata
-    quarter = Column(String)
+    quarter = Column(String, index=True)
     sheet = Column(String)
 
     # actual columns from JSON
@@ -31,3 +34,5 @@ class Kinerja(Base):
 
     periode = Column(String)
     unit = Column(String)
+
+    row_hash = Column(String)
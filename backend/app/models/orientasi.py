@@ -1,11 +1,14 @@
-from sqlalchemy import Column, Integer, String, Float
+from sqlalchemy import Column, Index, Integer, String, Float
 from app.core.db import Base
 
 class Orientasi(Base):
     __tablename__ = "orientasi"
+    __table_args__ = (
+        Index("uq_orientasi_nik_quarter", "nik", "quarter", unique=True),
+    )
 
     id = Column(Integer, primary_key=True)
-    quarter = Column(String)
+    quarter = Column(String, index=True)
     sheet = Column(String)
 
     nik = Column(Integer)
@@ -28,3 +31,9 @@ class Orientasi(Base):
 
     periode = Column(String)
     unit = Column(String)
+
+    # summary, materialized after each load (orientasi_service.refresh_orientasi_summary)
+    basic_understanding = Column(Float)
+    twinning = Column(Float)
+
+    row_hash = Column(String)
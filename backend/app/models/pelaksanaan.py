@@ -1,11 +1,14 @@
-from sqlalchemy import Column, Integer, String, Float, BigInteger
+from sqlalchemy import Column, Index, Integer, String, Float, BigInteger
 from app.core.db import Base
 
 class Pelaksanaan(Base):
     __tablename__ = "pelaksanaan"
+    __table_args__ = (
+        Index("uq_pelaksanaan_nik_quarter", "nik", "quarter", unique=True),
+    )
 
     id = Column(Integer, primary_key=True)
-    quarter = Column(String)
+    quarter = Column(String, index=True)
     sheet = Column(String)
 
     nik = Column(Integer)
@@ -25,3 +28,5 @@ class Pelaksanaan(Base):
 
     periode = Column(String)
     unit = Column(String)
+
+    row_hash = Column(String)
@@ -1,11 +1,14 @@
-from sqlalchemy import Column, Integer, String, Float
+from sqlalchemy import Column, Index, Integer, String, Float
 from app.core.db import Base
 
 class Pengembangan(Base):
     __tablename__ = "pengembangan"
+    __table_args__ = (
+        Index("uq_pengembangan_nik_quarter", "nik", "quarter", unique=True),
+    )
 
     id = Column(Integer, primary_key=True)
-    quarter = Column(String)
+    quarter = Column(String, index=True)
     sheet = Column(String)
 
     nik = Column(Integer)
@@ -22,3 +25,5 @@ class Pengembangan(Base):
 
     periode = Column(String)
     unit = Column(String)
+
+    row_hash = Column(String)
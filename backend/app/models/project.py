@@ -1,11 +1,15 @@
-from sqlalchemy import Column, Integer, String, Float
+from sqlalchemy import Column, Index, Integer, String, Float
 from app.core.db import Base
 
 class Project(Base):
     __tablename__ = "project"
+    __table_args__ = (
+        Index("uq_project_lop_id_quarter", "lop_id", "quarter", unique=True),
+        Index("ix_project_nik_quarter", "nik", "quarter"),
+    )
 
     id = Column(Integer, primary_key=True)
-    quarter = Column(String)
+    quarter = Column(String, index=True)
     sheet = Column(String)
 
     nik = Column(Integer)
@@ -22,3 +26,5 @@ class Project(Base):
 
     periode = Column(String)
     unit = Column(String)
+
+    row_hash = Column(String)
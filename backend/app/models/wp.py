@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, JSON
+from sqlalchemy import Column, Index, Integer, String, Float, JSON
 from app.core.db import Base
 
 # ------------------------------------------
@@ -10,6 +10,7 @@ class WinProbMeta(Base):
     id = Column(Integer, primary_key=True, index=True)
     best_model_name = Column(String)
     metrics = Column(JSON)
+    row_hash = Column(String)
 
     def to_dict(self):
         return {
@@ -23,6 +24,12 @@ class WinProbMeta(Base):
 # ------------------------------------------
 class WinProbPrediction(Base):
     __tablename__ = "wp_predictions"
+    __table_args__ = (
+        Index("uq_wp_predictions_lop_id_quarter", "lop_id", "quarter", unique=True),
+        Index("ix_wp_predictions_nik_quarter", "nik", "quarter"),
+    )
+    # API rows are the to_dict() payload: the row id stays internal (keyset cursor only)
+    api_hidden_columns = ("id",)
 
     id = Column(Integer, primary_key=True, index=True)
     quarter = Column(String, index=True)
@@ -50,6 +57,8 @@ class WinProbPrediction(Base):
     top_positive_factors = Column(String)
     top_negative_factors = Column(String)
 
+    row_hash = Column(String)
+
     def to_dict(self):
         return {
             "quarter": self.quarter,
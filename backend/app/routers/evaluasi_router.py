@@ -2,30 +2,32 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from app.core.db import get_db
 from app. models.evaluasi_kinerja import EvaluasiKinerja
+from app.utils.pagination import PageParams, fetch_rows, paginated_response
+from app.utils.serialization import ORJSONResponse
 
 router = APIRouter(prefix="/evaluasi", tags=["Evaluasi"])
 
 @router.get("/all")
-def get_all(db: Session = Depends(get_db)):
-    return db.query(EvaluasiKinerja).all()
+def get_all(page: PageParams = Depends(), db: Session = Depends(get_db)):
+    return paginated_response(db, EvaluasiKinerja, [], page)
 
 
 @router.get("/{quarter}")
-def get_by_quarter(quarter: str, db: Session = Depends(get_db)):
-    return db.query(EvaluasiKinerja).filter(EvaluasiKinerja. quarter == quarter).all()
+def get_by_quarter(quarter: str, page: PageParams = Depends(), db: Session = Depends(get_db)):
+    return paginated_response(db, EvaluasiKinerja, [EvaluasiKinerja.quarter == quarter], page)
 
 
 @router.get("/ae/{nik}")
 def get_by_nik(nik: int, quarter: str, db: Session = Depends(get_db)):
-    result = db.query(EvaluasiKinerja).filter(
+    rows = fetch_rows(db, EvaluasiKinerja, [
         EvaluasiKinerja.nik == nik,
         EvaluasiKinerja.quarter == quarter
-    ).first()
+    ], limit=1)
     
-    if not result:
+    if not rows:
         raise HTTPException(
             status_code=404,
             detail=f"No data found for NIK {nik} in quarter {quarter}"
         )
     
-    return result
\ No newline at end of file
+    return ORJSONResponse(rows[0])
\ No newline at end of file
@@ -1,15 +1,41 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from app.core.db import get_db
 
 from app.services.evaluation_prediction_service import (
     get_prediction_detail,
+    get_predictions_for_niks,
 )
 
 router = APIRouter(prefix="/ep", tags=["Evaluation Predictions"])
 
+MAX_BATCH_NIKS = 1000
+
+
+def check_niks(nik: list[int]):
+    niks = list(dict.fromkeys(nik))
+    if len(niks) > MAX_BATCH_NIKS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_NIKS} niks per request")
+    return niks
+
+
+# declared before /{nik}/predictions (evaluasi table: one call instead of one per row)
+@router.get("/predictions")
+def bulk_predictions_endpoint(
+    quarter: str,
+    year: int,
+    nik: list[int] = Query(..., description="repeatable, e.g. nik=401&nik=402"),
+    db: Session = Depends(get_db),
+):
+    """data: {nik: prediction, or null when the AE has none for the period}."""
+    result = get_predictions_for_niks(db, check_niks(nik), quarter, year)
+    if not result:
+        raise HTTPException(404, "No predictions for this period")
+    return result
+
+
 @router.get("/{nik}/predictions")
-def prediction_detail_endpoint(nik: str, quarter: str, year: int, db: Session = Depends(get_db)):
+def prediction_detail_endpoint(nik: int, quarter: str, year: int, db: Session = Depends(get_db)):
     result = get_prediction_detail(db, nik, quarter, year)
     if not result:
         raise HTTPException(404, "Prediction not found for this AE and period")
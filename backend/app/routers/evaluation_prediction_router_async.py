@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from app.core.db import get_async_db
+from app.routers.evaluation_prediction_router import check_niks
+
+from app.services.evaluation_prediction_service import (
+    get_prediction_detail,
+    get_predictions_for_niks,
+)
+
+# Async twin of app/routers/evaluation_prediction_router.py (DB_ASYNC_ENABLED).
+router = APIRouter(prefix="/ep", tags=["Evaluation Predictions"])
+
+@router.get("/predictions")
+async def bulk_predictions_endpoint(
+    quarter: str,
+    year: int,
+    nik: list[int] = Query(..., description="repeatable, e.g. nik=401&nik=402"),
+    db=Depends(get_async_db),
+):
+    result = await db.run_sync(get_predictions_for_niks, check_niks(nik), quarter, year)
+    if not result:
+        raise HTTPException(404, "No predictions for this period")
+    return result
+
+
+@router.get("/{nik}/predictions")
+async def prediction_detail_endpoint(nik: int, quarter: str, year: int, db=Depends(get_async_db)):
+    result = await db.run_sync(get_prediction_detail, nik, quarter, year)
+    if not result:
+        raise HTTPException(404, "Prediction not found for this AE and period")
+    return result
@@ -1,46 +1,44 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from app.core.db import get_db
-from app.models.fi import FeatureImportance, FeatureImportanceMeta
+from app.services.feature_importance_service import OVERALL, get_all_phases, get_features, get_pivot
 
 router = APIRouter(prefix="/fi", tags=["Feature Importance"])
 
+TOP_K = Query(None, ge=1, description="only the k most important features")
+
+
+# Get FI of every phase in one payload (journey pages)
+@router.get("")
+def get_feature_importance_all(quarter: str = OVERALL, top_k: int | None = TOP_K, db: Session = Depends(get_db)):
+    return get_all_phases(db, quarter, top_k)
+
 # Get FI per phase
 @router.get("/{phase}")
-def get_feature_importance(phase: str, db: Session = Depends(get_db)):
-    meta = db.query(FeatureImportanceMeta).filter(
-        FeatureImportanceMeta.phase == phase
-    ).first()
+def get_feature_importance(phase: str, top_k: int | None = TOP_K, db: Session = Depends(get_db)):
+    result = get_features(db, phase, OVERALL, top_k)
 
-    if not meta:
+    if not result:
         raise HTTPException(status_code=404, detail="Phase not found")
 
-    features = db.query(FeatureImportance).filter(
-        FeatureImportance.phase == phase,
-        FeatureImportance.quarter == "ALL"
-    ).all()
+    return result
 
-    return {
-        "meta": meta.to_dict(),
-        "features": [f.to_dict() for f in features]
-    }
+# Feature x quarter importance matrix (DIDEKLARASIKAN SEBELUM /{phase}/{quarter})
+@router.get("/{phase}/pivot")
+def get_feature_importance_pivot(phase: str, db: Session = Depends(get_db)):
+    result = get_pivot(db, phase)
+
+    if not result:
+        raise HTTPException(status_code=404, detail="Phase not found")
+
+    return result
 
 # Get FI per phase + quarter
 @router.get("/{phase}/{quarter}")
-def get_feature_importance_quarter(phase: str, quarter: str, db: Session = Depends(get_db)):
-    meta = db.query(FeatureImportanceMeta).filter(
-        FeatureImportanceMeta.phase == phase
-    ).first()
+def get_feature_importance_quarter(phase: str, quarter: str, top_k: int | None = TOP_K, db: Session = Depends(get_db)):
+    result = get_features(db, phase, quarter, top_k)
 
-    if not meta:
+    if not result:
         raise HTTPException(status_code=404, detail="Phase not found")
 
-    features = db.query(FeatureImportance).filter(
-        FeatureImportance.phase == phase,
-        FeatureImportance.quarter == quarter
-    ).all()
-
-    return {
-        "meta": meta.to_dict(),
-        "features": [f.to_dict() for f in features]
-    }
+    return result
@@ -0,0 +1,8 @@
+from fastapi import APIRouter
+from app.core.db import get_pool_status
+
+router = APIRouter(prefix="/health", tags=["Health"])
+
+@router.get("/db")
+def db_pool_status():
+    return get_pool_status()
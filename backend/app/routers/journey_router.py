@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from app.core.db import get_db
+from app.services.journey_service import get_journey
+
+router = APIRouter(prefix="/journey", tags=["Journey"])
+
+
+@router.get("/{nik}")
+def journey(nik: int, quarter: str | None = None, db: Session = Depends(get_db)):
+    """
+    One AE's whole journey: the five phases, projects with win probability
+    and evaluation predictions. Every section is a list (one row per quarter
+    when `quarter` is omitted); model metadata is in wp_meta and ep_meta
+    ({"Q4 2025": meta}).
+    """
+    result = get_journey(db, nik, quarter)
+    if result is None:
+        raise HTTPException(status_code=404, detail=f"No journey data for NIK {nik}")
+    return result
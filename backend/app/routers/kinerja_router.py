@@ -2,13 +2,14 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 from app.core.db import get_db
 from app.models.kinerja import Kinerja
+from app.utils.pagination import PageParams, paginated_response
 
 router = APIRouter(prefix="/kinerja", tags=["Kinerja"])
 
 @router.get("/all")
-def get_all(db: Session = Depends(get_db)):
-    return db.query(Kinerja).all()
+def get_all(page: PageParams = Depends(), db: Session = Depends(get_db)):
+    return paginated_response(db, Kinerja, [], page)
 
 @router.get("/{quarter}")
-def get_by_quarter(quarter: str, db: Session = Depends(get_db)):
-    return db.query(Kinerja).filter(Kinerja.quarter == quarter).all()
\ No newline at end of file
+def get_by_quarter(quarter: str, page: PageParams = Depends(), db: Session = Depends(get_db)):
+    return paginated_response(db, Kinerja, [Kinerja.quarter == quarter], page)
\ No newline at end of file
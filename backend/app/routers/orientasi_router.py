@@ -1,67 +1,62 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from statistics import mean
 from app.core.db import get_db
 from app.models.orientasi import Orientasi
+from app.utils.pagination import PageParams, fetch_page, fetch_rows, stream_response
+from app.utils.serialization import ORJSONResponse
 
 router = APIRouter(prefix="/orientasi", tags=["Orientasi"])
 
 
 # ============================================================
-# Helper: hitung Basic Understanding, Twinning, Customer Matching
+# Summary: Basic Understanding, Twinning, Customer Matching
+# (materialized at load time, see orientasi_service)
 # ============================================================
-def compute_summary(o: Orientasi):
-    basic_understanding = mean([
-        o.solution or 0,
-        o.account_profile or 0,
-        o.account_plan or 0,
-        o.sales_funnel or 0,
-        o.bidding_management or 0,
-        o.project_management or 0,
-    ])
+SUMMARY_FIELDS = [
+    "nik", "name", "unit", "periode",
+    "basic_understanding", "twinning", "customer_matching",
+]
 
-    twinning = mean([
-        o.customer_introduction or 0,
-        o.visiting_customer or 0,
-        o.transfer_customer_knowledge or 0,
-        o.transfer_customer_documentation or 0,
-    ])
+def summary_columns(fields: list[str] | None):
+    fields = fields or SUMMARY_FIELDS
+    unknown = [f for f in fields if f not in SUMMARY_FIELDS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown field(s): {', '.join(unknown)}")
+    return [Orientasi.__table__.c[f] for f in fields]
 
-    return {
-        "nik": o.nik,
-        "name": o.name,
-        "unit": o.unit,
-        "periode": o.periode,
-        "basic_understanding": basic_understanding,
-        "twinning": twinning,
-        "customer_matching": o.customer_matching,
-    }
+
+def summary_response(db: Session, filters: list, page: PageParams):
+    columns = summary_columns(page.fields)
+
+    if page.stream:
+        return stream_response(Orientasi, filters, page, columns=columns)
+
+    result = fetch_page(db, Orientasi, filters, page, columns=columns)
+    return ORJSONResponse(content=result.rows, headers=result.headers)
 
 
 @router.get("/")
-def get_all_summary(db: Session = Depends(get_db)):
-    rows = db.query(Orientasi).all()
-    return [compute_summary(r) for r in rows]
+def get_all_summary(page: PageParams = Depends(), db: Session = Depends(get_db)):
+    return summary_response(db, [], page)
 
 @router.get("/quarter/{quarter}")
-def get_summary_by_quarter(quarter: str, db: Session = Depends(get_db)):
-    rows = db.query(Orientasi).filter(Orientasi.quarter == quarter).all()
-    return [compute_summary(r) for r in rows]
+def get_summary_by_quarter(quarter: str, page: PageParams = Depends(), db: Session = Depends(get_db)):
+    return summary_response(db, [Orientasi.quarter == quarter], page)
 
 @router.get("/nik/{nik}")
 def get_detail_by_nik(nik: int, db: Session = Depends(get_db)):
-    rows = db.query(Orientasi).filter(Orientasi.nik == nik).all()
+    rows = fetch_rows(db, Orientasi, [Orientasi.nik == nik])
     if not rows:
         raise HTTPException(status_code=404, detail="NIK not found")
-    return rows
+    return ORJSONResponse(rows)
 
 @router.get("/nik/{nik}/quarter/{quarter}")
 def get_detail_by_nik_quarter(nik: int, quarter: str, db: Session = Depends(get_db)):
-    row = db.query(Orientasi).filter(
+    rows = fetch_rows(db, Orientasi, [
         Orientasi.nik == nik,
         Orientasi.quarter == quarter
-    ).first()
+    ], limit=1)
 
-    if not row:
+    if not rows:
         raise HTTPException(status_code=404, detail="Data not found")
-    return row
\ No newline at end of file
+    return ORJSONResponse(rows[0])
\ No newline at end of file
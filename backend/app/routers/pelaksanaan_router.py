@@ -2,13 +2,14 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 from app.core.db import get_db
 from app.models.pelaksanaan import Pelaksanaan
+from app.utils.pagination import PageParams, paginated_response
 
 router = APIRouter(prefix="/pelaksanaan", tags=["Pelaksanaan"])
 
 @router.get("/all")
-def get_all(db: Session = Depends(get_db)):
-    return db.query(Pelaksanaan).all()
+def get_all(page: PageParams = Depends(), db: Session = Depends(get_db)):
+    return paginated_response(db, Pelaksanaan, [], page)
 
 @router.get("/{quarter}")
-def get_by_quarter(quarter: str, db: Session = Depends(get_db)):
-    return db.query(Pelaksanaan).filter(Pelaksanaan.quarter == quarter).all()
+def get_by_quarter(quarter: str, page: PageParams = Depends(), db: Session = Depends(get_db)):
+    return paginated_response(db, Pelaksanaan, [Pelaksanaan.quarter == quarter], page)
@@ -2,13 +2,14 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 from app.core.db import get_db
 from app.models.pengembangan import Pengembangan
+from app.utils.pagination import PageParams, paginated_response
 
 router = APIRouter(prefix="/pengembangan", tags=["Pengembangan"])
 
 @router.get("/all")
-def get_all(db: Session = Depends(get_db)):
-    return db.query(Pengembangan).all()
+def get_all(page: PageParams = Depends(), db: Session = Depends(get_db)):
+    return paginated_response(db, Pengembangan, [], page)
 
 @router.get("/{quarter}")
-def get_by_quarter(quarter: str, db: Session = Depends(get_db)):
-    return db.query(Pengembangan).filter(Pengembangan.quarter == quarter).all()
\ No newline at end of file
+def get_by_quarter(quarter: str, page: PageParams = Depends(), db: Session = Depends(get_db)):
+    return paginated_response(db, Pengembangan, [Pengembangan.quarter == quarter], page)
\ No newline at end of file
@@ -2,6 +2,8 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from app.core.db import get_db
 from app.models.project import Project
+from app.utils.pagination import PageParams, fetch_rows, paginated_response
+from app.utils.serialization import ORJSONResponse
 
 router = APIRouter(prefix="/project", tags=["Project"])
 
@@ -10,17 +12,16 @@ router = APIRouter(prefix="/project", tags=["Project"])
 # GET all projects
 # ------------------------------------------------
 @router.get("/all")
-def get_all_projects(db: Session = Depends(get_db)):
-    return db.query(Project).all()
+def get_all_projects(page: PageParams = Depends(), db: Session = Depends(get_db)):
+    return paginated_response(db, Project, [], page)
 
 
 # ------------------------------------------------
 # GET projects per quarter
 # ------------------------------------------------
 @router.get("/quarter/{quarter}")
-def get_projects_by_quarter(quarter: str, db: Session = Depends(get_db)):
-    rows = db.query(Project).filter(Project.quarter == quarter).all()
-    return rows
+def get_projects_by_quarter(quarter: str, page: PageParams = Depends(), db: Session = Depends(get_db)):
+    return paginated_response(db, Project, [Project.quarter == quarter], page)
 
 
 # ------------------------------------------------
@@ -28,12 +29,12 @@ def get_projects_by_quarter(quarter: str, db: Session = Depends(get_db)):
 # ------------------------------------------------
 @router.get("/ae/{nik}")
 def get_projects_by_ae(nik: int, db: Session = Depends(get_db)):
-    rows = db.query(Project).filter(Project.nik == nik).all()
+    rows = fetch_rows(db, Project, [Project.nik == nik])
 
     if not rows:
         raise HTTPException(status_code=404, detail="No projects found for this AE")
 
-    return rows
+    return ORJSONResponse(rows)
 
 
 # ------------------------------------------------
@@ -41,12 +42,10 @@ def get_projects_by_ae(nik: int, db: Session = Depends(get_db)):
 # ------------------------------------------------
 @router.get("/ae/{nik}/{quarter}")
 def get_projects_by_ae_quarter(nik: int, quarter: str, db: Session = Depends(get_db)):
-    rows = (
-        db.query(Project)
-        .filter(Project.nik == nik)
-        .filter(Project.quarter == quarter)
-        .all()
-    )
+    rows = fetch_rows(db, Project, [
+        Project.nik == nik,
+        Project.quarter == quarter,
+    ])
 
     if not rows:
         raise HTTPException(
@@ -54,4 +53,4 @@ def get_projects_by_ae_quarter(nik: int, quarter: str, db: Session = Depends(get
             detail=f"No projects found for AE {nik} in quarter {quarter}"
         )
 
-    return rows
+    return ORJSONResponse(rows)
@@ -0,0 +1,56 @@
+from fastapi import APIRouter, Depends, HTTPException
+from app.core.db import get_async_db
+from app.models.project import Project
+from app.utils.pagination import PageParams, fetch_rows_async, paginated_response_async
+from app.utils.serialization import ORJSONResponse
+
+# Async twin of app/routers/project_router.py (DB_ASYNC_ENABLED).
+router = APIRouter(prefix="/project", tags=["Project"])
+
+
+# ------------------------------------------------
+# GET all projects
+# ------------------------------------------------
+@router.get("/all")
+async def get_all_projects(page: PageParams = Depends(), db=Depends(get_async_db)):
+    return await paginated_response_async(db, Project, [], page)
+
+
+# ------------------------------------------------
+# GET projects per quarter
+# ------------------------------------------------
+@router.get("/quarter/{quarter}")
+async def get_projects_by_quarter(quarter: str, page: PageParams = Depends(), db=Depends(get_async_db)):
+    return await paginated_response_async(db, Project, [Project.quarter == quarter], page)
+
+
+# ------------------------------------------------
+# GET projects per AE (by NIK)
+# ------------------------------------------------
+@router.get("/ae/{nik}")
+async def get_projects_by_ae(nik: int, db=Depends(get_async_db)):
+    rows = await fetch_rows_async(db, Project, [Project.nik == nik])
+
+    if not rows:
+        raise HTTPException(status_code=404, detail="No projects found for this AE")
+
+    return ORJSONResponse(rows)
+
+
+# ------------------------------------------------
+# GET projects per AE & per quarter
+# ------------------------------------------------
+@router.get("/ae/{nik}/{quarter}")
+async def get_projects_by_ae_quarter(nik: int, quarter: str, db=Depends(get_async_db)):
+    rows = await fetch_rows_async(db, Project, [
+        Project.nik == nik,
+        Project.quarter == quarter,
+    ])
+
+    if not rows:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No projects found for AE {nik} in quarter {quarter}"
+        )
+
+    return ORJSONResponse(rows)
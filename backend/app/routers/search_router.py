@@ -1,56 +1,33 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 from app.core.db import get_db
-
-from app.models.orientasi import Orientasi
-from app.models.pelaksanaan import Pelaksanaan
-from app.models.kinerja import Kinerja
-from app.models.evaluasi_kinerja import EvaluasiKinerja
-from app.models.pengembangan import Pengembangan
-from app.models.project import Project
+from app.services.search_service import global_search as run_global_search, search_directory
 
 router = APIRouter(prefix="/search", tags=["Search"])
 
 
-def apply_filters(queryset, query: str | None, quarter: str | None):
-    """
-    Helper untuk menerapkan filter search + quarter.
-    """
-    if quarter:
-        queryset = queryset.filter(queryset.column_descriptions[0]["entity"].quarter == quarter)
-
-    if query:
-        if query.isdigit():
-            queryset = queryset.filter(
-                queryset.column_descriptions[0]["entity"].nik == int(query)
-            )
-        else:
-            queryset = queryset.filter(
-                queryset.column_descriptions[0]["entity"].name.ilike(f"%{query}%")
-            )
-
-    return queryset.all()
-
-
 @router.get("")
-def global_search(query: str | None = None, quarter: str | None = None, db: Session = Depends(get_db)):
+def global_search(
+    query: str | None = None,
+    quarter: str | None = None,
+    limit: int = Query(20, ge=1, le=200),
+    nik_prefix: bool = Query(False, description="digits match every NIK starting with them, not only the exact NIK"),
+    db: Session = Depends(get_db),
+):
     """
-    Global search by name or NIK + optional quarter filter.
+    Global search by name or NIK (exact, or prefix with nik_prefix) + optional quarter filter.
+    `ae` holds the ranked AE matches, each sheet section at most `limit` rows.
     """
-
-    models = {
-        "orientasi": Orientasi,
-        "pelaksanaan": Pelaksanaan,
-        "kinerja": Kinerja,
-        "evaluasi": EvaluasiKinerja,
-        "pengembangan": Pengembangan,
-        "projects": Project,
-    }
-
-    results = {}
-
-    for key, model in models.items():
-        qs = db.query(model)
-        results[key] = apply_filters(qs, query, quarter)
-
-    return results
+    return run_global_search(db, query, quarter, limit, nik_prefix)
+
+
+@router.get("/ae")
+def typeahead(
+    query: str,
+    quarter: str | None = None,
+    limit: int = Query(10, ge=1, le=50),
+    nik_prefix: bool = Query(False, description="digits match every NIK starting with them, not only the exact NIK"),
+    db: Session = Depends(get_db),
+):
+    """Typeahead: ranked AE directory entries only."""
+    return search_directory(db, query, quarter, limit, nik_prefix)
@@ -0,0 +1,33 @@
+from fastapi import APIRouter, Depends, Query
+from app.core.db import get_async_db
+from app.services.search_service import global_search_async, search_directory
+
+# Async twin of app/routers/search_router.py (DB_ASYNC_ENABLED).
+router = APIRouter(prefix="/search", tags=["Search"])
+
+
+@router.get("")
+async def global_search(
+    query: str | None = None,
+    quarter: str | None = None,
+    limit: int = Query(20, ge=1, le=200),
+    nik_prefix: bool = Query(False, description="digits match every NIK starting with them, not only the exact NIK"),
+    db=Depends(get_async_db),
+):
+    """
+    Global search by name or NIK (exact, or prefix with nik_prefix) + optional quarter filter.
+    `ae` holds the ranked AE matches, each sheet section at most `limit` rows.
+    """
+    return await global_search_async(db, query, quarter, limit, nik_prefix)
+
+
+@router.get("/ae")
+async def typeahead(
+    query: str,
+    quarter: str | None = None,
+    limit: int = Query(10, ge=1, le=50),
+    nik_prefix: bool = Query(False, description="digits match every NIK starting with them, not only the exact NIK"),
+    db=Depends(get_async_db),
+):
+    """Typeahead: ranked AE directory entries only."""
+    return await db.run_sync(search_directory, query, quarter, limit, nik_prefix)
@@ -0,0 +1,68 @@
+import math
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from app.core.db import get_db
+from app.services.stats_service import (
+    MAX_BINS,
+    STATS_SHEETS,
+    group_columns,
+    metric_columns,
+    quarter_stats,
+)
+
+router = APIRouter(prefix="/stats", tags=["Statistics"])
+
+
+def _split(value: str | None):
+    return [v.strip() for v in value.split(",") if v.strip()] if value else None
+
+
+# ============================================================
+# /stats/{sheet}/{quarter}
+#   sheet       : kinerja | evaluasi | pelaksanaan
+#   metrics     : comma separated columns (default: every numeric column)
+#   group_by    : unit | kuadran (evaluasi only)
+#   percentiles : comma separated, 0-100 (default 25,50,75)
+#   bins        : histogram buckets per metric (0 = no histogram)
+# ============================================================
+
+@router.get("/{sheet}/{quarter}")
+def get_quarter_stats(
+    sheet: str,
+    quarter: str,
+    metrics: str | None = Query(None),
+    group_by: str | None = Query(None),
+    percentiles: str | None = Query("25,50,75"),
+    bins: int = Query(10, ge=0, le=MAX_BINS),
+    db: Session = Depends(get_db),
+):
+    model = STATS_SHEETS.get(sheet)
+    if model is None:
+        raise HTTPException(status_code=404, detail=f"Unknown sheet '{sheet}'. Available: {', '.join(STATS_SHEETS)}")
+
+    metric_list = _split(metrics)
+    available = metric_columns(model)
+    unknown = [m for m in metric_list or [] if m not in available]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown metric(s): {', '.join(unknown)}. Available: {', '.join(available)}"
+        )
+
+    if group_by and group_by not in group_columns(model):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Cannot group {sheet} by '{group_by}'. Available: {', '.join(group_columns(model))}"
+        )
+
+    try:
+        percentile_list = [float(p) for p in _split(percentiles) or []]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="percentiles must be numbers between 0 and 100")
+    if any(not math.isfinite(p) or p < 0 or p > 100 for p in percentile_list):
+        raise HTTPException(status_code=400, detail="percentiles must be numbers between 0 and 100")
+
+    result = quarter_stats(db, sheet, quarter, metric_list, group_by, percentile_list, bins)
+    if result is None:
+        raise HTTPException(status_code=404, detail=f"No {sheet} data for quarter {quarter}")
+    return result
@@ -1,28 +1,140 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 from urllib.parse import unquote
 
-from app.core.db import SessionLocal
+from app.core.db import get_db, get_read_db
 from app.models.wp import WinProbPrediction
-from app.services.wp_service import get_best_model_metrics
+from app.services.prediction_snapshot import get_snapshot
+from app.services.wp_service import (
+    find_predictions, get_best_model_metrics, get_predictions_for_projects, prediction_filters,
+)
+from app.utils.pagination import PageParams, fetch_page, stream_response
+from app.utils.serialization import ORJSONResponse
 
 router = APIRouter(prefix="/wp", tags=["win-probability"])
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 # -------- Build Response with Meta --------
-def build_wp_response(db: Session, data):
+def build_wp_response(db: Session, data: list[dict]):
     meta = get_best_model_metrics(db)
-    return {
+    return ORJSONResponse({
         "meta": meta,
-        "data": [d.to_dict() for d in data],
+        "data": data,
+    })
+
+
+# -------- Paginated list (keyset + field projection) --------
+def build_wp_page_response(db: Session, quarter: str | None, page: PageParams):
+    snapshot = get_snapshot()
+    filters = prediction_filters(quarter=quarter)
+
+    # NDJSON stream carries the prediction rows only (meta: any non-stream /wp call)
+    if page.stream:
+        if snapshot is not None:
+            return snapshot.wp_stream(quarter, page)
+        return stream_response(WinProbPrediction, filters, page)
+
+    if snapshot is not None:
+        result = snapshot.wp_page(quarter, page)
+    else:
+        result = fetch_page(db, WinProbPrediction, filters, page)
+    content = {
+        "meta": get_best_model_metrics(db),
+        "data": result.rows,
     }
+    return ORJSONResponse(content=content, headers=result.headers)
+
+
+# ============================================================
+# BATCH PROJECT LOOKUP (sebelum /{quarter} agar tidak bentrok)
+# ============================================================
+
+MAX_BATCH_LOP_IDS = 1000
+
+
+class ProjectBatchRequest(BaseModel):
+    lop_ids: list[str]
+    quarter: str | None = None
+
+
+def build_batch_response(db: Session, lop_ids: list[str], quarter: str | None):
+    lop_ids = list(dict.fromkeys(l.strip() for l in lop_ids if l.strip()))
+    if len(lop_ids) > MAX_BATCH_LOP_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_LOP_IDS} lop_ids per request")
+
+    q = unquote(quarter).strip() if quarter else None
+    return ORJSONResponse({
+        "meta": get_best_model_metrics(db),
+        "data": get_predictions_for_projects(db, lop_ids, q),
+    })
+
+
+@router.post("/projects")
+def get_wp_for_projects(body: ProjectBatchRequest, db: Session = Depends(get_read_db)):
+    """
+    Win probability of many projects in one call.
+    data: {lop_id: row} with a quarter (null when not scored),
+          {lop_id: [rows]} without one.
+    """
+    return build_batch_response(db, body.lop_ids, body.quarter)
+
+
+@router.get("/projects")
+def get_wp_for_projects_query(
+    lop_id: str = Query(..., description="comma separated, e.g. lop_id=LOP-1,LOP-2"),
+    quarter: str | None = None,
+    db: Session = Depends(get_db),
+):
+    return build_batch_response(db, lop_id.split(","), quarter)
+
+
+# ============================================================
+# WHAT-IF SIMULATION
+# ============================================================
+
+MAX_SCENARIOS = 10_000
+
+
+class SimulationScenario(BaseModel):
+    jumlah_aktivitas: float | None = Field(None, ge=0)
+    value_projects: float | None = Field(None, ge=0)
+
+
+class SimulationRequest(BaseModel):
+    lop_id: str
+    quarter: str | None = None  # default: latest quarter of the project
+    scenarios: list[SimulationScenario] = Field(..., min_length=1, max_length=MAX_SCENARIOS)
+
+
+def simulation_model():
+    # numpy and the model artifact are only loaded once the endpoint is used
+    from app.services.wp_scoring import load_model
+    try:
+        return load_model()
+    except (RuntimeError, OSError) as e:
+        raise HTTPException(status_code=503, detail=f"Win probability model unavailable: {e}")
+
+
+def simulation_inputs(body: SimulationRequest):
+    quarter = unquote(body.quarter).strip() if body.quarter else None
+    return body.lop_id, quarter, [s.model_dump(exclude_none=True) for s in body.scenarios]
+
+
+@router.post("/simulate")
+def simulate_win_probability(body: SimulationRequest, db: Session = Depends(get_read_db)):
+    """
+    Win probability of a project under changed jumlah_aktivitas / value_projects.
+    Returns the model baseline and, per scenario, the probability, delta and
+    recomputed top factors.
+    """
+    from app.services.wp_simulation import load_project, simulate
+
+    model = simulation_model()
+    lop_id, quarter, scenarios = simulation_inputs(body)
+    base = load_project(db, model, lop_id, quarter)
+    if base is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    return ORJSONResponse(simulate(model, *base, scenarios))
 
 
 # ============================================================
@@ -31,23 +143,14 @@ def build_wp_response(db: Session, data):
 
 @router.get("/project/{lop_id}")
 def get_wp_by_project(lop_id: str, db: Session = Depends(get_db)):
-    records = (
-        db.query(WinProbPrediction)
-        .filter(WinProbPrediction.lop_id == lop_id)
-        .all()
-    )
+    records = find_predictions(db, lop_id=lop_id)
     return build_wp_response(db, records)
 
 
 @router.get("/project/{lop_id}/{quarter}")
 def get_wp_by_project_quarter(lop_id: str, quarter: str, db: Session = Depends(get_db)):
     q = unquote(quarter).strip()
-    records = (
-        db.query(WinProbPrediction)
-        .filter(WinProbPrediction.lop_id == lop_id)
-        .filter(WinProbPrediction.quarter == q)
-        .all()
-    )
+    records = find_predictions(db, lop_id=lop_id, quarter=q)
     return build_wp_response(db, records)
 
 
@@ -57,23 +160,14 @@ def get_wp_by_project_quarter(lop_id: str, quarter: str, db: Session = Depends(g
 
 @router.get("/ae/{ae_id}")
 def get_wp_by_ae(ae_id: str, db: Session = Depends(get_db)):
-    records = (
-        db.query(WinProbPrediction)
-        .filter(WinProbPrediction.nik == int(ae_id))
-        .all()
-    )
+    records = find_predictions(db, nik=int(ae_id))
     return build_wp_response(db, records)
 
 
 @router.get("/ae/{ae_id}/{quarter}")
 def get_wp_by_ae_quarter(ae_id: str, quarter: str, db: Session = Depends(get_db)):
     q = unquote(quarter).strip()
-    records = (
-        db.query(WinProbPrediction)
-        .filter(WinProbPrediction.nik == int(ae_id))
-        .filter(WinProbPrediction.quarter == q)
-        .all()
-    )
+    records = find_predictions(db, nik=int(ae_id), quarter=q)
     return build_wp_response(db, records)
 
 
@@ -82,17 +176,11 @@ def get_wp_by_ae_quarter(ae_id: str, quarter: str, db: Session = Depends(get_db)
 # ============================================================
 
 @router.get("/all")
-def get_wp_all(db: Session = Depends(get_db)):
-    records = db.query(WinProbPrediction).all()
-    return build_wp_response(db, records)
+def get_wp_all(page: PageParams = Depends(), db: Session = Depends(get_db)):
+    return build_wp_page_response(db, None, page)
 
 
 @router.get("/{quarter}")
-def get_wp_by_quarter(quarter: str, db: Session = Depends(get_db)):
+def get_wp_by_quarter(quarter: str, page: PageParams = Depends(), db: Session = Depends(get_db)):
     q = unquote(quarter).strip()
-    records = (
-        db.query(WinProbPrediction)
-        .filter(WinProbPrediction.quarter == q)
-        .all()
-    )
-    return build_wp_response(db, records)
+    return build_wp_page_response(db, q, page)
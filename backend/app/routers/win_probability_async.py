@@ -0,0 +1,144 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from starlette.concurrency import run_in_threadpool
+from urllib.parse import unquote
+
+from app.core.db import get_async_db
+from app.models.wp import WinProbPrediction
+from app.routers.win_probability import (
+    MAX_BATCH_LOP_IDS, ProjectBatchRequest, SimulationRequest, simulation_inputs, simulation_model,
+)
+from app.services.prediction_snapshot import get_snapshot
+from app.services.wp_service import (
+    find_predictions, get_best_model_metrics, get_predictions_for_projects, prediction_filters,
+)
+from app.utils.pagination import PageParams, fetch_page_async, stream_response
+from app.utils.serialization import ORJSONResponse
+
+# Async twin of app/routers/win_probability.py (DB_ASYNC_ENABLED): same paths and payloads.
+router = APIRouter(prefix="/wp", tags=["win-probability"])
+
+
+# -------- Build Response with Meta --------
+async def build_wp_response(db, data: list[dict]):
+    meta = await db.run_sync(get_best_model_metrics)
+    return ORJSONResponse({
+        "meta": meta,
+        "data": data,
+    })
+
+
+# -------- Paginated list (keyset + field projection) --------
+async def build_wp_page_response(db, quarter: str | None, page: PageParams):
+    snapshot = get_snapshot()
+    filters = prediction_filters(quarter=quarter)
+
+    if page.stream:
+        if snapshot is not None:
+            return snapshot.wp_stream(quarter, page)
+        return stream_response(WinProbPrediction, filters, page)
+
+    if snapshot is not None:
+        result = snapshot.wp_page(quarter, page)
+    else:
+        result = await fetch_page_async(db, WinProbPrediction, filters, page)
+    content = {
+        "meta": await db.run_sync(get_best_model_metrics),
+        "data": result.rows,
+    }
+    return ORJSONResponse(content=content, headers=result.headers)
+
+
+# ============================================================
+# BATCH PROJECT LOOKUP (sebelum /{quarter} agar tidak bentrok)
+# ============================================================
+
+async def build_batch_response(db, lop_ids: list[str], quarter: str | None):
+    lop_ids = list(dict.fromkeys(l.strip() for l in lop_ids if l.strip()))
+    if len(lop_ids) > MAX_BATCH_LOP_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_LOP_IDS} lop_ids per request")
+
+    q = unquote(quarter).strip() if quarter else None
+    return ORJSONResponse({
+        "meta": await db.run_sync(get_best_model_metrics),
+        "data": await db.run_sync(get_predictions_for_projects, lop_ids, q),
+    })
+
+
+@router.post("/projects")
+async def get_wp_for_projects(body: ProjectBatchRequest, db=Depends(get_async_db)):
+    return await build_batch_response(db, body.lop_ids, body.quarter)
+
+
+@router.get("/projects")
+async def get_wp_for_projects_query(
+    lop_id: str = Query(..., description="comma separated, e.g. lop_id=LOP-1,LOP-2"),
+    quarter: str | None = None,
+    db=Depends(get_async_db),
+):
+    return await build_batch_response(db, lop_id.split(","), quarter)
+
+
+# ============================================================
+# WHAT-IF SIMULATION
+# ============================================================
+
+@router.post("/simulate")
+async def simulate_win_probability(body: SimulationRequest, db=Depends(get_async_db)):
+    from app.services.wp_simulation import load_project, simulate
+
+    model = simulation_model()
+    lop_id, quarter, scenarios = simulation_inputs(body)
+    base = await db.run_sync(load_project, model, lop_id, quarter)
+    if base is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    # CPU-bound scoring off the event loop
+    return ORJSONResponse(await run_in_threadpool(simulate, model, *base, scenarios))
+
+
+# ============================================================
+# PROJECT ENDPOINTS
+# ============================================================
+
+@router.get("/project/{lop_id}")
+async def get_wp_by_project(lop_id: str, db=Depends(get_async_db)):
+    records = await db.run_sync(find_predictions, lop_id)
+    return await build_wp_response(db, records)
+
+
+@router.get("/project/{lop_id}/{quarter}")
+async def get_wp_by_project_quarter(lop_id: str, quarter: str, db=Depends(get_async_db)):
+    q = unquote(quarter).strip()
+    records = await db.run_sync(find_predictions, lop_id, None, q)
+    return await build_wp_response(db, records)
+
+
+# ============================================================
+# AE ENDPOINTS
+# ============================================================
+
+@router.get("/ae/{ae_id}")
+async def get_wp_by_ae(ae_id: str, db=Depends(get_async_db)):
+    records = await db.run_sync(find_predictions, None, int(ae_id))
+    return await build_wp_response(db, records)
+
+
+@router.get("/ae/{ae_id}/{quarter}")
+async def get_wp_by_ae_quarter(ae_id: str, quarter: str, db=Depends(get_async_db)):
+    q = unquote(quarter).strip()
+    records = await db.run_sync(find_predictions, None, int(ae_id), q)
+    return await build_wp_response(db, records)
+
+
+# ============================================================
+# GLOBAL ENDPOINTS
+# ============================================================
+
+@router.get("/all")
+async def get_wp_all(page: PageParams = Depends(), db=Depends(get_async_db)):
+    return await build_wp_page_response(db, None, page)
+
+
+@router.get("/{quarter}")
+async def get_wp_by_quarter(quarter: str, page: PageParams = Depends(), db=Depends(get_async_db)):
+    q = unquote(quarter).strip()
+    return await build_wp_page_response(db, q, page)
@@ -0,0 +1,80 @@
+import argparse
+import asyncio
+import statistics
+import time
+import httpx
+
+# ============================================================
+# Load test for the sync vs async handler stacks.
+# Start the API twice (DB_ASYNC_ENABLED=false / true), e.g.
+#   DB_ASYNC_ENABLED=true uvicorn app.main:app --port 8000
+# then run against each:
+#   python -m app.scripts.bench_async --url http://localhost:8000 --concurrency 200
+# Disable the response cache (RESPONSE_CACHE_ENABLED=false) so every
+# request reaches the database.
+# ============================================================
+
+DEFAULT_PATHS = [
+    "/wp/project/LOP-1-1",
+    "/wp/ae/40100001/Q1%202025",
+    "/project/ae/40100001",
+    "/ep/40100000/predictions?quarter=Q4&year=2025",
+    "/search?query=budi&limit=5",
+]
+
+
+async def worker(client, paths, queue, latencies, errors):
+    while True:
+        try:
+            i = queue.get_nowait()
+        except asyncio.QueueEmpty:
+            return
+        path = paths[i % len(paths)]
+        start = time.perf_counter()
+        try:
+            r = await client.get(path)
+            if r.status_code >= 500:
+                errors.append(r.status_code)
+        except httpx.HTTPError as e:
+            errors.append(type(e).__name__)
+        latencies.append(time.perf_counter() - start)
+
+
+async def run(url: str, paths: list[str], total: int, concurrency: int):
+    queue = asyncio.Queue()
+    for i in range(total):
+        queue.put_nowait(i)
+
+    latencies, errors = [], []
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=60) as client:
+        await client.get(paths[0])  # warm-up
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(client, paths, queue, latencies, errors) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    return latencies, errors, elapsed
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Concurrent load test for the read API.")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--path", action="append", help="endpoint to hit (repeatable)")
+    args = parser.parse_args()
+
+    paths = args.path or DEFAULT_PATHS
+    latencies, errors, elapsed = asyncio.run(run(args.url, paths, args.requests, args.concurrency))
+
+    print(f"📊 {args.requests} requests, concurrency {args.concurrency} -> {args.url}")
+    print(f"   throughput : {len(latencies) / elapsed:8.1f} req/s")
+    print(f"   mean       : {statistics.mean(latencies) * 1000:8.1f} ms")
+    for p in (50, 95, 99):
+        print(f"   p{p:<10}: {percentile(latencies, p) * 1000:8.1f} ms")
+    print(f"   errors     : {len(errors)}")
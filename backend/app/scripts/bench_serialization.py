@@ -0,0 +1,79 @@
+import argparse
+import json
+import random
+import time
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+from app.core.db import Base
+from app.models.kinerja import Kinerja
+from app.utils.pagination import output_columns
+from app.utils.serialization import dumps
+
+# ============================================================
+# Encode time per N rows: ORM objects + jsonable_encoder + json
+# (old implicit path) vs column rows -> dict + orjson (new path).
+# Runs against a throwaway in-memory SQLite database.
+# Usage: python -m app.scripts.bench_serialization --rows 10000
+# ============================================================
+
+
+def seed(db: Session, n: int):
+    rows = [
+        {
+            "quarter": f"Q{i % 4 + 1} 2025", "sheet": "kinerja",
+            "nik": 40100000 + i, "name": f"AE {i}",
+            "revenue": random.random() * 1e9,
+            "sales_datin": i % 7, "sales_wifi": i % 5, "sales_hsi": i % 3, "sales_wireline": i % 2,
+            "profitability": random.random(), "collection_rate": random.random(),
+            "ae_tools": random.random(), "nps": random.random(),
+            "capability": random.random(), "behaviour": random.random(),
+            "periode": "2025", "unit": "DGS",
+        }
+        for i in range(n)
+    ]
+    db.execute(insert(Kinerja), rows)
+    db.commit()
+
+
+def old_path(db: Session):
+    objs = db.query(Kinerja).all()
+    return json.dumps(jsonable_encoder(objs)).encode("utf-8")
+
+
+def new_path(db: Session):
+    columns = output_columns(Kinerja)
+    names = [c.name for c in columns]
+    rows = [dict(zip(names, r)) for r in db.execute(select(*columns))]
+    return dumps(rows)
+
+
+def timed(fn, engine, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        with Session(engine) as db:  # fresh session: no identity-map reuse
+            start = time.perf_counter()
+            fn(db)
+            best = min(best, time.perf_counter() - start)
+    return best
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark response serialization paths.")
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine, tables=[Kinerja.__table__])
+    with Session(engine) as db:
+        seed(db, args.rows)
+
+    old = timed(old_path, engine, args.repeat)
+    new = timed(new_path, engine, args.repeat)
+    per_10k = 10_000 / args.rows
+
+    print(f"📊 Serialization benchmark ({args.rows} rows, best of {args.repeat})")
+    print(f"   ORM + jsonable_encoder + json : {old * 1000:8.1f} ms  ({old * 1000 * per_10k:8.1f} ms / 10k rows)")
+    print(f"   rows -> dict + orjson         : {new * 1000:8.1f} ms  ({new * 1000 * per_10k:8.1f} ms / 10k rows)")
+    print(f"   speed-up                      : {old / new:8.1f}x")
@@ -0,0 +1,73 @@
+import argparse
+import random
+import statistics
+import sys
+import time
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from app.core.db import ReadSessionLocal
+from app.main import app
+from app.models.project import Project
+from app.services.wp_simulation import clear_simulation_cache
+
+# ============================================================
+# POST /wp/simulate latency for 1 / 100 / 10k scenarios, in-process
+# (request parsing + scoring + JSON encoding, no network).
+#   cold: scenario cache cleared before every request
+#   warm: same request repeated (every scenario cached)
+# Exits 1 when a cold median is over its target.
+# Needs WP_MODEL_PATH and a loaded project table.
+# Usage: python -m app.scripts.bench_simulate --repeat 5
+# ============================================================
+
+# scenarios per request -> cold median target (ms)
+TARGETS_MS = {1: 25, 100: 50, 10_000: 500}
+
+
+def scenarios(n: int):
+    return [
+        {"jumlah_aktivitas": random.randint(0, 40), "value_projects": random.uniform(1e6, 5e8)}
+        for _ in range(n)
+    ]
+
+
+def timed_post(client, body):
+    start = time.perf_counter()
+    response = client.post("/wp/simulate", json=body)
+    elapsed = time.perf_counter() - start
+    if response.status_code != 200:
+        raise RuntimeError(f"{response.status_code}: {response.text[:200]}")
+    return elapsed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the win probability simulation endpoint.")
+    parser.add_argument("--lop-id", help="project to simulate (default: first project)")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    lop_id = args.lop_id
+    if lop_id is None:
+        with ReadSessionLocal() as db:
+            lop_id = db.execute(select(Project.lop_id).where(Project.lop_id.isnot(None)).limit(1)).scalar()
+
+    failed = False
+    with TestClient(app) as client:
+        timed_post(client, {"lop_id": lop_id, "scenarios": scenarios(1)})  # load model / imports
+
+        print(f"📊 POST /wp/simulate for {lop_id} (median of {args.repeat})")
+        for n, target in TARGETS_MS.items():
+            body = {"lop_id": lop_id, "scenarios": scenarios(n)}
+            cold = []
+            for _ in range(args.repeat):
+                clear_simulation_cache()
+                cold.append(timed_post(client, body))
+            warm = [timed_post(client, body) for _ in range(args.repeat)]
+
+            cold_ms, warm_ms = statistics.median(cold) * 1000, statistics.median(warm) * 1000
+            ok = cold_ms <= target
+            failed |= not ok
+            print(f"   {'✓' if ok else '❌'} {n:6d} scenarios  cold {cold_ms:8.1f} ms  warm {warm_ms:8.1f} ms"
+                  f"  (target {target} ms)")
+
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,98 @@
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+# ============================================================
+# Cold-start benchmark. Every run is a fresh interpreter:
+#   1. python -X importtime -c "import app.main"  -> import profile
+#   2. import app.main + lifespan startup + first request (/health/db)
+# Fails (exit 1) when the median time to first response is over
+# the target. Env vars (APP_ROUTERS, STARTUP_WARMUP, ...) pass through.
+# Usage: python -m app.scripts.bench_startup --runs 5 --target-ms 1500
+# ============================================================
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+IMPORTTIME_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+FIRST_RESPONSE = """
+import json, time
+t0 = time.perf_counter()
+import app.main
+t1 = time.perf_counter()
+from fastapi.testclient import TestClient
+with TestClient(app.main.app) as client:
+    t2 = time.perf_counter()
+    status = client.get("/health/db").status_code
+    t3 = time.perf_counter()
+print(json.dumps({"import": t1 - t0, "startup": t2 - t1, "first_request": t3 - t2, "status": status}))
+"""
+
+
+def run_python(args):
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, *args], cwd=BACKEND_DIR, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr else "failed")
+    return result, time.perf_counter() - start
+
+
+def import_profile():
+    """{module: (self_us, cumulative_us, depth)} of one `import app.main`."""
+    result, _ = run_python(["-X", "importtime", "-c", "import app.main"])
+    modules = {}
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_RE.match(line)
+        if match:
+            own, cumulative, indent, name = match.groups()
+            modules[name] = (int(own), int(cumulative), len(indent) // 2)
+    return modules
+
+
+def first_response():
+    result, wall = run_python(["-c", FIRST_RESPONSE])
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+    timings["wall"] = wall
+    return timings
+
+
+def ms(seconds):
+    return f"{seconds * 1000:8.1f} ms"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark API cold start.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="slowest imports to list")
+    parser.add_argument("--target-ms", type=float, default=1500,
+                        help="max median time from process start to first response")
+    args = parser.parse_args()
+
+    profiles = [import_profile() for _ in range(args.runs)]
+    runs = [first_response() for _ in range(args.runs)]
+
+    print(f"📊 Cold start (median of {args.runs} fresh processes)")
+    print(f"   import app.main (importtime) : {ms(statistics.median(p['app.main'][1] for p in profiles) / 1e6)}")
+    for key, label in [("import", "import app.main"), ("startup", "lifespan startup"),
+                       ("first_request", "first request"), ("wall", "process -> first response")]:
+        print(f"   {label:<29}: {ms(statistics.median(r[key] for r in runs))}")
+
+    profile = profiles[-1]
+    own_app = sum(own for name, (own, _, _) in profile.items() if name == "app" or name.startswith("app."))
+    print(f"   app.* modules (self time)    : {ms(own_app / 1e6)}")
+
+    print(f"\n📌 Slowest top-level imports under app.main (cumulative, last run)")
+    top_level = [(cum, name) for name, (_, cum, depth) in profile.items() if depth == 1]
+    for cumulative, name in sorted(top_level, reverse=True)[:args.top]:
+        print(f"   {name:<45} {ms(cumulative / 1e6)}")
+
+    wall = statistics.median(r["wall"] for r in runs)
+    if wall * 1000 > args.target_ms:
+        print(f"\n❌ {wall * 1000:.0f} ms to first response, target {args.target_ms:.0f} ms")
+        sys.exit(1)
+    print(f"\n✓ {wall * 1000:.0f} ms to first response (target {args.target_ms:.0f} ms)")
@@ -0,0 +1,253 @@
+import hashlib
+import io
+import json
+import math
+import time
+from functools import lru_cache
+from sqlalchemy import Float, Integer, insert, select
+from sqlalchemy.orm import Session
+
+
+# ============================================================
+# Column helpers (computed once per model, not per row)
+# ============================================================
+
+@lru_cache(maxsize=None)
+def insert_columns(model_cls):
+    """(name, kind) for every column written by the loaders (autoincrement PK excluded)."""
+    cols = []
+    for col in model_cls.__table__.columns:
+        if col.primary_key:
+            continue
+        if isinstance(col.type, Integer):
+            kind = "int"
+        elif isinstance(col.type, Float):
+            kind = "float"
+        else:
+            kind = None
+        cols.append((col.name, kind))
+    return tuple(cols)
+
+
+def _coerce(value, kind):
+    if value is None or kind is None:
+        return value
+    if isinstance(value, str):
+        value = value.strip()
+        if value == "":
+            return None
+        try:
+            value = float(value)
+        except ValueError:
+            return value
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    if kind == "int" and isinstance(value, float):
+        return int(value) if value.is_integer() else round(value)
+    return value
+
+
+def build_row(model_cls, data: dict, **extra):
+    """
+    Full row dict for `model_cls`: every insertable column present (None when
+    missing), unknown keys dropped, numeric values coerced to the column type,
+    plus `row_hash` over the content when the model has that column.
+    """
+    row = {}
+    for name, kind in insert_columns(model_cls):
+        value = extra[name] if name in extra else data.get(name)
+        row[name] = _coerce(value, kind)
+    if "row_hash" in row:
+        row["row_hash"] = content_hash(row)
+    return row
+
+
+def content_hash(row: dict):
+    payload = {k: v for k, v in row.items() if k != "row_hash"}
+    encoded = json.dumps(payload, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.md5(encoded.encode("utf-8")).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def natural_key(model_cls):
+    """Columns of the model's unique index (e.g. nik + quarter)."""
+    for index in model_cls.__table__.indexes:
+        if index.unique:
+            return tuple(col.name for col in index.columns)
+    raise ValueError(f"{model_cls.__name__} has no unique index to upsert on")
+
+
+def dialect_insert(db: Session):
+    """INSERT construct supporting ON CONFLICT for the session's dialect."""
+    name = db.get_bind().dialect.name
+    if name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
+        return pg_insert
+    if name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+        return sqlite_insert
+    raise RuntimeError(f"Upsert is not supported for dialect '{name}'")
+
+
+# ============================================================
+# COPY FROM STDIN (PostgreSQL text format)
+# ============================================================
+
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def _copy_value(value):
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, (dict, list)):
+        value = json.dumps(value)
+    return str(value).translate(_COPY_ESCAPES)
+
+
+def supports_copy(db: Session):
+    dialect = db.get_bind().dialect
+    return dialect.name == "postgresql" and dialect.driver == "psycopg2"
+
+
+# ============================================================
+# Bulk loader
+# ============================================================
+
+class BulkLoader:
+    """
+    Buffers rows per model and writes them in batches.
+
+    mode="append": COPY FROM STDIN on PostgreSQL (psycopg2), executemany INSERT elsewhere.
+    mode="upsert": INSERT ... ON CONFLICT (natural key) DO UPDATE, rows whose
+                   content hash is already stored are skipped before sending.
+
+    Rows are written inside the session transaction; the caller commits.
+    """
+
+    def __init__(self, db: Session, batch_size: int = 5000, use_copy: bool = True, mode: str = "append"):
+        if mode not in ("append", "upsert"):
+            raise ValueError(f"Unknown load mode '{mode}'")
+        self.db = db
+        self.mode = mode
+        self.batch_size = max(1, batch_size)
+        self.use_copy = use_copy and mode == "append" and supports_copy(db)
+        self._buffers = {}
+        self._existing = {}
+        self.stats = {}
+        self.started = time.perf_counter()
+
+    def _stat(self, model_cls):
+        return self.stats.setdefault(model_cls.__tablename__, {
+            "rows": 0, "inserted": 0, "updated": 0, "unchanged": 0, "skipped": 0,
+            "batches": 0, "seconds": 0.0,
+        })
+
+    def wrote(self, *model_classes):
+        """True when any row of these models was written (inserted or changed) so far."""
+        return any(self.stats.get(m.__tablename__, {}).get("rows") for m in model_classes)
+
+    def add(self, model_cls, data: dict, **extra):
+        row = build_row(model_cls, data, **extra)
+
+        if self.mode == "append":
+            buf = self._buffers.setdefault(model_cls, [])
+            buf.append(row)
+        else:
+            key = tuple(row[c] for c in natural_key(model_cls))
+            stat = self._stat(model_cls)
+            if None in key:
+                stat["skipped"] += 1  # cannot be matched on a later run
+                return
+            stored = self._existing_hashes(model_cls)
+            if key in stored and stored[key] == row["row_hash"]:
+                stat["unchanged"] += 1
+                return
+            stat["updated" if key in stored else "inserted"] += 1
+            stored[key] = row["row_hash"]
+            # dict buffer: a key repeated in the input keeps its last row
+            buf = self._buffers.setdefault(model_cls, {})
+            buf[key] = row
+
+        if len(buf) >= self.batch_size:
+            self._flush_model(model_cls)
+
+    def _existing_hashes(self, model_cls):
+        if model_cls not in self._existing:
+            table = model_cls.__table__
+            cols = [table.c[c] for c in natural_key(model_cls)]
+            result = self.db.execute(select(*cols, table.c.row_hash))
+            self._existing[model_cls] = {tuple(r[:-1]): r[-1] for r in result}
+        return self._existing[model_cls]
+
+    def flush(self):
+        for model_cls in list(self._buffers):
+            self._flush_model(model_cls)
+
+    def _flush_model(self, model_cls):
+        buf = self._buffers.get(model_cls)
+        if not buf:
+            return
+        rows = list(buf.values()) if isinstance(buf, dict) else buf
+
+        start = time.perf_counter()
+        if self.mode == "upsert":
+            self._upsert(model_cls, rows)
+        elif self.use_copy:
+            self._copy(model_cls, rows)
+        else:
+            self.db.execute(insert(model_cls.__table__), rows)
+        elapsed = time.perf_counter() - start
+
+        stat = self._stat(model_cls)
+        stat["rows"] += len(rows)
+        stat["batches"] += 1
+        stat["seconds"] += elapsed
+
+        self._buffers[model_cls] = type(buf)()
+
+    def _upsert(self, model_cls, rows):
+        table = model_cls.__table__
+        keys = natural_key(model_cls)
+
+        stmt = dialect_insert(self.db)(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(keys),
+            set_={name: stmt.excluded[name] for name, _ in insert_columns(model_cls) if name not in keys},
+            where=table.c.row_hash.is_distinct_from(stmt.excluded.row_hash),
+        )
+        self.db.execute(stmt, rows)
+
+    def _copy(self, model_cls, rows):
+        names = [name for name, _ in insert_columns(model_cls)]
+        buf = io.StringIO()
+        for row in rows:
+            buf.write("\t".join(_copy_value(row[n]) for n in names))
+            buf.write("\n")
+        buf.seek(0)
+
+        sql = f'COPY {model_cls.__tablename__} ({", ".join(names)}) FROM STDIN'
+        cursor = self.db.connection().connection.cursor()
+        try:
+            cursor.copy_expert(sql, buf)
+        finally:
+            cursor.close()
+
+    def report(self):
+        self.flush()
+        total_rows = sum(s["rows"] for s in self.stats.values())
+        elapsed = time.perf_counter() - self.started
+        method = "upsert" if self.mode == "upsert" else ("COPY" if self.use_copy else "executemany")
+
+        print(f"\n📊 Bulk load report ({method}, batch size {self.batch_size})")
+        for table, s in self.stats.items():
+            rate = s["rows"] / s["seconds"] if s["seconds"] else 0
+            line = f"   {table:<20} {s['rows']:>9} rows  {s['batches']:>5} batches  {rate:>12,.0f} rows/s"
+            if self.mode == "upsert":
+                line += f"  (+{s['inserted']} new, ~{s['updated']} changed, ={s['unchanged']} unchanged"
+                line += f", {s['skipped']} without key)" if s["skipped"] else ")"
+            print(line)
+        rate = total_rows / elapsed if elapsed else 0
+        print(f"   {'TOTAL':<20} {total_rows:>9} rows  {elapsed:>8.2f}s  {rate:>12,.0f} rows/s")
+        return {"rows": total_rows, "seconds": elapsed, "tables": self.stats}
@@ -0,0 +1,164 @@
+import json
+import sys
+from sqlalchemy import select
+from app.core.db import engine
+from app.models.ep import EvaluationPredictionMeta
+from app.models.evaluasi_kinerja import EvaluasiKinerja
+from app.models.fi import FeatureImportanceMeta
+from app.models.kinerja import Kinerja
+from app.models.orientasi import Orientasi
+from app.models.pelaksanaan import Pelaksanaan
+from app.models.pengembangan import Pengembangan
+from app.models.project import Project
+from app.models.wp import WinProbPrediction
+from app.routers.orientasi_router import summary_columns
+from app.services.evaluation_prediction_service import bulk_query, detail_query
+from app.services.feature_importance_service import feature_query
+from app.services.wp_service import prediction_filters, project_batch_filters
+from app.utils.pagination import PageParams, count_statement, page_statement, rows_statement
+
+# ============================================================
+# EXPLAIN check: every filtered endpoint must use an index.
+# Statements are built with the same helpers the routers run
+# (page_statement / count_statement / rows_statement and the
+# service query builders), so the keyset ORDER BY id LIMIT n+1
+# pages and their counts are checked as sent.
+# Full-table endpoints (/all) are intentionally not listed.
+# Usage: python -m app.scripts.explain_check
+# ============================================================
+
+NIK = 40100000
+QUARTER = "Q1 2025"
+LOP_ID = "LOP-0"
+
+
+def page_params(limit: int | None = 100, cursor: int | None = None):
+    return PageParams(limit=limit, cursor=cursor, fields=None, stream=False, accept=None)
+
+
+def paged_endpoint(name: str, model, filters: list, columns=None):
+    """
+    A paginated list endpoint: unpaginated / streamed body, first page,
+    next page (cursor) and the X-Total-Count query.
+    """
+    return [
+        (f"{name}", page_statement(model, filters, page_params(None), columns)[0]),
+        (f"{name}?limit=", page_statement(model, filters, page_params(), columns, lookahead=1)[0]),
+        (f"{name}?limit=&cursor=", page_statement(model, filters, page_params(cursor=1000), columns, lookahead=1)[0]),
+        (f"{name} (total)", count_statement(model, filters)),
+    ]
+
+
+def rows_endpoint(name: str, model, filters: list, limit: int | None = None):
+    """An endpoint answered with fetch_rows."""
+    return [(name, rows_statement(model, filters, limit=limit)[0])]
+
+
+def endpoint_queries():
+    return [
+        # orientasi_router
+        *paged_endpoint("GET /orientasi/quarter/{quarter}", Orientasi, [Orientasi.quarter == QUARTER],
+                        summary_columns(None)),
+        *rows_endpoint("GET /orientasi/nik/{nik}", Orientasi, [Orientasi.nik == NIK]),
+        *rows_endpoint("GET /orientasi/nik/{nik}/quarter/{quarter}", Orientasi,
+                       [Orientasi.nik == NIK, Orientasi.quarter == QUARTER], limit=1),
+
+        # sheet routers
+        *paged_endpoint("GET /pelaksanaan/{quarter}", Pelaksanaan, [Pelaksanaan.quarter == QUARTER]),
+        *paged_endpoint("GET /kinerja/{quarter}", Kinerja, [Kinerja.quarter == QUARTER]),
+        *paged_endpoint("GET /pengembangan/{quarter}", Pengembangan, [Pengembangan.quarter == QUARTER]),
+
+        # evaluasi_router
+        *paged_endpoint("GET /evaluasi/{quarter}", EvaluasiKinerja, [EvaluasiKinerja.quarter == QUARTER]),
+        *rows_endpoint("GET /evaluasi/ae/{nik}", EvaluasiKinerja,
+                       [EvaluasiKinerja.nik == NIK, EvaluasiKinerja.quarter == QUARTER], limit=1),
+
+        # project_router
+        *paged_endpoint("GET /project/quarter/{quarter}", Project, [Project.quarter == QUARTER]),
+        *rows_endpoint("GET /project/ae/{nik}", Project, [Project.nik == NIK]),
+        *rows_endpoint("GET /project/ae/{nik}/{quarter}", Project, [Project.nik == NIK, Project.quarter == QUARTER]),
+
+        # win_probability (wp_service filters)
+        *rows_endpoint("GET /wp/project/{lop_id}", WinProbPrediction, prediction_filters(lop_id=LOP_ID)),
+        *rows_endpoint("GET /wp/project/{lop_id}/{quarter}", WinProbPrediction,
+                       prediction_filters(lop_id=LOP_ID, quarter=QUARTER)),
+        *rows_endpoint("GET|POST /wp/projects", WinProbPrediction,
+                       project_batch_filters([LOP_ID, "LOP-1"], QUARTER)),
+        *rows_endpoint("GET /wp/ae/{ae_id}", WinProbPrediction, prediction_filters(nik=NIK)),
+        *rows_endpoint("GET /wp/ae/{ae_id}/{quarter}", WinProbPrediction,
+                       prediction_filters(nik=NIK, quarter=QUARTER)),
+        *paged_endpoint("GET /wp/{quarter}", WinProbPrediction, prediction_filters(quarter=QUARTER)),
+
+        # evaluation_prediction_service
+        ("GET /ep/{nik}/predictions (prediction JOIN meta)", detail_query(NIK, "Q4", 2025)),
+        ("GET /ep/predictions", bulk_query([NIK, NIK + 1], "Q4", 2025)),
+        ("ep meta (period)",
+         select(EvaluationPredictionMeta).where(
+             EvaluationPredictionMeta.prediction_quarter == "Q4",
+             EvaluationPredictionMeta.prediction_year == 2025,
+         )),
+
+        # feature_importance
+        ("fi meta (phase)", select(FeatureImportanceMeta).where(FeatureImportanceMeta.phase == "orientasi_to_pelaksanaan")),
+        ("GET /fi/{phase}/{quarter}?top_k=", feature_query(["orientasi_to_pelaksanaan"], QUARTER, 5)),
+        ("GET /fi", feature_query(["orientasi_to_pelaksanaan", "pelaksanaan_to_kinerja"], "ALL")),
+    ]
+
+
+# ------------------------------------------------
+# Plan inspection per dialect
+# ------------------------------------------------
+
+def _pg_nodes(plan):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _pg_nodes(child)
+
+
+def explain_postgresql(conn, sql):
+    # with sequential scans disabled the planner still picks one when no index applies
+    conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+    raw = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}").scalar()
+    plan = (json.loads(raw) if isinstance(raw, str) else raw)[0]["Plan"]
+    nodes = [n["Node Type"] for n in _pg_nodes(plan)]
+    uses_index = any("Index" in n for n in nodes) and "Seq Scan" not in nodes
+    return uses_index, " -> ".join(nodes)
+
+
+def explain_sqlite(conn, sql):
+    details = [row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")]
+    uses_index = all(
+        "USING" in d and ("INDEX" in d or "PRIMARY KEY" in d)
+        for d in details if d.startswith(("SCAN", "SEARCH"))
+    )
+    return uses_index, "; ".join(details)
+
+
+def run_check():
+    dialect = engine.dialect.name
+    explain = {"postgresql": explain_postgresql, "sqlite": explain_sqlite}.get(dialect)
+    if explain is None:
+        raise RuntimeError(f"EXPLAIN check not implemented for dialect '{dialect}'")
+
+    failures = 0
+    with engine.connect() as conn:
+        for name, stmt in endpoint_queries():
+            sql = str(stmt.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True}))
+            trans = conn.begin()
+            try:
+                ok, plan = explain(conn, sql)
+            finally:
+                trans.rollback()
+            failures += not ok
+            print(f"{'✓' if ok else '❌'} {name:<55} {plan}")
+
+    return failures
+
+
+if __name__ == "__main__":
+    print(f"📌 EXPLAIN check ({engine.dialect.name})")
+    failed = run_check()
+    if failed:
+        print(f"\n❌ {failed} endpoint(s) without an index scan")
+        sys.exit(1)
+    print("\n✓ All filtered endpoints use an index.")
@@ -1,5 +1,7 @@
 import os
 import json
+import argparse
+from app.core.config import settings
 from app.core.db import SessionLocal
 from app.models.fi import FeatureImportanceMeta, FeatureImportance
 from app.models.wp import WinProbMeta, WinProbPrediction
@@ -9,6 +11,12 @@ from app.models.kinerja import Kinerja
 from app.models.evaluasi_kinerja import EvaluasiKinerja
 from app.models.pengembangan import Pengembangan
 from app.models.project import Project
+from app.scripts.bulk_loader import BulkLoader, build_row
+from app.services.feature_importance_service import OVERALL, build_pivot, rank_features
+from app.services.orientasi_service import refresh_orientasi_summary
+from app.services.search_service import rebuild_ae_directory
+from app.services.version_service import FI, SHEETS, WP, bump_dataset_version
+from app.utils.json_stream import iter_keyed_arrays, iter_quarter_sheets
 
 BASE_DIR = os.path.dirname(os.path.dirname(__file__))  # app/
 BASE_PATH = os.path.join(BASE_DIR, "data")
@@ -17,7 +25,7 @@ BASE_PATH = os.path.join(BASE_DIR, "data")
 # 1. LOAD FEATURE IMPORTANCE JSON
 # ============================================================
 
-def load_fi_results(db):
+def load_fi_results(db, loader: BulkLoader):
     fi_path = os.path.join(BASE_PATH, "fi_results_normalized.json")
     print(f"📌 Loading Feature Importance from {fi_path}")
 
@@ -25,41 +33,35 @@ def load_fi_results(db):
         fi_json = json.load(f)
 
     for phase_key, phase_data in fi_json.items():
+        # cross-quarter matrix computed once here instead of per request / client-side
+        pivot = build_pivot(phase_data.get("features_overall", []), phase_data.get("features_by_quarter", {}))
+        loader.add(FeatureImportanceMeta, phase_data, phase=phase_key, pivot=pivot)
 
-        meta = FeatureImportanceMeta(
-            phase=phase_key,
-            phase_config=phase_data.get("phase_config"),
-            best_regressor=phase_data.get("best_regressor"),
-            metrics_overall=phase_data.get("metrics_overall"),
-            metrics_by_quarter=phase_data.get("metrics_by_quarter")
-        )
+    loader.flush()
 
-        db.add(meta)
-        db.flush()  # get meta.id
+    # meta ids (new or already stored) per phase
+    meta_ids = dict(db.query(FeatureImportanceMeta.phase, FeatureImportanceMeta.id).all())
+
+    for phase_key, phase_data in fi_json.items():
+        meta_id = meta_ids[phase_key]
 
         # Overall features
-        for feat in phase_data.get("features_overall", []):
-            db.add(FeatureImportance(
-                phase=phase_key,
-                quarter="ALL",
-                feature=feat["feature"],
-                importance=feat["importance"],
-                description=feat.get("description", ""),
-                meta_id=meta.id
-            ))
+        overall = phase_data.get("features_overall", [])
+        ranks = rank_features(overall)
+        for feat in overall:
+            loader.add(FeatureImportance, feat, phase=phase_key, quarter=OVERALL, rank=ranks[feat["feature"]],
+                       description=feat.get("description", ""), meta_id=meta_id)
 
         # Per quarter features
         for q, feat_list in phase_data.get("features_by_quarter", {}).items():
+            ranks = rank_features(feat_list)
             for feat in feat_list:
-                db.add(FeatureImportance(
-                    phase=phase_key,
-                    quarter=q,
-                    feature=feat["feature"],
-                    importance=feat["importance"],
-                    description=feat.get("description", ""),
-                    meta_id=meta.id
-                ))
+                loader.add(FeatureImportance, feat, phase=phase_key, quarter=q, rank=ranks[feat["feature"]],
+                           description=feat.get("description", ""), meta_id=meta_id)
 
+    loader.flush()
+    if loader.wrote(FeatureImportanceMeta, FeatureImportance):
+        bump_dataset_version(db, FI)
     print("✓ Feature Importance loaded.")
 
 
@@ -67,82 +69,43 @@ def load_fi_results(db):
 # 2. LOAD RAW HRIS SHEET DATA (orientasi → pengembangan)
 # ============================================================
 
-def filter_valid_fields(data: dict, model_cls):
-    """Remove keys that do not exist as model columns."""
-    valid_columns = set(model_cls.__table__.columns.keys())
-    return {k: v for k, v in data.items() if k in valid_columns}
-
-def load_raw_sheets(db):
+# sheet name in JSON -> model
+SHEET_MODELS = {
+    "orientasi": Orientasi,
+    "pelaksanaan": Pelaksanaan,
+    "kinerja": Kinerja,
+    "evaluasi kinerja": EvaluasiKinerja,
+    "pengembangan": Pengembangan,
+    "project": Project,
+}
+
+def load_raw_sheets(db, loader: BulkLoader):
     print(f"📌 Loading Raw Sheets from {BASE_PATH}")
-    with open(os.path.join(BASE_PATH, "input_data_all_quarters.json"), "r") as f:
-        data = json.load(f)
-
-    for qdata in data["quarters"]:
-        quarter = qdata["quarter"]
-        sheets = qdata["sheets"]
-
-        # ---------- ORIENTASI ----------
-        for item in sheets.get("orientasi", []):
-            filtered = filter_valid_fields(item, Orientasi)
-            db.add(Orientasi(
-                quarter=quarter,
-                sheet="orientasi",
-                **filtered
-            ))
-
-        # ---------- PELAKSANAAN ----------
-        for item in sheets.get("pelaksanaan", []):
-            filtered = filter_valid_fields(item, Pelaksanaan)
-            db.add(Pelaksanaan(
-                quarter=quarter,
-                sheet="pelaksanaan",
-                **filtered
-            ))
-
-        # ---------- KINERJA ----------
-        for item in sheets.get("kinerja", []):
-            filtered = filter_valid_fields(item, Kinerja)
-            db.add(Kinerja(
-                quarter=quarter,
-                sheet="kinerja",
-                **filtered
-            ))
-
-        # ---------- EVALUASI ----------
-        for item in sheets.get("evaluasi kinerja", []):
-            filtered = filter_valid_fields(item, EvaluasiKinerja)
-            db.add(EvaluasiKinerja(
-                quarter=quarter,
-                sheet="evaluasi kinerja",
-                **filtered
-            ))
-
-        # ---------- PENGEMBANGAN ----------
-        for item in sheets.get("pengembangan", []):
-            filtered = filter_valid_fields(item, Pengembangan)
-            db.add(Pengembangan(
-                quarter=quarter,
-                sheet="pengembangan",
-                **filtered
-            ))
-
-        # ---------- PROJECT ----------
-        for item in sheets.get("project", []):
-            filtered = filter_valid_fields(item, Project)
-            db.add(Project(
-                quarter=quarter,
-                sheet="project",
-                **filtered
-            ))
-
-    db.commit()
+    path = os.path.join(BASE_PATH, "input_data_all_quarters.json")
+
+    # rows are streamed one by one, never the whole document
+    for quarter, sheet, item in iter_quarter_sheets(path):
+        model_cls = SHEET_MODELS.get(sheet)
+        if model_cls is None:
+            continue
+        loader.add(model_cls, item, quarter=quarter, sheet=sheet)
+
+    loader.flush()
+    if loader.wrote(*SHEET_MODELS.values()):
+        bump_dataset_version(db, SHEETS)
     print("✓ Raw Sheet Input loaded.")
 
+    count = refresh_orientasi_summary(db)
+    print(f"✓ Orientasi summary computed ({count} rows).")
+
+    count = rebuild_ae_directory(db)
+    print(f"✓ AE search directory rebuilt ({count} AEs).")
+
 # ============================================================
 # 3. LOAD WIN PROBABILITY (predictions & metadata)
 # ============================================================
 
-def load_winprob(db):
+def load_winprob(db, loader: BulkLoader):
     wp_pred_path = os.path.join(BASE_PATH, "winprob_predictions_by_quarter.json")
     wp_meta_path = os.path.join(BASE_PATH, "winprob_model_meta.json")
 
@@ -150,64 +113,56 @@ def load_winprob(db):
     print(f"📌 Loading Win Probability model metadata from {wp_meta_path}")
 
     # ------------------ LOAD PREDICTIONS ------------------
-    with open(wp_pred_path, "r") as f:
-        wp_json = json.load(f)
-
-    for quarter, rows in wp_json.items():
-        for row in rows:
-            db.add(WinProbPrediction(
-                quarter = quarter,
-
-                # identity
-                nik = row.get("nik"),
-                name = row.get("name"),
-                unit = row.get("unit"),
-
-                # project info
-                lop_id = row.get("lop_id"),
-                project_name = row.get("project_name"),
-                customer_name = row.get("customer_name"),
-                stage = row.get("stage"),
-                status = row.get("status"),
-
-                # numeric values
-                value_projects = row.get("value_projects"),
-                jumlah_aktivitas = row.get("jumlah_aktivitas"),
-
-                # predictions
-                win_probability = row.get("win_probability"),
-                win_probability_pct = row.get("win_probability_pct"),
-                predicted_class = row.get("predicted_class"),
-                top_positive_factors = row.get("top_positive_factors"),
-                top_negative_factors = row.get("top_negative_factors"),
-
-            ))
+    for quarter, row in iter_keyed_arrays(wp_pred_path):
+        loader.add(WinProbPrediction, row, quarter=quarter)
+
+    loader.flush()
 
     # ------------------ LOAD META ------------------
     with open(wp_meta_path, "r") as f:
         meta = json.load(f)
 
-    db.add(WinProbMeta(
-        best_model_name = meta.get("best_model_name"),
-        metrics = meta.get("metrics")
-    ))
+    row = build_row(WinProbMeta, meta)
+    latest = db.query(WinProbMeta).order_by(WinProbMeta.id.desc()).first()
+
+    meta_changed = not (loader.mode == "upsert" and latest and latest.row_hash == row["row_hash"])
+    if meta_changed:
+        db.add(WinProbMeta(**row))
+    else:
+        print("= Win Probability model metadata unchanged.")
 
-    db.commit()
+    if meta_changed or loader.wrote(WinProbPrediction):
+        bump_dataset_version(db, WP)
     print("✓ Win Probability predictions loaded.")
 
 # ============================================================
 # MAIN EXECUTION
 # ============================================================
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Load all pipeline JSON into the database.")
+    parser.add_argument("--batch-size", type=int, default=settings.LOAD_BATCH_SIZE,
+                        help="rows per INSERT/COPY batch")
+    parser.add_argument("--no-copy", action="store_true",
+                        help="use executemany INSERT even when COPY is available")
+    parser.add_argument("--mode", choices=["upsert", "append"], default=settings.LOAD_MODE,
+                        help="upsert: idempotent, writes only changed rows; append: plain insert into empty tables")
+    return parser.parse_args()
+
+
 if __name__ == "__main__":
+    args = parse_args()
     db = SessionLocal()
 
     try:
-        load_fi_results(db)
-        load_raw_sheets(db)
-        load_winprob(db)
+        loader = BulkLoader(db, batch_size=args.batch_size, use_copy=not args.no_copy, mode=args.mode)
+
+        load_fi_results(db, loader)
+        load_raw_sheets(db, loader)
+        load_winprob(db, loader)
 
         db.commit()
+        loader.report()
         print("\n🎉 ALL JSON DATA SUCCESSFULLY LOADED INTO DATABASE!")
 
     except Exception as e:
@@ -1,11 +1,17 @@
 import os
 import json
+import argparse
 from sqlalchemy.orm import Session
+from app.core.config import settings
 from app.core.db import SessionLocal
 from app.models.ep import (
+    REGRESSION_FIELDS,
     EvaluationPrediction,
     EvaluationPredictionMeta
 )
+from app.scripts.bulk_loader import BulkLoader
+from app.services.version_service import EP, bump_dataset_version
+from app.utils.json_stream import iter_json_array
 
 BASE_DIR = os.path.dirname(os.path.dirname(__file__))  # /app
 DATA_DIR = os.path.join(BASE_DIR, "data")
@@ -14,61 +20,69 @@ META_FILE = "evaluation__meta__q4_2025.json"
 PRED_FILE = "evaluation__predictions__q4_2025.json"
 
 
-def load_evaluation_meta(db: Session, filename: str):
+def load_evaluation_meta(db: Session, filename: str, loader: BulkLoader):
     path = os.path.join(DATA_DIR, filename)
     print(f"📌 Loading Evaluation Metadata: {path}")
 
     with open(path, "r") as f:
         meta_json = json.load(f)
 
-    meta_row = EvaluationPredictionMeta(
-        prediction_quarter=meta_json["prediction_quarter"],
-        prediction_year=meta_json["prediction_year"],
-        generated_date=meta_json["generated_date"],
+    loader.add(
+        EvaluationPredictionMeta,
+        meta_json,
         best_regressor=meta_json["models"]["regression"]["name"],
         best_classifier=meta_json["models"]["classification"]["name"],
         model_metrics=meta_json["models"]
     )
-
-    db.add(meta_row)
-    db.commit()
-    return meta_row.id
+    loader.flush()
 
 
-def load_evaluation_predictions(db: Session, filename: str):
+def load_evaluation_predictions(db: Session, filename: str, loader: BulkLoader):
     path = os.path.join(DATA_DIR, filename)
     print(f"📌 Loading Evaluation Predictions: {path}")
 
-    with open(path, "r") as f:
-        rows = json.load(f)
-
     inserted = 0
 
-    for row in rows:
-        pred = EvaluationPrediction(
-            nik=row.get("nik"),
-            name=row.get("name"),
-
-            prediction_quarter=row["prediction_quarter"],
-            prediction_year=row["prediction_year"],
-
-            predicted_kuadran=row["predicted_kuadran"],
-            prediction_confidence=row["prediction_confidence"],
-            predictions_json=row["predictions"],
-            raw_json=row
+    # rows are streamed from the file and written in batches
+    for row in iter_json_array(path):
+        # regression outputs go to their typed columns; the JSON copies are not kept
+        loader.add(
+            EvaluationPrediction,
+            row,
+            **{f: row["predictions"].get(f) for f in REGRESSION_FIELDS},
+            predictions_json=None,
+            raw_json=row if settings.EP_STORE_RAW_JSON else None,
         )
-        db.add(pred)
         inserted += 1
 
+    loader.flush()
+    bump_dataset_version(db, EP)
     db.commit()
     print(f"✓ {inserted} predictions saved.")
 
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Load evaluation prediction JSON into the database.")
+    parser.add_argument("--meta-file", default=META_FILE)
+    parser.add_argument("--pred-file", default=PRED_FILE)
+    parser.add_argument("--batch-size", type=int, default=settings.LOAD_BATCH_SIZE,
+                        help="rows per INSERT/COPY batch")
+    parser.add_argument("--no-copy", action="store_true",
+                        help="use executemany INSERT even when COPY is available")
+    parser.add_argument("--mode", choices=["upsert", "append"], default=settings.LOAD_MODE,
+                        help="upsert: idempotent, writes only changed rows; append: plain insert into empty tables")
+    return parser.parse_args()
+
+
 if __name__ == "__main__":
+    args = parse_args()
     db = SessionLocal()
     try:
-        meta_id = load_evaluation_meta(db, META_FILE)
-        load_evaluation_predictions(db, PRED_FILE)
+        loader = BulkLoader(db, batch_size=args.batch_size, use_copy=not args.no_copy, mode=args.mode)
+
+        load_evaluation_meta(db, args.meta_file, loader)
+        load_evaluation_predictions(db, args.pred_file, loader)
+        loader.report()
 
         print("\n🎉 Evaluation predictions loaded successfully!")
     except Exception as e:
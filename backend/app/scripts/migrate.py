@@ -0,0 +1,161 @@
+from sqlalchemy import and_, bindparam, delete, func, inspect, or_, select, update
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.db import Base, engine
+
+# register every model on Base.metadata
+import app.models.ae_directory  # noqa: F401
+import app.models.dataset_version  # noqa: F401
+import app.models.ep  # noqa: F401
+import app.models.evaluasi_kinerja  # noqa: F401
+import app.models.fi  # noqa: F401
+import app.models.kinerja  # noqa: F401
+import app.models.orientasi  # noqa: F401
+import app.models.pelaksanaan  # noqa: F401
+import app.models.pengembangan  # noqa: F401
+import app.models.project  # noqa: F401
+import app.models.wp  # noqa: F401
+from app.models.ae_directory import AEDirectory
+from app.models.ep import REGRESSION_FIELDS, EvaluationPrediction
+from app.models.fi import FeatureImportance, FeatureImportanceMeta
+from app.services.feature_importance_service import OVERALL, build_pivot, rank_features
+from app.services.orientasi_service import refresh_orientasi_summary
+from app.services.search_service import rebuild_ae_directory
+
+# ============================================================
+# Idempotent schema migration
+#   1. create missing tables
+#   2. add missing columns to existing tables
+#   3. remove duplicate natural-key rows (keep the newest id)
+#   4. create missing indexes (incl. unique natural keys)
+#   5. backfill derived data (AE search directory, orientasi summary,
+#      typed ep_predictions columns from the legacy JSON copies,
+#      feature importance rank / pivot)
+# Safe to run any number of times.
+# ============================================================
+
+def add_missing_columns(conn):
+    inspector = inspect(conn)
+    added = []
+    for table in Base.metadata.sorted_tables:
+        existing = {c["name"] for c in inspector.get_columns(table.name)}
+        for col in table.columns:
+            if col.name in existing:
+                continue
+            col_type = col.type.compile(dialect=conn.dialect)
+            conn.exec_driver_sql(f"ALTER TABLE {table.name} ADD COLUMN {col.name} {col_type}")
+            added.append(f"{table.name}.{col.name}")
+    return added
+
+
+def remove_duplicates(conn, table, columns):
+    """Delete rows sharing the same natural key, keeping the highest id."""
+    cols = [table.c[c] for c in columns]
+    not_null = and_(*[c.isnot(None) for c in cols])
+    keep = select(func.max(table.c.id)).where(not_null).group_by(*cols)
+    result = conn.execute(delete(table).where(not_null, table.c.id.notin_(keep)))
+    return result.rowcount or 0
+
+
+def create_missing_indexes(conn):
+    inspector = inspect(conn)
+    created = []
+    for table in Base.metadata.sorted_tables:
+        existing = {i["name"] for i in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name in existing:
+                continue
+            if index.unique:
+                removed = remove_duplicates(conn, table, [c.name for c in index.columns])
+                if removed:
+                    print(f"   removed {removed} duplicate rows from {table.name}")
+            index.create(bind=conn)
+            created.append(index.name)
+    return created
+
+
+def backfill_ep_predictions(conn):
+    """
+    Fill the typed regression columns of rows loaded before they existed,
+    then drop the JSON copies (raw_json is kept with EP_STORE_RAW_JSON).
+    """
+    table = EvaluationPrediction.__table__
+    rows = conn.execute(
+        select(table.c.id, table.c.predictions_json, table.c.raw_json).where(
+            table.c.revenue_sales_achievement.is_(None),
+            or_(table.c.predictions_json.isnot(None), table.c.raw_json.isnot(None)),
+        )
+    ).all()
+
+    updates = []
+    for row_id, predictions, raw in rows:
+        predictions = predictions or (raw or {}).get("predictions") or {}
+        values = {f: predictions.get(f) for f in REGRESSION_FIELDS}
+        values.update(_id=row_id, predictions_json=None)
+        if not settings.EP_STORE_RAW_JSON:
+            values["raw_json"] = None
+        updates.append(values)
+
+    if updates:
+        columns = {f: bindparam(f) for f in updates[0] if f != "_id"}
+        conn.execute(update(table).where(table.c.id == bindparam("_id")).values(columns), updates)
+    return len(updates)
+
+
+def backfill_fi_views(conn):
+    """Rank and pivot for feature importance rows loaded before they were stored."""
+    features = FeatureImportance.__table__
+    metas = FeatureImportanceMeta.__table__
+    missing_rank = conn.execute(select(features.c.id).where(features.c.rank.is_(None)).limit(1)).first()
+    missing_pivot = conn.execute(select(metas.c.phase).where(metas.c.pivot.is_(None))).scalars().all()
+    if not missing_rank and not missing_pivot:
+        return 0
+
+    groups = {}
+    for row in conn.execute(select(features).order_by(features.c.id)).mappings():
+        groups.setdefault(row["phase"], {}).setdefault(row["quarter"], []).append(dict(row))
+
+    ranked = []
+    for by_quarter in groups.values():
+        for rows in by_quarter.values():
+            ranks = rank_features(rows)
+            ranked += [{"_id": r["id"], "rank": ranks[r["feature"]]} for r in rows]
+    if missing_rank and ranked:
+        conn.execute(update(features).where(features.c.id == bindparam("_id")).values(rank=bindparam("rank")), ranked)
+
+    for phase in missing_pivot:
+        by_quarter = dict(groups.get(phase, {}))
+        pivot = build_pivot(by_quarter.pop(OVERALL, []), by_quarter)
+        conn.execute(update(metas).where(metas.c.phase == phase).values(pivot=pivot))
+    return len(ranked) if missing_rank else len(missing_pivot)
+
+
+def run_migrations():
+    with engine.begin() as conn:
+        Base.metadata.create_all(bind=conn)
+        for name in add_missing_columns(conn):
+            print(f"   + column {name}")
+        for name in create_missing_indexes(conn):
+            print(f"   + index {name}")
+        count = backfill_ep_predictions(conn)
+        if count:
+            print(f"   + typed regression columns for {count} ep_predictions rows")
+        if backfill_fi_views(conn):
+            print("   + feature importance rank / pivot")
+
+    with Session(engine) as db:
+        if db.query(AEDirectory).first() is None:
+            count = rebuild_ae_directory(db)
+            db.commit()
+            print(f"   + AE search directory ({count} AEs)")
+
+        count = refresh_orientasi_summary(db)
+        db.commit()
+        if count:
+            print(f"   + orientasi summary ({count} rows)")
+
+
+if __name__ == "__main__":
+    print("📌 Migrating database schema")
+    run_migrations()
+    print("✓ Schema up to date.")
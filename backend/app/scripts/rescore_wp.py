@@ -0,0 +1,70 @@
+import argparse
+import time
+from app.core.config import settings
+from app.core.db import SessionLocal
+from app.scripts.bulk_loader import BulkLoader
+from app.services.version_service import WP, bump_dataset_version
+from app.services.wp_scoring import load_model, project_columns, project_quarters, rescore_quarter, score_columns
+from app.utils.quarter import quarter_sort_key
+
+# ============================================================
+# Re-score wp_predictions from the project table with a stored
+# model artifact, one NumPy batch per quarter, written through
+# the BulkLoader upsert (only changed rows are sent).
+# Usage: python -m app.scripts.rescore_wp --model models/wp.json [--quarter "Q1 2025"] [--dry-run]
+# ============================================================
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Re-score win probability predictions in-process.")
+    parser.add_argument("--model", default=settings.WP_MODEL_PATH,
+                        help="model artifact (default WP_MODEL_PATH)")
+    parser.add_argument("--quarter", action="append",
+                        help="quarter to score, repeatable (default: every quarter in the project table)")
+    parser.add_argument("--batch-size", type=int, default=settings.LOAD_BATCH_SIZE,
+                        help="rows per upsert batch")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="score and time only, write nothing")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    model = load_model(args.model)
+    print(f"📌 Model {model.name} from {args.model} ({len(model.features)} features)")
+
+    db = SessionLocal()
+    try:
+        quarters = args.quarter or sorted(project_quarters(db), key=quarter_sort_key)
+        loader = BulkLoader(db, batch_size=args.batch_size, use_copy=False, mode="upsert")
+        total = 0
+        start = time.perf_counter()
+
+        for quarter in quarters:
+            t0 = time.perf_counter()
+            if args.dry_run:
+                count = len(score_columns(model, project_columns(db, quarter)))
+            else:
+                count = rescore_quarter(db, model, quarter, loader)
+            total += count
+            print(f"   {quarter:<10} {count:7d} projects  {(time.perf_counter() - t0) * 1000:8.1f} ms")
+
+        if args.dry_run:
+            db.rollback()
+        else:
+            stats = loader.stats.get("wp_predictions", {})
+            if stats.get("inserted") or stats.get("updated"):
+                bump_dataset_version(db, WP)
+            db.commit()
+            loader.report()
+
+        elapsed = time.perf_counter() - start
+        print(f"\n🎉 {total} projects scored in {elapsed:.2f}s ({total / elapsed if elapsed else 0:,.0f} rows/s)"
+              + (" — dry run, nothing written" if args.dry_run else ""))
+
+    except Exception as e:
+        db.rollback()
+        print("❌ ERROR:", e)
+
+    finally:
+        db.close()
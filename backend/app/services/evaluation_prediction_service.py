@@ -1,62 +1,82 @@
+from sqlalchemy import and_, select
 from sqlalchemy.orm import Session
-from app.models.ep import EvaluationPrediction, EvaluationPredictionMeta
+from app.models.ep import PAYLOAD_COLUMNS, EvaluationPrediction, EvaluationPredictionMeta, prediction_payload
+from app.services.meta_cache import ep_meta_dict, get_ep_meta
+from app.services.prediction_snapshot import get_snapshot
 
 # Helper: Build consistent API response structure
-def build_ep_response(meta: EvaluationPredictionMeta, predictions):
+def build_ep_response(meta: dict, predictions):
     return {
-        "meta": {
-            "quarter": meta.prediction_quarter,
-            "year": meta.prediction_year,
-            "generated_date": meta.generated_date,
-            "best_regressor": meta.best_regressor,
-            "best_classifier": meta.best_classifier,
-            "metrics": meta.model_metrics,
-        },
-        "data": [
-            p.raw_json or {
-                "nik": p.nik,
-                "name": p.name,
-                "predicted_kuadran": p.predicted_kuadran,
-                "prediction_confidence": p.prediction_confidence,
-                "predictions": p.predictions_json,
-            }
-            for p in predictions
-        ],
+        "meta": meta,
+        "data": [p.to_dict() for p in predictions],
     }
 
 
-# Get metadata for the period
+# Get metadata for the period (cached, see meta_cache)
 def get_meta_for_period(db: Session, quarter: str, year: int):
-    return (
-        db.query(EvaluationPredictionMeta)
-        .filter(
-            EvaluationPredictionMeta.prediction_quarter == quarter,
-            EvaluationPredictionMeta.prediction_year == year,
-        )
-        .first()
+    return get_ep_meta(db, quarter, year)
+
+
+def payload_columns():
+    return [EvaluationPrediction.__table__.c[n] for n in PAYLOAD_COLUMNS]
+
+
+def period_filter(quarter: str, year: int):
+    return and_(
+        EvaluationPrediction.prediction_quarter == quarter,
+        EvaluationPrediction.prediction_year == year,
     )
 
 
-# Get prediction for a single AE
-def get_prediction_for_nik(db: Session, nik: str, quarter: str, year: int):
+# Prediction + meta of one AE in one round trip (uses uq_ep_predictions_nik_quarter_year)
+def detail_query(nik: int, quarter: str, year: int):
     return (
-        db.query(EvaluationPrediction)
-        .filter(
-            EvaluationPrediction.nik == nik,
-            EvaluationPrediction.prediction_quarter == quarter,
-            EvaluationPrediction.prediction_year == year,
-        )
-        .first()
+        select(EvaluationPredictionMeta, *payload_columns())
+        .join(EvaluationPrediction, and_(
+            EvaluationPrediction.prediction_quarter == EvaluationPredictionMeta.prediction_quarter,
+            EvaluationPrediction.prediction_year == EvaluationPredictionMeta.prediction_year,
+        ))
+        .where(EvaluationPrediction.nik == nik, period_filter(quarter, year))
     )
 
 
+# Predictions of many AEs for one period (one IN query)
+def bulk_query(niks: list[int], quarter: str, year: int):
+    return select(*payload_columns()).where(EvaluationPrediction.nik.in_(niks), period_filter(quarter, year))
+
+
+# Get prediction for a single AE
+def get_prediction_for_nik(db: Session, nik: int, quarter: str, year: int):
+    return db.execute(
+        select(EvaluationPrediction).where(EvaluationPrediction.nik == nik, period_filter(quarter, year))
+    ).scalar()
+
+
 # High-level function for detail page (1 AE)
-def get_prediction_detail(db: Session, nik: str, quarter: str, year: int):
-    pred = get_prediction_for_nik(db, nik, quarter, year)
-    meta = get_meta_for_period(db, quarter, year)
+def get_prediction_detail(db: Session, nik: int, quarter: str, year: int):
+    snapshot = get_snapshot()
+    if snapshot is not None:
+        return snapshot.ep_detail(nik, quarter, year)
+
+    row = db.execute(detail_query(nik, quarter, year)).first()
+    if not row:
+        return None
 
-    if not pred or not meta:
+    return {"meta": ep_meta_dict(row[0]), "data": [prediction_payload(row._mapping)]}
+
+
+# Evaluasi table: many AEs at once, {nik: prediction or None}
+def get_predictions_for_niks(db: Session, niks: list[int], quarter: str, year: int):
+    snapshot = get_snapshot()
+    if snapshot is not None:
+        return snapshot.ep_many(niks, quarter, year)
+
+    meta = get_meta_for_period(db, quarter, year)
+    if not meta:
         return None
 
-    # Build response using the same helper so format is consistent
-    return build_ep_response(meta, [pred])
+    data = {str(nik): None for nik in niks}
+    if niks:
+        for row in db.execute(bulk_query(niks, quarter, year)):
+            data[str(row.nik)] = prediction_payload(row._mapping)
+    return {"meta": meta, "data": data}
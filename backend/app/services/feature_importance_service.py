@@ -1,51 +1,111 @@
-from app.models.fi import FIMeta, FIFeature
-from app.utils.json_loader import load_json_file
-
-def load_fi_into_db(db, json_filename="fi_results_v17_normalized.json"):
-    data = load_json_file(json_filename)
-    inserted = 0
-
-    for phase_key, content in data.items():
-
-        # ------- META -------
-        meta = FIMeta(
-            phase=phase_key,
-            phase_config=content.get("phase_config"),
-            best_regressor=content.get("best_regressor"),
-            metrics_overall=content.get("metrics_overall"),
-            metrics_by_quarter=content.get("metrics_by_quarter"),
-            raw=content
-        )
-        db.add(meta)
-
-        # ------- FEATURE OVERALL -------
-        for idx, f in enumerate(content.get("features_overall", []), start=1):
-            db.add(FIFeature(
-                phase=phase_key,
-                quarter="GLOBAL",
-                feature_name=f["feature"],
-                importance=f["importance"],
-                description=f.get("description"),
-                importance_type="overall",
-                rank=idx,
-                raw=f
-            ))
-            inserted += 1
-
-        # ------- FEATURE BY QUARTER -------
-        for q, feats in content.get("features_by_quarter", {}).items():
-            for idx, f in enumerate(feats, start=1):
-                db.add(FIFeature(
-                    phase=phase_key,
-                    quarter=q,
-                    feature_name=f["feature"],
-                    importance=f["importance"],
-                    description=f.get("description"),
-                    importance_type="quarter",
-                    rank=idx,
-                    raw=f
-                ))
-                inserted += 1
-
-    db.commit()
-    return inserted
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.models.fi import FeatureImportance, FeatureImportanceMeta
+from app.services.meta_cache import get_fi_meta, get_fi_metas
+from app.utils.quarter import quarter_sort_key
+
+# ============================================================
+# Feature importance views. Rank and the cross-quarter pivot are
+# computed once by the loader (load_all_json / migrate backfill),
+# so the endpoints only read rank-ordered rows.
+# ============================================================
+
+OVERALL = "ALL"  # quarter label of features_overall
+
+FEATURE_FIELDS = ("phase", "quarter", "feature", "importance", "rank", "description")
+
+
+# ------------------------------------------------
+# Precomputation (load time)
+# ------------------------------------------------
+
+def rank_features(features):
+    """{feature: rank}, 1 = highest importance; ties by feature name, missing importance last."""
+    ordered = sorted(
+        features,
+        key=lambda f: (f.get("importance") is None, -(f.get("importance") or 0.0), f.get("feature") or ""),
+    )
+    return {f["feature"]: i for i, f in enumerate(ordered, start=1)}
+
+
+def build_pivot(overall, by_quarter: dict):
+    """
+    Feature x quarter matrix of one phase:
+    {"quarters": [...], "features": [{feature, description, overall, overall_rank,
+                                      importance: [per quarter], rank: [per quarter]}]}
+    Rows follow the overall rank; quarters are chronological.
+    """
+    quarters = sorted(by_quarter, key=quarter_sort_key)
+    overall_rank = rank_features(overall)
+    overall_value = {f["feature"]: f.get("importance") for f in overall}
+    values = {q: {f["feature"]: f.get("importance") for f in feats} for q, feats in by_quarter.items()}
+    ranks = {q: rank_features(feats) for q, feats in by_quarter.items()}
+
+    descriptions = {}
+    for f in [*overall, *(f for q in quarters for f in by_quarter[q])]:
+        if f.get("description") or f["feature"] not in descriptions:
+            descriptions[f["feature"]] = f.get("description")
+
+    names = sorted(descriptions, key=lambda n: (overall_rank.get(n, len(overall_rank) + 1), n))
+    return {
+        "quarters": quarters,
+        "features": [
+            {
+                "feature": name,
+                "description": descriptions[name],
+                "overall": overall_value.get(name),
+                "overall_rank": overall_rank.get(name),
+                "importance": [values[q].get(name) for q in quarters],
+                "rank": [ranks[q].get(name) for q in quarters],
+            }
+            for name in names
+        ],
+    }
+
+
+# ------------------------------------------------
+# Reads
+# ------------------------------------------------
+
+def feature_query(phases: list[str], quarter: str, top_k: int | None = None):
+    """Rank-ordered features (ix_fi_features_phase_quarter_rank)."""
+    columns = [FeatureImportance.__table__.c[n] for n in FEATURE_FIELDS]
+    stmt = select(*columns).where(FeatureImportance.phase.in_(phases), FeatureImportance.quarter == quarter)
+    if top_k:
+        stmt = stmt.where(FeatureImportance.rank <= top_k)
+    return stmt.order_by(FeatureImportance.phase, FeatureImportance.rank, FeatureImportance.id)
+
+
+def _features_by_phase(db: Session, phases: list[str], quarter: str, top_k: int | None):
+    features = {phase: [] for phase in phases}
+    for row in db.execute(feature_query(phases, quarter, top_k)):
+        features[row.phase].append(dict(row._mapping))
+    return features
+
+
+def get_features(db: Session, phase: str, quarter: str = OVERALL, top_k: int | None = None):
+    meta = get_fi_meta(db, phase)
+    if not meta:
+        return None
+    return {"meta": meta, "features": _features_by_phase(db, [phase], quarter, top_k)[phase]}
+
+
+def get_all_phases(db: Session, quarter: str = OVERALL, top_k: int | None = None):
+    """Every phase in one payload: {"phases": {phase: {meta, features}}} (one features query)."""
+    metas = get_fi_metas(db)
+    features = _features_by_phase(db, list(metas), quarter, top_k) if metas else {}
+    return {
+        "phases": {
+            phase: {"meta": meta, "features": features[phase]}
+            for phase, meta in metas.items()
+        }
+    }
+
+
+def get_pivot(db: Session, phase: str):
+    pivot = db.execute(
+        select(FeatureImportanceMeta.pivot).where(FeatureImportanceMeta.phase == phase)
+    ).scalar()
+    if pivot is None:
+        return None
+    return {"phase": phase, **pivot}
@@ -0,0 +1,122 @@
+from functools import partial
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.core.concurrency import run_in_sessions
+from app.models.ep import EvaluationPrediction, prediction_payload
+from app.models.evaluasi_kinerja import EvaluasiKinerja
+from app.models.kinerja import Kinerja
+from app.models.orientasi import Orientasi
+from app.models.pelaksanaan import Pelaksanaan
+from app.models.pengembangan import Pengembangan
+from app.models.project import Project
+from app.models.wp import WinProbPrediction
+from app.services.evaluation_prediction_service import payload_columns
+from app.services.meta_cache import get_ep_meta, get_wp_meta
+from app.utils.pagination import fetch_rows, output_columns
+from app.utils.quarter import parse_quarter
+
+# ============================================================
+# AE journey: every phase of one AE in a single payload.
+# Seven queries whatever the number of projects, run concurrently:
+# five sheet lookups, projects LEFT JOIN win probability, and the
+# evaluation predictions. Model metadata comes from meta_cache and is
+# returned once (wp_meta, ep_meta per period), not per row.
+# ============================================================
+
+PHASE_MODELS = {
+    "orientasi": Orientasi,
+    "pelaksanaan": Pelaksanaan,
+    "kinerja": Kinerja,
+    "evaluasi": EvaluasiKinerja,
+    "pengembangan": Pengembangan,
+}
+
+WP_FIELDS = [
+    "win_probability", "win_probability_pct", "predicted_class",
+    "top_positive_factors", "top_negative_factors",
+]
+
+
+def _phase_rows(db: Session, model, nik: int, quarter: str | None):
+    filters = [model.nik == nik]
+    if quarter:
+        filters.append(model.quarter == quarter)
+    return fetch_rows(db, model, filters)
+
+
+def _projects_with_wp(db: Session, nik: int, quarter: str | None):
+    """Projects of the AE, each with its win probability (None when not scored)."""
+    project_cols = output_columns(Project)
+    wp_cols = [WinProbPrediction.__table__.c[f] for f in WP_FIELDS]
+
+    stmt = (
+        select(*project_cols, WinProbPrediction.id.label("__wp_id"), *[c.label(f"__wp_{c.name}") for c in wp_cols])
+        .outerjoin(WinProbPrediction, (WinProbPrediction.lop_id == Project.lop_id)
+                   & (WinProbPrediction.quarter == Project.quarter))
+        .where(Project.nik == nik)
+        .order_by(Project.id)
+    )
+    if quarter:
+        stmt = stmt.where(Project.quarter == quarter)
+
+    names = [c.name for c in project_cols]
+    projects = []
+    for row in db.execute(stmt):
+        item = dict(zip(names, row[:len(names)]))
+        wp_id, wp_values = row[len(names)], row[len(names) + 1:]
+        item["win_probability"] = dict(zip(WP_FIELDS, wp_values)) if wp_id is not None else None
+        projects.append(item)
+    return projects
+
+
+def _evaluation_predictions(db: Session, nik: int, quarter: str | None):
+    """(flat list of predictions, {"Q4 2025": meta} once per period)."""
+    stmt = select(*payload_columns()).where(EvaluationPrediction.nik == nik)
+    if quarter:
+        parsed = parse_quarter(quarter)
+        if not parsed:
+            return [], {}
+        stmt = stmt.where(
+            EvaluationPrediction.prediction_quarter == parsed[0],
+            EvaluationPrediction.prediction_year == parsed[1],
+        )
+
+    predictions, metas = [], {}
+    for row in db.execute(stmt.order_by(EvaluationPrediction.id)):
+        period = f"{row.prediction_quarter} {row.prediction_year}"
+        if period not in metas:
+            metas[period] = get_ep_meta(db, row.prediction_quarter, row.prediction_year)
+        if metas[period]:
+            predictions.append(prediction_payload(row._mapping))
+    return predictions, {period: meta for period, meta in metas.items() if meta}
+
+
+def _identity(phases: dict):
+    # name / unit from the most recent row of any phase
+    for rows in phases.values():
+        for row in reversed(rows):
+            if row.get("name"):
+                return row["name"], row.get("unit")
+    return None, None
+
+
+def get_journey(db: Session, nik: int, quarter: str | None = None):
+    tasks = {key: partial(_phase_rows, model=model, nik=nik, quarter=quarter) for key, model in PHASE_MODELS.items()}
+    tasks["projects"] = partial(_projects_with_wp, nik=nik, quarter=quarter)
+    tasks["evaluation_predictions"] = partial(_evaluation_predictions, nik=nik, quarter=quarter)
+
+    results = run_in_sessions(tasks)
+    results["evaluation_predictions"], ep_meta = results["evaluation_predictions"]
+    if not any(results.values()):
+        return None
+
+    name, unit = _identity(results)
+    return {
+        "nik": nik,
+        "name": name,
+        "unit": unit,
+        "quarter": quarter,
+        **results,
+        "wp_meta": get_wp_meta(db) if results["projects"] else None,
+        "ep_meta": ep_meta or None,
+    }
@@ -0,0 +1,132 @@
+import threading
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.models.ep import EvaluationPredictionMeta
+from app.models.fi import FeatureImportanceMeta
+from app.models.wp import WinProbMeta
+from app.services import version_service
+
+_MISSING = object()
+
+
+class VersionedCache:
+    """
+    Process-wide key -> value cache for one dataset.
+    Entries are dropped as soon as the dataset version changes.
+    """
+
+    def __init__(self, dataset: str):
+        self.dataset = dataset
+        self.version = None
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def get(self, db: Session, key, load):
+        version = version_service.dataset_version(db, self.dataset)
+        with self.lock:
+            if version != self.version:
+                self.values = {}
+                self.version = version
+            value = self.values.get(key, _MISSING)
+        if value is _MISSING:
+            value = load(db)
+            with self.lock:
+                if self.version == version:
+                    self.values[key] = value
+        return value
+
+    def clear(self):
+        with self.lock:
+            self.values = {}
+            self.version = None
+
+
+_wp_meta = VersionedCache(version_service.WP)
+_ep_meta = VersionedCache(version_service.EP)
+_fi_meta = VersionedCache(version_service.FI)
+
+
+def clear_meta_caches():
+    for cache in (_wp_meta, _ep_meta, _fi_meta):
+        cache.clear()
+
+
+# ============================================================
+# Win probability: best model + its metrics (latest wp_meta row)
+# ============================================================
+
+def wp_meta_dict(meta: WinProbMeta):
+    best = meta.best_model_name
+    all_metrics = meta.metrics or {}
+
+    return {
+        "best_model": best,
+        "metrics": all_metrics.get(best, {}),
+    }
+
+
+def load_wp_meta(db: Session):
+    meta = db.execute(select(WinProbMeta).order_by(WinProbMeta.id.desc()).limit(1)).scalar()
+    return wp_meta_dict(meta) if meta else None
+
+
+def get_wp_meta(db: Session):
+    return _wp_meta.get(db, "latest", load_wp_meta)
+
+
+# ============================================================
+# Evaluation predictions: meta per (quarter, year)
+# ============================================================
+
+def ep_meta_dict(meta: EvaluationPredictionMeta):
+    return {
+        "quarter": meta.prediction_quarter,
+        "year": meta.prediction_year,
+        "generated_date": meta.generated_date,
+        "best_regressor": meta.best_regressor,
+        "best_classifier": meta.best_classifier,
+        "metrics": meta.model_metrics,
+    }
+
+
+def _load_ep_meta(quarter: str, year: int):
+    def load(db: Session):
+        meta = db.execute(
+            select(EvaluationPredictionMeta).where(
+                EvaluationPredictionMeta.prediction_quarter == quarter,
+                EvaluationPredictionMeta.prediction_year == year,
+            )
+        ).scalar()
+        return ep_meta_dict(meta) if meta else None
+    return load
+
+
+def get_ep_meta(db: Session, quarter: str, year: int):
+    return _ep_meta.get(db, (quarter, year), _load_ep_meta(quarter, year))
+
+
+# ============================================================
+# Feature importance: meta per phase
+# ============================================================
+
+def _load_fi_meta(phase: str):
+    def load(db: Session):
+        meta = db.execute(
+            select(FeatureImportanceMeta).where(FeatureImportanceMeta.phase == phase)
+        ).scalar()
+        return meta.to_dict() if meta else None
+    return load
+
+
+def get_fi_meta(db: Session, phase: str):
+    return _fi_meta.get(db, phase, _load_fi_meta(phase))
+
+
+def _load_fi_metas(db: Session):
+    metas = db.execute(select(FeatureImportanceMeta).order_by(FeatureImportanceMeta.id)).scalars()
+    return {meta.phase: meta.to_dict() for meta in metas}
+
+
+def get_fi_metas(db: Session):
+    """{phase: meta} for every phase, in load order."""
+    return _fi_meta.get(db, "*", _load_fi_metas)
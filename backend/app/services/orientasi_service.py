@@ -0,0 +1,39 @@
+from sqlalchemy import func, or_, update
+from sqlalchemy.orm import Session
+from app.models.orientasi import Orientasi
+
+# ============================================================
+# Orientasi summary: Basic Understanding & Twinning
+# Stored on the orientasi rows and recomputed in SQL after a load,
+# so the summary endpoints read them like any other column.
+# ============================================================
+
+BASIC_UNDERSTANDING_FIELDS = [
+    "solution", "account_profile", "account_plan",
+    "sales_funnel", "bidding_management", "project_management",
+]
+
+TWINNING_FIELDS = [
+    "customer_introduction", "visiting_customer",
+    "transfer_customer_knowledge", "transfer_customer_documentation",
+]
+
+
+def _mean(fields: list[str]):
+    # missing scores count as 0
+    total = sum(func.coalesce(getattr(Orientasi, f), 0) for f in fields)
+    return total / float(len(fields))
+
+
+def refresh_orientasi_summary(db: Session, only_missing: bool = True):
+    """
+    One set-based UPDATE over orientasi. With `only_missing` only rows
+    written by the last load (summary still NULL) are recomputed.
+    """
+    stmt = update(Orientasi).values(
+        basic_understanding=_mean(BASIC_UNDERSTANDING_FIELDS),
+        twinning=_mean(TWINNING_FIELDS),
+    )
+    if only_missing:
+        stmt = stmt.where(or_(Orientasi.basic_understanding.is_(None), Orientasi.twinning.is_(None)))
+    return db.execute(stmt.execution_options(synchronize_session=False)).rowcount
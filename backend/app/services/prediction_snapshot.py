@@ -0,0 +1,280 @@
+import bisect
+import math
+import sys
+import threading
+import time
+from array import array
+from sqlalchemy import Float, Integer, select
+from starlette.responses import StreamingResponse
+from app.core.config import settings
+from app.core.db import ReadSessionLocal
+from app.models.ep import PAYLOAD_COLUMNS, EvaluationPrediction, EvaluationPredictionMeta, prediction_payload
+from app.models.wp import WinProbPrediction
+from app.services import version_service
+from app.services.meta_cache import ep_meta_dict, load_wp_meta
+from app.utils.pagination import NDJSON_MEDIA_TYPE, STREAM_CHUNK_SIZE, Page, PageParams, output_columns
+from app.utils.serialization import dumps
+
+# ============================================================
+# In-memory snapshot of wp_predictions / ep_predictions
+# (PREDICTION_SNAPSHOT_ENABLED). Numeric columns live in typed
+# arrays, text columns in lists of interned strings, and lookups go
+# through position indexes (lop_id, nik, quarter). The snapshot is
+# built at startup, rebuilt in the background when the loaders bump
+# the wp/ep dataset version, and swapped in with one assignment.
+# Until the rebuild lands, requests go to the DB.
+# ============================================================
+
+_INT_NULL = -(2 ** 63)
+
+
+class ColumnarTable:
+    """Column-oriented copy of a query result, rows addressed by position."""
+
+    def __init__(self, columns):
+        self.names = [c.name for c in columns]
+        self.kinds = []
+        self.data = []
+        for col in columns:
+            if isinstance(col.type, Integer):
+                self.kinds.append("q")
+                self.data.append(array("q"))
+            elif isinstance(col.type, Float):
+                self.kinds.append("d")
+                self.data.append(array("d"))
+            else:
+                self.kinds.append(None)
+                self.data.append([])
+        self.position = {name: i for i, name in enumerate(self.names)}
+
+    def __len__(self):
+        return len(self.data[0]) if self.data else 0
+
+    def append(self, row):
+        for value, kind, column in zip(row, self.kinds, self.data):
+            if kind == "q":
+                column.append(_INT_NULL if value is None else value)
+            elif kind == "d":
+                column.append(math.nan if value is None else value)
+            else:
+                column.append(sys.intern(value) if isinstance(value, str) else value)
+
+    def value(self, name: str, i: int):
+        c = self.position[name]
+        v = self.data[c][i]
+        kind = self.kinds[c]
+        if kind == "q":
+            return None if v == _INT_NULL else v
+        if kind == "d":
+            return None if v != v else v
+        return v
+
+    def row(self, i: int, names=None):
+        return {name: self.value(name, i) for name in (names or self.names)}
+
+    def index(self, *names):
+        """{key: array of positions}; positions stay in load (id) order."""
+        index = {}
+        columns = [self.position[n] for n in names]
+        for i in range(len(self)):
+            key = tuple(self.value(self.names[c], i) for c in columns)
+            index.setdefault(key if len(key) > 1 else key[0], array("i")).append(i)
+        return index
+
+
+def _load_table(db, model, columns):
+    table = ColumnarTable(columns)
+    stmt = select(*columns).order_by(model.__table__.c.id).execution_options(yield_per=STREAM_CHUNK_SIZE)
+    for row in db.execute(stmt):
+        table.append(row)
+    return table
+
+
+class PredictionSnapshot:
+    def __init__(self, db):
+        self.versions = dict(version_service.refresh_dataset_versions(db))
+        self.built_at = time.time()
+
+        # ------------------ win probability ------------------
+        self.wp_columns = output_columns(WinProbPrediction)
+        self.wp_names = [c.name for c in self.wp_columns]
+        self.wp = _load_table(db, WinProbPrediction, [WinProbPrediction.__table__.c.id, *self.wp_columns])
+        self.wp_meta = load_wp_meta(db)
+        self.wp_ids = self.wp.data[self.wp.position["id"]]
+        self.wp_by_lop = self.wp.index("lop_id")
+        self.wp_by_nik = self.wp.index("nik")
+        self.wp_by_quarter = self.wp.index("quarter")
+
+        # ------------------ evaluation predictions ------------------
+        ep_columns = [EvaluationPrediction.__table__.c[n] for n in ("id", *PAYLOAD_COLUMNS)]
+        self.ep = _load_table(db, EvaluationPrediction, ep_columns)
+        self.ep_by_key = self.ep.index("nik", "prediction_quarter", "prediction_year")
+        self.ep_meta = {
+            (m.prediction_quarter, m.prediction_year): ep_meta_dict(m)
+            for m in db.execute(select(EvaluationPredictionMeta)).scalars()
+        }
+
+    # ------------------------------------------------
+    # Win probability
+    # ------------------------------------------------
+
+    def wp_positions(self, lop_id: str | None = None, nik: int | None = None, quarter: str | None = None):
+        if lop_id is not None:
+            positions = self.wp_by_lop.get(lop_id, ())
+        elif nik is not None:
+            positions = self.wp_by_nik.get(nik, ())
+        elif quarter is not None:
+            return self.wp_by_quarter.get(quarter, array("i"))
+        else:
+            return range(len(self.wp))
+
+        if quarter is not None:
+            quarters = self.wp.data[self.wp.position["quarter"]]
+            return [i for i in positions if quarters[i] == quarter]
+        return positions
+
+    def wp_rows(self, lop_id: str | None = None, nik: int | None = None, quarter: str | None = None):
+        return [self.wp.row(i, self.wp_names) for i in self.wp_positions(lop_id, nik, quarter)]
+
+    def _wp_selection(self, quarter: str | None, params: PageParams):
+        positions = self.wp_positions(quarter=quarter)
+        if params.cursor is not None:
+            start = bisect.bisect_right(positions, params.cursor, key=self.wp_ids.__getitem__)
+            positions = positions[start:]
+        return positions
+
+    def wp_page(self, quarter: str | None, params: PageParams):
+        """Same contract as pagination.fetch_page, served from memory."""
+        names = [c.name for c in output_columns(WinProbPrediction, params.fields)]
+        positions = self._wp_selection(quarter, params)
+        page = Page(rows=[])
+
+        if params.limit is not None and len(positions) > params.limit:
+            positions = positions[:params.limit]
+            page.next_cursor = self.wp_ids[positions[-1]]
+
+        page.rows = [self.wp.row(i, names) for i in positions]
+
+        if params.limit is not None:
+            page.total = len(self.wp_positions(quarter=quarter))
+            page.headers["X-Total-Count"] = str(page.total)
+            if page.next_cursor is not None:
+                page.headers["X-Next-Cursor"] = str(page.next_cursor)
+        return page
+
+    def wp_stream(self, quarter: str | None, params: PageParams):
+        names = [c.name for c in output_columns(WinProbPrediction, params.fields)]
+        positions = self._wp_selection(quarter, params)
+        if params.limit is not None:
+            positions = positions[:params.limit]
+
+        def lines():
+            for start in range(0, len(positions), STREAM_CHUNK_SIZE):
+                chunk = positions[start:start + STREAM_CHUNK_SIZE]
+                yield b"\n".join(dumps(self.wp.row(i, names)) for i in chunk) + b"\n"
+
+        return StreamingResponse(lines(), media_type=NDJSON_MEDIA_TYPE)
+
+    # ------------------------------------------------
+    # Evaluation predictions
+    # ------------------------------------------------
+
+    def ep_detail(self, nik: int, quarter: str, year: int):
+        """Same payload as evaluation_prediction_service.get_prediction_detail."""
+        meta = self.ep_meta.get((quarter, year))
+        positions = self.ep_by_key.get((nik, quarter, year))
+        if not meta or not positions:
+            return None
+
+        return {"meta": meta, "data": [prediction_payload(self.ep.row(positions[0]))]}
+
+    def ep_many(self, niks: list[int], quarter: str, year: int):
+        """Same payload as evaluation_prediction_service.get_predictions_for_niks."""
+        meta = self.ep_meta.get((quarter, year))
+        if not meta:
+            return None
+
+        data = {}
+        for nik in niks:
+            positions = self.ep_by_key.get((nik, quarter, year))
+            data[str(nik)] = prediction_payload(self.ep.row(positions[0])) if positions else None
+        return {"meta": meta, "data": data}
+
+
+# ============================================================
+# Lifecycle: build, atomic swap, background refresh
+# ============================================================
+
+_snapshot: PredictionSnapshot | None = None
+_build_lock = threading.Lock()
+_stop = threading.Event()
+_wake = threading.Event()
+_refresher: threading.Thread | None = None
+
+SNAPSHOT_DATASETS = (version_service.WP, version_service.EP)
+
+
+def get_snapshot():
+    """
+    The live snapshot, or None when the mode is off, it is not built yet, or it
+    lags the wp/ep dataset versions (callers query the DB). Checked against the
+    cached versions the response cache keys on, so a body built from an old
+    snapshot is never cached under a newer version. Never queries the database
+    itself (async handlers call it on the event loop): the versions are
+    refreshed by the response cache, the snapshot build and the refresher thread.
+    """
+    if not settings.PREDICTION_SNAPSHOT_ENABLED:
+        return None
+    snapshot = _snapshot
+    if snapshot is None:
+        return None
+    if _is_stale(snapshot, version_service.cached_dataset_versions()):
+        _wake.set()  # rebuild now instead of at the next interval
+        return None
+    return snapshot
+
+
+def load_snapshot():
+    """Build a new snapshot and swap it in; requests keep using the old one meanwhile."""
+    global _snapshot
+    with _build_lock:
+        start = time.perf_counter()
+        with ReadSessionLocal() as db:
+            snapshot = PredictionSnapshot(db)
+        _snapshot = snapshot
+        print(f"✓ Prediction snapshot loaded: {len(snapshot.wp)} wp / {len(snapshot.ep)} ep rows "
+              f"in {time.perf_counter() - start:.2f}s")
+        return snapshot
+
+
+def _is_stale(snapshot: PredictionSnapshot, versions: dict):
+    return any(versions.get(d, 0) != snapshot.versions.get(d, 0) for d in SNAPSHOT_DATASETS)
+
+
+def _refresh_loop():
+    while True:
+        _wake.wait(settings.DATASET_VERSION_CHECK_INTERVAL)
+        _wake.clear()
+        if _stop.is_set():
+            return
+        try:
+            with ReadSessionLocal() as db:
+                versions = version_service.refresh_dataset_versions(db)
+            if _snapshot is None or _is_stale(_snapshot, versions):
+                load_snapshot()
+        except Exception as e:
+            print("❌ Prediction snapshot refresh failed:", e)
+
+
+def start_snapshot_refresher():
+    global _refresher
+    if _refresher is not None and _refresher.is_alive():
+        return
+    _stop.clear()
+    _refresher = threading.Thread(target=_refresh_loop, name="prediction-snapshot", daemon=True)
+    _refresher.start()
+
+
+def stop_snapshot_refresher():
+    _stop.set()
+    _wake.set()
@@ -0,0 +1,315 @@
+import asyncio
+import bisect
+import threading
+import time
+import unicodedata
+from collections import defaultdict
+from functools import partial
+from sqlalchemy import String, case, cast, delete, func, insert, literal, or_, select, union_all
+from sqlalchemy.orm import Session
+from app.core.concurrency import run_in_sessions
+from app.core.config import settings
+from app.core.db import get_async_sessionmaker
+from app.models.ae_directory import AEDirectory
+from app.models.orientasi import Orientasi
+from app.models.pelaksanaan import Pelaksanaan
+from app.models.kinerja import Kinerja
+from app.models.evaluasi_kinerja import EvaluasiKinerja
+from app.models.pengembangan import Pengembangan
+from app.models.project import Project
+from app.utils.quarter import quarter_sort_key
+from app.utils.serialization import rows_to_dicts
+
+# response section -> model
+SECTION_MODELS = {
+    "orientasi": Orientasi,
+    "pelaksanaan": Pelaksanaan,
+    "kinerja": Kinerja,
+    "evaluasi": EvaluasiKinerja,
+    "pengembangan": Pengembangan,
+    "projects": Project,
+}
+
+# same default as pg_trgm.word_similarity_threshold
+SIMILARITY_THRESHOLD = 0.6
+
+
+def normalize_name(text: str | None):
+    """Lowercase, strip accents and collapse whitespace."""
+    text = unicodedata.normalize("NFKD", text or "")
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return " ".join(text.lower().split())
+
+
+def _quarters_list(value: str | None):
+    return [q for q in (value or "").split("|") if q]
+
+
+def _entry(row: AEDirectory, score: float):
+    return {
+        "nik": row.nik,
+        "name": row.name,
+        "unit": row.unit,
+        "quarters": _quarters_list(row.quarters),
+        "score": round(float(score), 4),
+    }
+
+
+# ============================================================
+# AE directory (rebuilt after each load)
+# ============================================================
+
+def rebuild_ae_directory(db: Session):
+    parts = [
+        select(m.nik, m.name, m.unit, m.quarter).where(m.nik.isnot(None))
+        for m in SECTION_MODELS.values()
+    ]
+
+    entries = {}
+    for nik, name, unit, quarter in db.execute(union_all(*parts)):
+        entry = entries.setdefault(nik, {"nik": nik, "name": None, "unit": None, "quarters": set(), "_key": None})
+        if quarter:
+            entry["quarters"].add(quarter)
+        # name/unit from the most recent quarter that has them
+        key = quarter_sort_key(quarter)
+        if name and (entry["_key"] is None or key >= entry["_key"]):
+            entry.update(name=name, unit=unit, _key=key)
+
+    rows = [
+        {
+            "nik": e["nik"],
+            "name": e["name"],
+            "name_search": normalize_name(e["name"]),
+            "unit": e["unit"],
+            "quarters": "|" + "|".join(sorted(e["quarters"], key=quarter_sort_key)) + "|",
+        }
+        for e in entries.values()
+    ]
+
+    db.execute(delete(AEDirectory))
+    if rows:
+        db.execute(insert(AEDirectory), rows)
+
+    invalidate_memory_index()
+    return len(rows)
+
+
+# ============================================================
+# PostgreSQL: pg_trgm ranked search
+# ============================================================
+
+def _search_trigram(db: Session, query: str, quarter: str | None, limit: int, nik_prefix: bool = False):
+    if query.isdigit() and nik_prefix:
+        cond = cast(AEDirectory.nik, String).startswith(query)
+        score = case((AEDirectory.nik == int(query), 2.0), else_=1.0)
+    elif query.isdigit():
+        cond = AEDirectory.nik == int(query)
+        score = literal(2.0)
+    else:
+        norm = normalize_name(query)
+        name = AEDirectory.name_search
+        # word_similarity / <% match the query against the best-matching part of
+        # the name, so "santso" still finds "budi santoso"
+        cond = or_(name.contains(norm, autoescape=True), literal(norm).op("<%")(name))
+        score = (
+            func.word_similarity(norm, name)
+            + case((name.startswith(norm, autoescape=True), 1.0), else_=0.0)
+            + case((name.contains(" " + norm, autoescape=True), 0.5), else_=0.0)
+        )
+
+    stmt = select(AEDirectory, score.label("score")).where(cond)
+    if quarter:
+        stmt = stmt.where(AEDirectory.quarters.contains(f"|{quarter}|", autoescape=True))
+    stmt = stmt.order_by(score.desc(), AEDirectory.name).limit(limit)
+
+    return [_entry(row, s) for row, s in db.execute(stmt)]
+
+
+# ============================================================
+# Fallback: in-process trigram / prefix index (SQLite, tests)
+# ============================================================
+
+def trigrams(text: str):
+    """pg_trgm style trigrams: each word padded with two leading and one trailing space."""
+    grams = set()
+    for word in text.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def _jaccard(a: set, b: set):
+    return len(a & b) / len(a | b) if a or b else 0.0
+
+
+class AEMemoryIndex:
+    def __init__(self, rows):
+        self.rows = rows
+        # trigram set per word of each name
+        self.word_grams = [[trigrams(w) for w in (r.name_search or "").split()] for r in rows]
+
+        self.by_trigram = defaultdict(set)
+        for i, words in enumerate(self.word_grams):
+            for grams in words:
+                for g in grams:
+                    self.by_trigram[g].add(i)
+
+        self.niks = sorted((str(r.nik), i) for i, r in enumerate(rows))
+        self.nik_keys = [n for n, _ in self.niks]
+        self.by_nik = {r.nik: i for i, r in enumerate(rows)}
+
+    def _nik_exact(self, query: str):
+        i = self.by_nik.get(int(query))
+        if i is not None:
+            yield i, 2.0
+
+    def _nik_prefix(self, query: str):
+        start = bisect.bisect_left(self.nik_keys, query)
+        end = bisect.bisect_left(self.nik_keys, query + "\uffff")
+        for nik, i in self.niks[start:end]:
+            yield i, 2.0 if nik == query else 1.0
+
+    def _name_match(self, query: str):
+        norm = normalize_name(query)
+        if not norm:
+            return
+        q_grams = trigrams(norm)
+        q_words = len(norm.split())
+        candidates = {i for g in q_grams for i in self.by_trigram.get(g, ())}
+
+        for i in candidates:
+            name = self.rows[i].name_search or ""
+            similarity = self._word_similarity(q_grams, q_words, self.word_grams[i])
+            contains = norm in name
+            if not contains and similarity < SIMILARITY_THRESHOLD:
+                continue
+            score = similarity
+            score += 1.0 if name.startswith(norm) else 0.0
+            score += 0.5 if f" {norm}" in name else 0.0
+            yield i, score
+
+    @staticmethod
+    def _word_similarity(q_grams: set, q_words: int, word_grams: list):
+        """Best similarity against any run of consecutive words (approximates pg_trgm word_similarity)."""
+        best = 0.0
+        width = min(q_words, len(word_grams)) or 1
+        for start in range(max(1, len(word_grams) - width + 1)):
+            window = set().union(*word_grams[start:start + width])
+            best = max(best, _jaccard(q_grams, window))
+        return best
+
+    def search(self, query: str, quarter: str | None, limit: int, nik_prefix: bool = False):
+        if query.isdigit():
+            matches = self._nik_prefix(query) if nik_prefix else self._nik_exact(query)
+        else:
+            matches = self._name_match(query)
+        marker = f"|{quarter}|" if quarter else None
+
+        scored = [
+            (score, i) for i, score in matches
+            if marker is None or marker in (self.rows[i].quarters or "")
+        ]
+        scored.sort(key=lambda x: (-x[0], self.rows[x[1]].name or ""))
+        return [_entry(self.rows[i], score) for score, i in scored[:limit]]
+
+
+_memory_index = None
+_memory_index_built_at = 0.0
+_memory_index_lock = threading.Lock()
+
+
+def invalidate_memory_index():
+    global _memory_index
+    _memory_index = None
+
+
+def get_memory_index(db: Session):
+    global _memory_index, _memory_index_built_at
+    index = _memory_index
+    expired = time.monotonic() - _memory_index_built_at > settings.SEARCH_INDEX_TTL
+    if index is not None and not expired:
+        return index
+
+    # built outside the lock: under AsyncSession.run_sync the query yields to the event loop
+    index = AEMemoryIndex(db.execute(select(AEDirectory)).scalars().all())
+    with _memory_index_lock:
+        _memory_index = index
+        _memory_index_built_at = time.monotonic()
+    return index
+
+
+# ============================================================
+# Public API
+# ============================================================
+
+def use_trigram_backend(db: Session):
+    backend = settings.SEARCH_BACKEND
+    if backend == "auto":
+        return db.get_bind().dialect.name == "postgresql"
+    return backend == "postgres"
+
+
+def search_directory(db: Session, query: str, quarter: str | None = None, limit: int = 20, nik_prefix: bool = False):
+    """
+    Ranked AE matches by name (prefix / fuzzy) or NIK. A NIK matches exactly;
+    with `nik_prefix` every NIK starting with the digits matches (exact first).
+    """
+    query = (query or "").strip()
+    if not query:
+        return []
+    if use_trigram_backend(db):
+        return _search_trigram(db, query, quarter, limit, nik_prefix)
+    return get_memory_index(db).search(query, quarter, limit, nik_prefix)
+
+
+def search_section(db: Session, model, niks: list[int] | None, quarter: str | None, limit: int):
+    """Rows of one sheet table for the matched AEs, ordered by AE rank."""
+    if niks is not None and not niks:
+        return []
+
+    stmt = select(model)
+    if niks is not None:
+        rank = case({nik: i for i, nik in enumerate(niks)}, value=model.nik)
+        stmt = stmt.where(model.nik.in_(niks)).order_by(rank, model.id)
+    else:
+        stmt = stmt.order_by(model.id)
+    if quarter:
+        stmt = stmt.where(model.quarter == quarter)
+
+    return rows_to_dicts(db.execute(stmt.limit(limit)).scalars())
+
+
+def global_search(db: Session, query: str | None, quarter: str | None, limit: int, nik_prefix: bool = False):
+    ae = search_directory(db, query, quarter, limit, nik_prefix) if query else []
+    niks = [a["nik"] for a in ae] if query else None
+
+    results = {"ae": ae}
+    if niks is not None and not niks:
+        results.update({key: [] for key in SECTION_MODELS})
+        return results
+
+    # the six sheet lookups are independent: run them concurrently
+    results.update(run_in_sessions({
+        key: partial(search_section, model=model, niks=niks, quarter=quarter, limit=limit)
+        for key, model in SECTION_MODELS.items()
+    }))
+    return results
+
+
+async def global_search_async(db, query: str | None, quarter: str | None, limit: int, nik_prefix: bool = False):
+    """global_search over AsyncSession: the section lookups run as concurrent coroutines."""
+    ae = await db.run_sync(search_directory, query, quarter, limit, nik_prefix) if query else []
+    niks = [a["nik"] for a in ae] if query else None
+
+    results = {"ae": ae}
+    if niks is not None and not niks:
+        results.update({key: [] for key in SECTION_MODELS})
+        return results
+
+    async def section(model):
+        async with get_async_sessionmaker()() as own:
+            return await own.run_sync(search_section, model, niks, quarter, limit)
+
+    rows = await asyncio.gather(*(section(model) for model in SECTION_MODELS.values()))
+    results.update(zip(SECTION_MODELS, rows))
+    return results
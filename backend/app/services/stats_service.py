@@ -0,0 +1,246 @@
+import math
+from collections import defaultdict
+from sqlalchemy import Float, Integer, and_, case, cast, func, literal, literal_column, or_, select, union_all
+from sqlalchemy.orm import Session
+from app.models.evaluasi_kinerja import EvaluasiKinerja
+from app.models.kinerja import Kinerja
+from app.models.pelaksanaan import Pelaksanaan
+
+# ============================================================
+# Per-quarter cohort statistics, computed in SQL:
+#   1. GROUP BY  -> count / avg / min / max / stddev per metric
+#                   (stddev_pop on PostgreSQL, else a centered second pass)
+#   2. window    -> row_number() per group, only the rows around
+#                   each requested percentile are returned
+#   3. GROUP BY  -> histogram bucket counts on shared edges
+# At most three (four without stddev_pop) queries, whatever the number of metrics.
+# ============================================================
+
+STATS_SHEETS = {
+    "kinerja": Kinerja,
+    "evaluasi": EvaluasiKinerja,
+    "pelaksanaan": Pelaksanaan,
+}
+
+GROUP_COLUMNS = ["unit", "kuadran"]
+
+# numeric columns that are identifiers / categories, not metrics
+NON_METRIC_COLUMNS = {"id", "nik", "kuadran"}
+
+MAX_BINS = 50
+
+
+def metric_columns(model):
+    return {
+        c.name: c for c in model.__table__.columns
+        if isinstance(c.type, (Integer, Float)) and c.name not in NON_METRIC_COLUMNS
+    }
+
+
+def group_columns(model):
+    return [g for g in GROUP_COLUMNS if g in model.__table__.c]
+
+
+def _percentile_label(p: float):
+    return f"p{p:g}"
+
+
+# ------------------------------------------------
+# 1. Aggregates
+# ------------------------------------------------
+
+def _aggregates(db: Session, model, quarter: str, metrics: dict, group):
+    native_stddev = db.get_bind().dialect.name == "postgresql"
+    cols = [func.count().label("count")]
+    for col in metrics.values():
+        x = cast(col, Float)
+        cols += [func.count(col), func.avg(x), func.min(x), func.max(x)]
+        if native_stddev:
+            cols.append(func.stddev_pop(x))
+
+    per_metric = 5 if native_stddev else 4
+    groups = {}
+    for row in db.execute(_grouped(model, quarter, group, cols)):
+        key, total, values = row[0], row[1], row[2:]
+        if not total:
+            continue
+        stats = {}
+        for i, name in enumerate(metrics):
+            count, avg, lo, hi, *stddev = values[i * per_metric:(i + 1) * per_metric]
+            stddev = stddev[0] if stddev and count else None
+            stats[name] = {"count": count, "avg": avg, "min": lo, "max": hi, "stddev": stddev}
+        groups[key] = {"group": key, "count": total, "metrics": stats}
+
+    if groups and not native_stddev:
+        _centered_stddev(db, model, quarter, metrics, group, groups)
+    return groups
+
+
+def _grouped(model, quarter: str, group, cols):
+    if group is not None:
+        return select(group, *cols).where(model.quarter == quarter).group_by(group).order_by(group)
+    return select(literal("all"), *cols).where(model.quarter == quarter)
+
+
+def _centered_stddev(db: Session, model, quarter: str, metrics: dict, group, groups: dict):
+    """
+    Second pass where stddev_pop is not available: avg((x - mean)^2) against the
+    group means of the first query (avg(x*x) - avg^2 cancels out on revenue-scale values).
+    """
+    cols = []
+    for name, col in metrics.items():
+        means = [(key, g["metrics"][name]["avg"]) for key, g in groups.items() if g["metrics"][name]["avg"] is not None]
+        if group is None:
+            mean = literal(means[0][1] if means else None, Float)
+        elif means:
+            mean = case(*[(group.is_(None) if key is None else group == key, m) for key, m in means], else_=None)
+        else:
+            mean = literal(None, Float)
+        d = cast(col, Float) - mean
+        cols.append(func.avg(d * d))
+
+    for row in db.execute(_grouped(model, quarter, group, cols)):
+        if row[0] not in groups:
+            continue
+        for name, variance in zip(metrics, row[1:]):
+            stats = groups[row[0]]["metrics"][name]
+            stats["stddev"] = math.sqrt(max(variance, 0.0)) if variance is not None and stats["count"] else None
+
+
+# ------------------------------------------------
+# 2. Percentiles (window functions)
+# ------------------------------------------------
+
+def _percentiles(db: Session, model, quarter: str, metrics: dict, group, percentiles: list[float]):
+    # percentiles in basis points so positions stay integer arithmetic in SQL
+    points = [round(p * 100) for p in percentiles]
+    key = group if group is not None else literal("all")
+    partition = [group] if group is not None else None
+
+    parts = []
+    for name, col in metrics.items():
+        x = cast(col, Float)
+        ranked = (
+            select(
+                literal(name).label("metric"),
+                key.label("grp"),
+                x.label("value"),
+                func.row_number().over(partition_by=partition, order_by=x).label("rn"),
+                func.count().over(partition_by=partition).label("cnt"),
+            )
+            .where(model.quarter == quarter, col.isnot(None))
+            .subquery()
+        )
+        # linear interpolation needs the rows at floor(h) + 1 and floor(h) + 2
+        near = [
+            and_(ranked.c.rn >= 1 + (ranked.c.cnt - 1) * bp // 10000,
+                 ranked.c.rn <= 2 + (ranked.c.cnt - 1) * bp // 10000)
+            for bp in points
+        ]
+        parts.append(select(ranked).where(or_(*near)))
+
+    values = defaultdict(dict)
+    counts = {}
+    for metric, grp, value, rn, cnt in db.execute(union_all(*parts)):
+        values[(metric, grp)][rn] = value
+        counts[(metric, grp)] = cnt
+
+    result = defaultdict(dict)
+    for (metric, grp), by_rank in values.items():
+        n = counts[(metric, grp)]
+        out = {}
+        for p, bp in zip(percentiles, points):
+            lo = (n - 1) * bp // 10000
+            frac = (n - 1) * bp / 10000 - lo
+            v = by_rank[lo + 1]
+            if frac and lo + 2 in by_rank:
+                v += frac * (by_rank[lo + 2] - v)
+            out[_percentile_label(p)] = v
+        result[grp][metric] = out
+    return result
+
+
+# ------------------------------------------------
+# 3. Histograms
+# ------------------------------------------------
+
+def _histogram_edges(groups: dict, metrics: dict, bins: int):
+    edges = {}
+    for name in metrics:
+        lows = [g["metrics"][name]["min"] for g in groups.values() if g["metrics"][name]["min"] is not None]
+        highs = [g["metrics"][name]["max"] for g in groups.values() if g["metrics"][name]["max"] is not None]
+        if not lows:
+            continue
+        lo, hi = min(lows), max(highs)
+        width = (hi - lo) / bins
+        edges[name] = [lo + i * width for i in range(bins)] + [hi]
+    return edges
+
+
+def _histograms(db: Session, model, quarter: str, metrics: dict, group, edges: dict):
+    key = group if group is not None else literal("all")
+    grouping = [group] if group is not None else []
+
+    parts = []
+    for name, metric_edges in edges.items():
+        x = cast(metrics[name], Float)
+        # bucket index = number of inner edges <= value (last bucket is closed)
+        bucket = sum(case((x >= e, 1), else_=0) for e in metric_edges[1:-1]) if len(metric_edges) > 2 else literal(0)
+        parts.append(
+            select(literal(name).label("metric"), key.label("grp"), bucket.label("bucket"), func.count().label("n"))
+            .where(model.quarter == quarter, metrics[name].isnot(None))
+            # by output name: the bucket expression carries bound edge values
+            .group_by(*grouping, literal_column("bucket"))
+        )
+
+    result = defaultdict(dict)
+    if not parts:
+        return result
+    for metric, grp, bucket, n in db.execute(union_all(*parts)):
+        counts = result[grp].setdefault(metric, [0] * (len(edges[metric]) - 1))
+        counts[bucket] += n
+    return result
+
+
+# ============================================================
+# Public API
+# ============================================================
+
+def quarter_stats(
+    db: Session,
+    sheet: str,
+    quarter: str,
+    metrics: list[str] | None = None,
+    group_by: str | None = None,
+    percentiles: list[float] | None = None,
+    bins: int = 10,
+):
+    model = STATS_SHEETS[sheet]
+    available = metric_columns(model)
+    selected = {m: available[m] for m in (metrics or available)}
+    group = model.__table__.c[group_by] if group_by else None
+    percentiles = percentiles or []
+
+    groups = _aggregates(db, model, quarter, selected, group)
+    if not groups:
+        return None
+
+    if percentiles:
+        for grp, by_metric in _percentiles(db, model, quarter, selected, group, percentiles).items():
+            for name, values in by_metric.items():
+                groups[grp]["metrics"][name]["percentiles"] = values
+
+    edges = _histogram_edges(groups, selected, bins) if bins else {}
+    if edges:
+        for grp, by_metric in _histograms(db, model, quarter, selected, group, edges).items():
+            for name, counts in by_metric.items():
+                groups[grp]["metrics"][name]["histogram"] = counts
+
+    return {
+        "sheet": sheet,
+        "quarter": quarter,
+        "group_by": group_by,
+        "metrics": list(selected),
+        "histogram_edges": edges,
+        "groups": list(groups.values()),
+    }
@@ -0,0 +1,93 @@
+import threading
+import time
+from sqlalchemy import exc, select, update
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.db import ReadSessionLocal
+from app.models.dataset_version import DatasetVersion
+
+# datasets written by the loader scripts
+SHEETS = "sheets"
+WP = "wp"
+EP = "ep"
+FI = "fi"
+
+# ============================================================
+# Dataset versions
+# Loader scripts bump the version of what they wrote; API processes
+# re-read the (tiny) version table at most once per check interval
+# and drop their caches when a version moved.
+# ============================================================
+
+_versions: dict[str, int] = {}
+_updated_at: dict = {}
+_checked_at = 0.0
+_lock = threading.Lock()
+
+
+def bump_dataset_version(db: Session, *names: str):
+    """
+    Increment the version of each dataset (committed together with the load).
+    The increment runs in the database (version = version + 1), so concurrent
+    loaders never lose a bump.
+    """
+    global _checked_at
+    for name in names:
+        stmt = update(DatasetVersion).where(DatasetVersion.name == name).values(version=DatasetVersion.version + 1)
+        if db.execute(stmt).rowcount:
+            continue
+        try:
+            with db.begin_nested():
+                db.add(DatasetVersion(name=name, version=1))
+        except exc.IntegrityError:
+            db.execute(stmt)  # another loader created the row first
+    # same process: pick the new versions up on the next read
+    _checked_at = 0.0
+
+
+def _read_versions(db: Session):
+    return db.execute(select(DatasetVersion.name, DatasetVersion.version, DatasetVersion.updated_at)).all()
+
+
+def dataset_versions(db: Session | None = None):
+    """
+    {dataset: version}, refreshed from the database every DATASET_VERSION_CHECK_INTERVAL
+    seconds. Without `db` a short-lived session is opened when a refresh is due.
+    """
+    if time.monotonic() - _checked_at <= settings.DATASET_VERSION_CHECK_INTERVAL:
+        return _versions
+    if db is not None:
+        return refresh_dataset_versions(db)
+    with ReadSessionLocal() as own:
+        return refresh_dataset_versions(own)
+
+
+def refresh_dataset_versions(db: Session):
+    """Re-read the version table now and publish it as the cached versions."""
+    global _versions, _updated_at, _checked_at
+    # query outside the lock: under AsyncSession.run_sync it yields to the event loop
+    rows = _read_versions(db)
+    with _lock:
+        _versions = {name: version for name, version, _ in rows}
+        _updated_at = {name: updated for name, _, updated in rows}
+        _checked_at = time.monotonic()
+        return _versions
+
+
+def cached_dataset_versions():
+    """The versions as of the last check, without touching the database (safe on the event loop)."""
+    return _versions
+
+
+def read_dataset_versions(db: Session):
+    """Fresh {dataset: version} straight from the table (no interval cache)."""
+    return {name: version for name, version, _ in _read_versions(db)}
+
+
+def dataset_version(db: Session, name: str):
+    return dataset_versions(db).get(name, 0)
+
+
+def dataset_updated_at(name: str):
+    """When the dataset was last loaded (as of the last version check), or None."""
+    return _updated_at.get(name)
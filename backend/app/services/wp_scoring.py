@@ -0,0 +1,287 @@
+import json
+import os
+import pickle
+import threading
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.project import Project
+from app.models.wp import WinProbMeta, WinProbPrediction
+from app.scripts.bulk_loader import build_row
+from app.services.version_service import WP, bump_dataset_version
+
+# ============================================================
+# In-process win probability scoring.
+# A model artifact is loaded once (WP_MODEL_PATH) and scores a
+# whole quarter of projects as one NumPy feature matrix.
+#
+# Feature names (shared by every artifact type):
+#   "jumlah_aktivitas"       numeric project column (NULL -> fill value)
+#   "log1p:value_projects"   transformed numeric column
+#   "stage=F2"               one-hot of a categorical column
+# The part before "=" / after ":" is the source column reported
+# in top_positive_factors / top_negative_factors.
+# ============================================================
+
+# project columns copied to wp_predictions as they are
+PROJECT_COLUMNS = (
+    "quarter", "nik", "name", "unit", "lop_id", "project_name", "customer_name",
+    "stage", "status", "value_projects", "jumlah_aktivitas",
+)
+
+TRANSFORMS = {
+    "": lambda x: x,
+    "log1p": lambda x: np.log1p(np.clip(x, 0, None)),
+}
+
+WIN, LOSE = "WIN", "LOSE"
+
+
+def source_column(feature: str):
+    return feature.split("=", 1)[0].rpartition(":")[2]
+
+
+def feature_sources(features: list[str]):
+    """(sorted source columns, source index of every feature)."""
+    sources = sorted({source_column(f) for f in features})
+    return sources, np.array([sources.index(source_column(f)) for f in features], dtype=np.intp)
+
+
+def feature_matrix(columns: dict, features: list[str]):
+    """(n_rows, n_features) float matrix from {column: list of values}; NULLs stay NaN."""
+    n = len(next(iter(columns.values()))) if columns else 0
+    X = np.empty((n, len(features)), dtype=np.float64)
+    as_text = {}
+    for j, feature in enumerate(features):
+        if "=" in feature:
+            col, value = feature.split("=", 1)
+            if col not in as_text:
+                as_text[col] = np.array(["" if v is None else str(v) for v in columns[col]], dtype=object)
+            X[:, j] = as_text[col] == value
+        else:
+            transform, _, col = feature.rpartition(":")
+            if transform not in TRANSFORMS:
+                raise ValueError(f"Unknown feature transform '{transform}' in '{feature}'")
+            X[:, j] = TRANSFORMS[transform](np.array(columns[col], dtype=np.float64))
+    return X
+
+
+# ------------------------------------------------
+# Model artifacts
+# ------------------------------------------------
+
+class LinearWPModel:
+    """
+    Portable JSON artifact (logistic regression exported from the pipeline):
+    {"name", "features", "coef", "intercept", "mean"?, "scale"?, "threshold"?, "metrics"?}
+    """
+
+    def __init__(self, spec: dict):
+        self.name = spec.get("name", "logistic_regression")
+        self.features = list(spec["features"])
+        self.sources, self.source_index = feature_sources(self.features)
+        k = len(self.features)
+        self.coef = np.asarray(spec["coef"], dtype=np.float64).reshape(k)
+        self.intercept = float(spec.get("intercept", 0.0))
+        self.mean = np.asarray(spec.get("mean", np.zeros(k)), dtype=np.float64)
+        self.scale = np.asarray(spec.get("scale", np.ones(k)), dtype=np.float64)
+        self.scale = np.where(self.scale == 0, 1.0, self.scale)
+        self.threshold = float(spec.get("threshold", 0.5))
+        self.metrics = spec.get("metrics")
+        self.reference = self.mean
+
+    def _standardize(self, X):
+        X = np.where(np.isnan(X), self.mean, X)  # NULL -> training mean (z = 0)
+        return (X - self.mean) / self.scale
+
+    def predict_proba(self, X):
+        z = self._standardize(X) @ self.coef + self.intercept
+        return 1.0 / (1.0 + np.exp(-z))
+
+    def contributions(self, X, reference=None):
+        """(n_rows, n_sources) share of the logit (coef * z) against the training mean."""
+        one_hot = np.eye(len(self.sources))[self.source_index]  # feature -> its source column
+        return (self._standardize(X) * self.coef) @ one_hot
+
+
+class PickledWPModel:
+    """
+    Estimator with predict_proba (scikit-learn / xgboost), pickled either as
+    {"model": estimator, "features": [...], "name"?, "threshold"?, "mean"?, "metrics"?}
+    or bare with feature_names_in_. Only load artifacts produced by our own
+    pipeline.
+
+    A factor is how much the probability moves when one source column is
+    set back to a reference project: p(x) - p(x with the column at the
+    reference). It follows the direction the model actually takes, whatever
+    the estimator. The reference is the training mean when the artifact
+    ships one, else the mean of the scored quarter (see population_reference),
+    never the batch being scored, so factors don't depend on which other rows
+    share the call.
+    """
+
+    def __init__(self, obj):
+        if isinstance(obj, dict):
+            self.model = obj["model"]
+            self.features = list(obj["features"])
+            self.name = obj.get("name", type(self.model).__name__)
+            self.threshold = float(obj.get("threshold", 0.5))
+            self.metrics = obj.get("metrics")
+            mean = obj.get("mean")
+        else:
+            self.model = obj
+            self.features = list(obj.feature_names_in_)
+            self.name = type(self.model).__name__
+            self.threshold = 0.5
+            self.metrics = None
+            mean = None
+        self.sources, self.source_index = feature_sources(self.features)
+        self.reference = None if mean is None else np.asarray(mean, dtype=np.float64).reshape(len(self.features))
+
+    def predict_proba(self, X):
+        return self.model.predict_proba(np.nan_to_num(X))[:, 1]
+
+    def contributions(self, X, reference=None):
+        """(n_rows, n_sources) probability deltas, all perturbations in one predict_proba call."""
+        X = np.nan_to_num(X)
+        ref = self.reference if self.reference is not None else reference
+        if ref is None:
+            ref = X.mean(axis=0)
+        n, k = X.shape
+        g = len(self.sources)
+        perturbed = np.repeat(X[np.newaxis], g, axis=0)  # (source, row, feature)
+        for s in range(g):
+            cols = self.source_index == s
+            perturbed[s][:, cols] = ref[cols]
+        p = self.model.predict_proba(np.vstack([X, perturbed.reshape(g * n, k)]))[:, 1]
+        return (p[:n] - p[n:].reshape(g, n)).T
+
+
+def population_reference(model, columns: dict):
+    """
+    Mean model features over a population of projects, e.g. one quarter.
+    Factors are measured against it when the artifact has no training
+    mean; None when the model doesn't need one.
+    """
+    if model.reference is not None:
+        return None
+    return np.nan_to_num(feature_matrix(columns, model.features)).mean(axis=0)
+
+
+_models = {}
+_models_lock = threading.Lock()
+
+
+def load_model(path: str | None = None):
+    """Artifact at `path` (default WP_MODEL_PATH), cached until the file changes."""
+    path = path or settings.WP_MODEL_PATH
+    if not path:
+        raise RuntimeError("No win probability model configured (WP_MODEL_PATH)")
+    key = (os.path.abspath(path), os.path.getmtime(path))
+    with _models_lock:
+        model = _models.get(key)
+    if model is not None:
+        return model
+
+    if path.endswith(".json"):
+        with open(path, "r") as f:
+            model = LinearWPModel(json.load(f))
+    else:
+        with open(path, "rb") as f:
+            model = PickledWPModel(pickle.load(f))
+    model.key = key  # identifies the artifact version in downstream caches
+
+    with _models_lock:
+        _models.clear()
+        _models[key] = model
+    return model
+
+
+# ------------------------------------------------
+# Scoring
+# ------------------------------------------------
+
+def top_factors(model, X, reference=None):
+    """(top positive, top negative) source column per row; None when no factor pushes that way."""
+    per_source = model.contributions(X, reference)
+    names = np.array(model.sources, dtype=object)
+    hi, lo = per_source.argmax(axis=1), per_source.argmin(axis=1)
+    rows = np.arange(len(per_source))
+    positive = np.where(per_source[rows, hi] > 0, names[hi], None)
+    negative = np.where(per_source[rows, lo] < 0, names[lo], None)
+    return positive, negative
+
+
+def score_columns(model, columns: dict, reference=None):
+    """
+    {column: values} of projects -> list of wp_predictions rows (same order).
+    `reference`: population_reference for the factors, defaults to `columns`.
+    """
+    n = len(columns["lop_id"])
+    if n == 0:
+        return []
+    X = feature_matrix(columns, model.features)
+    proba = model.predict_proba(X)
+    predicted = np.where(proba >= model.threshold, WIN, LOSE)
+    positive, negative = top_factors(model, X, reference)
+
+    rows = []
+    for i in range(n):
+        row = {c: columns[c][i] for c in PROJECT_COLUMNS}
+        p = float(proba[i])
+        row.update(
+            win_probability=p,
+            win_probability_pct=p * 100,
+            predicted_class=str(predicted[i]),
+            top_positive_factors=positive[i],
+            top_negative_factors=negative[i],
+        )
+        rows.append(row)
+    return rows
+
+
+def project_columns(db: Session, quarter: str):
+    """Projects of one quarter as {column: list of values}."""
+    cols = [Project.__table__.c[c] for c in PROJECT_COLUMNS]
+    result = db.execute(select(*cols).where(Project.quarter == quarter).order_by(Project.id)).all()
+    values = list(zip(*result)) if result else [()] * len(cols)
+    return {c: list(v) for c, v in zip(PROJECT_COLUMNS, values)}
+
+
+def project_quarters(db: Session):
+    return list(db.execute(select(Project.quarter).where(Project.quarter.isnot(None)).distinct()).scalars())
+
+
+def refresh_model_meta(db: Session, model):
+    """
+    Make the latest wp_meta row name `model` as the best model (its artifact
+    metrics added, the other models' metrics kept). A row is added and WP
+    bumped only when that changes the meta; returns whether it did.
+    """
+    latest = db.execute(select(WinProbMeta).order_by(WinProbMeta.id.desc()).limit(1)).scalar()
+    metrics = dict(latest.metrics or {}) if latest else {}
+    if model.metrics is not None:
+        metrics[model.name] = model.metrics
+    row = build_row(WinProbMeta, {"best_model_name": model.name, "metrics": metrics})
+    if latest and latest.row_hash == row["row_hash"]:
+        return False
+    db.add(WinProbMeta(**row))
+    db.flush()  # the next quarter of the same run sees this row (no autoflush)
+    bump_dataset_version(db, WP)
+    return True
+
+
+def rescore_quarter(db: Session, model, quarter: str, loader):
+    """
+    Score every project of the quarter and hand the rows to a BulkLoader
+    (upsert on lop_id + quarter); the wp_meta row follows the model that
+    scored them. Factors of models without a training mean are relative to
+    this quarter's projects.
+    """
+    rows = score_columns(model, project_columns(db, quarter))
+    for row in rows:
+        loader.add(WinProbPrediction, row)
+    loader.flush()
+    refresh_model_meta(db, model)
+    return len(rows)
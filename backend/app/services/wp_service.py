@@ -1,62 +1,68 @@
 from sqlalchemy.orm import Session
-from app.models.wp import WinProbMeta, WinProbPrediction
-from app.utils.json_handler import load_json
-
-def load_wp_meta_and_store(db: Session):
-    meta = load_json("winprob_model_meta.json")
-
-    db_obj = WinProbMeta(
-        best_model_name=meta["best_model_name"],
-        metrics_json=meta["metrics"],
-        class_labels=meta["class_labels"],
-        n_rows_total=meta["n_rows_total"],
-        quarters=meta["quarters"]
-    )
-
-    db.add(db_obj)
-    db.commit()
-    return {"status": "meta_saved"}
-
-
-def load_wp_predictions_and_store(db: Session):
-    predictions = load_json("winprob_predictions_by_quarter.json")
-
-    for quarter, records in predictions.items():
-        for item in records:
-            db_obj = WinProbPrediction(
-                nik=item["nik"],
-                name=item["name"],
-                lop_id=item["lop_id"],
-                quarter=quarter,
-                win_probability=item["win_probability"],
-                win_probability_pct=item["win_probability_pct"],
-                predicted_class=item["predicted_class"],
-                top_positive_factors=item["top_positive_factors"],
-                top_negative_factors=item["top_negative_factors"],
-                raw_json=item,
-            )
-            db.add(db_obj)
-
-    db.commit()
-    return {"status": "predictions_saved"}
-
+from app.models.wp import WinProbPrediction
+from app.services.meta_cache import get_wp_meta
+from app.services.prediction_snapshot import get_snapshot
+from app.utils.pagination import fetch_rows
 
 def get_predictions_by_quarter(db: Session, quarter: str):
     return db.query(WinProbPrediction).filter(
         WinProbPrediction.quarter == quarter
     ).all()
 
-def get_best_model_metrics(db: Session):
-    meta = db.query(WinProbMeta).order_by(WinProbMeta.id.desc()).first()
-    if not meta:
-        return None
+def prediction_filters(lop_id: str | None = None, nik: int | None = None, quarter: str | None = None):
+    filters = []
+    if lop_id is not None:
+        filters.append(WinProbPrediction.lop_id == lop_id)
+    if nik is not None:
+        filters.append(WinProbPrediction.nik == nik)
+    if quarter is not None:
+        filters.append(WinProbPrediction.quarter == quarter)
+    return filters
+
+
+def project_batch_filters(lop_ids: list[str], quarter: str | None = None):
+    filters = [WinProbPrediction.lop_id.in_(lop_ids)]
+    if quarter:
+        filters.append(WinProbPrediction.quarter == quarter)
+    return filters
+
 
-    best = meta.best_model_name
-    all_metrics = meta.metrics or {}
+def find_predictions(db: Session, lop_id: str | None = None, nik: int | None = None, quarter: str | None = None):
+    """Prediction rows by project and/or AE and/or quarter (snapshot when enabled)."""
+    snapshot = get_snapshot()
+    if snapshot is not None:
+        return snapshot.wp_rows(lop_id, nik, quarter)
+    return fetch_rows(db, WinProbPrediction, prediction_filters(lop_id, nik, quarter))
 
-    best_metrics = all_metrics.get(best, {})
 
-    return {
-        "best_model": best,
-        "metrics": best_metrics
-    }
\ No newline at end of file
+def get_predictions_for_projects(db: Session, lop_ids: list[str], quarter: str | None = None):
+    """
+    One IN query on (lop_id, quarter) for many projects.
+    With a quarter: {lop_id: row or None}; without: {lop_id: [rows]}.
+    """
+    if not lop_ids:
+        return {}
+
+    snapshot = get_snapshot()
+    if snapshot is not None:
+        rows = [r for lop_id in lop_ids for r in snapshot.wp_rows(lop_id=lop_id, quarter=quarter)]
+    else:
+        rows = fetch_rows(db, WinProbPrediction, project_batch_filters(lop_ids, quarter))
+
+    if quarter:
+        result = {lop_id: None for lop_id in lop_ids}
+        for row in rows:
+            result[row["lop_id"]] = row
+        return result
+
+    result = {lop_id: [] for lop_id in lop_ids}
+    for row in rows:
+        result[row["lop_id"]].append(row)
+    return result
+
+def get_best_model_metrics(db: Session):
+    snapshot = get_snapshot()
+    if snapshot is not None:
+        return snapshot.wp_meta
+    # cached per process, refreshed when the loaders bump the "wp" version
+    return get_wp_meta(db)
@@ -0,0 +1,139 @@
+import threading
+from collections import OrderedDict
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.project import Project
+from app.services import version_service
+from app.services.wp_scoring import PROJECT_COLUMNS, population_reference, project_columns, score_columns
+from app.utils.quarter import quarter_sort_key
+
+# ============================================================
+# What-if simulation for one project. Every scenario overrides some
+# project features; the baseline and all uncached scenarios are
+# scored in a single vectorized model call. Results are kept per
+# scenario in an LRU keyed on model artifact + project data version.
+# Factors are measured against the project's quarter (as stored by
+# rescore_wp), never against the other scenarios of the request.
+# ============================================================
+
+SIMULATED_FIELDS = ("jumlah_aktivitas", "value_projects")
+
+RESULT_FIELDS = (
+    *SIMULATED_FIELDS, "win_probability", "win_probability_pct",
+    "predicted_class", "top_positive_factors", "top_negative_factors",
+)
+
+
+class ScenarioCache:
+    """Thread-safe LRU of scenario results."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get_many(self, keys):
+        with self.lock:
+            found = {}
+            for key in keys:
+                value = self.entries.get(key)
+                if value is not None:
+                    self.entries.move_to_end(key)
+                    found[key] = value
+            return found
+
+    def set_many(self, items: dict):
+        with self.lock:
+            self.entries.update(items)
+            for key in items:
+                self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+_cache = ScenarioCache(settings.WP_SIMULATION_CACHE_SIZE)
+_references = ScenarioCache(64)
+
+
+def clear_simulation_cache():
+    _cache.clear()
+    _references.clear()
+
+
+def quarter_reference(db: Session, model, quarter: str, data_version: int):
+    """population_reference of one quarter's projects, cached per model artifact + data version."""
+    if model.reference is not None:
+        return None
+    key = (model.key, data_version, quarter)
+    reference = _references.get_many([key]).get(key)
+    if reference is None:
+        reference = population_reference(model, project_columns(db, quarter))
+        _references.set_many({key: reference})
+    return reference
+
+
+def load_project(db: Session, model, lop_id: str, quarter: str | None = None):
+    """
+    (project row, sheets dataset version, factor reference); latest quarter
+    when none is given. None when unknown.
+    """
+    cols = [Project.__table__.c[c] for c in PROJECT_COLUMNS]
+    stmt = select(*cols).where(Project.lop_id == lop_id)
+    if quarter:
+        stmt = stmt.where(Project.quarter == quarter)
+    rows = [dict(r._mapping) for r in db.execute(stmt)]
+    if not rows:
+        return None
+    project = max(rows, key=lambda r: quarter_sort_key(r["quarter"]))
+    data_version = version_service.dataset_version(db, version_service.SHEETS)
+    return project, data_version, quarter_reference(db, model, project["quarter"], data_version)
+
+
+def simulate(model, project: dict, data_version: int, reference, scenarios: list[dict]):
+    """
+    Baseline + scenario probabilities for one project.
+    Each scenario: {field: value} for fields in SIMULATED_FIELDS (missing -> project value).
+    """
+    inputs = [
+        tuple(project[f] if s.get(f) is None else s[f] for f in SIMULATED_FIELDS)
+        for s in [{}, *scenarios]
+    ]
+    prefix = (model.key, data_version, project["lop_id"], project["quarter"])
+    keys = [prefix + values for values in inputs]
+
+    results = _cache.get_many(keys)
+    missing = list(dict.fromkeys(k for k in keys if k not in results))
+    if missing:
+        columns = {c: [project[c]] * len(missing) for c in PROJECT_COLUMNS}
+        for j, field in enumerate(SIMULATED_FIELDS):
+            columns[field] = [key[len(prefix) + j] for key in missing]
+        scored = {
+            key: {f: row[f] for f in RESULT_FIELDS}
+            for key, row in zip(missing, score_columns(model, columns, reference))
+        }
+        _cache.set_many(scored)
+        results.update(scored)
+
+    baseline = results[keys[0]]
+    base_p = baseline["win_probability"]
+    return {
+        "lop_id": project["lop_id"],
+        "quarter": project["quarter"],
+        "model": model.name,
+        "baseline": baseline,
+        "scenarios": [
+            {
+                **results[key],
+                "delta": results[key]["win_probability"] - base_p,
+                "delta_pct": results[key]["win_probability_pct"] - baseline["win_probability_pct"],
+            }
+            for key in keys[1:]
+        ],
+        "scored": len(missing),
+        "cached": len(set(keys)) - len(missing),
+    }
@@ -0,0 +1,173 @@
+import json
+from pathlib import Path
+
+_WHITESPACE = " \t\n\r"
+_NUMBER_CHARS = set("0123456789+-.eE")
+_decoder = json.JSONDecoder()
+
+
+class JsonStream:
+    """
+    Pull parser over a JSON text file.
+
+    Objects and arrays are walked lazily with `iter_object` / `iter_array`;
+    only the values passed to `read_value` are materialized, so memory is
+    bounded by the read chunk plus the largest single value read.
+    After each step of `iter_object` / `iter_array` the caller must consume
+    the current value (read_value, skip_value or another iter_*).
+    """
+
+    def __init__(self, fp, chunk_size: int = 64 * 1024):
+        self._fp = fp
+        self._chunk_size = chunk_size
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self, size: int | None = None):
+        data = self._fp.read(size or self._chunk_size)
+        if not data:
+            self._eof = True
+            return False
+        self._buf = self._buf[self._pos:] + data
+        self._pos = 0
+        return True
+
+    def _peek(self):
+        while True:
+            buf, pos = self._buf, self._pos
+            while pos < len(buf) and buf[pos] in _WHITESPACE:
+                pos += 1
+            self._pos = pos
+            if pos < len(buf):
+                return buf[pos]
+            if not self._fill():
+                raise ValueError("Unexpected end of JSON input")
+
+    def _expect(self, char: str):
+        found = self._peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r} but found {found!r}")
+        self._pos += 1
+
+    def _next_separator(self, closing: str):
+        """Consume ',' or the closing bracket; True when the container ended."""
+        char = self._peek()
+        self._pos += 1
+        if char == closing:
+            return True
+        if char != ",":
+            raise ValueError(f"Expected ',' or {closing!r} but found {char!r}")
+        return False
+
+    def read_value(self):
+        self._peek()
+        size = self._chunk_size
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill(size):
+                    raise
+                size *= 2  # large value: grow reads to avoid re-decoding too often
+                continue
+            # a number running up to the end of the buffer may continue in the next
+            # chunk ("0." + "85", "1e" + "5"): raw_decode stops at the last valid prefix
+            if isinstance(value, (int, float)) and not isinstance(value, bool) and self._number_at_end(end):
+                if self._fill():
+                    continue
+            self._pos = end
+            return value
+
+    def _number_at_end(self, end: int):
+        if self._eof:
+            return False
+        buf = self._buf
+        while end < len(buf) and buf[end] in _NUMBER_CHARS:
+            end += 1
+        return end == len(buf)
+
+    def skip_value(self):
+        self.read_value()
+
+    def iter_array(self):
+        self._expect("[")
+        if self._peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield
+            if self._next_separator("]"):
+                return
+
+    def iter_object(self):
+        self._expect("{")
+        if self._peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self.read_value()
+            self._expect(":")
+            yield key
+            if self._next_separator("}"):
+                return
+
+    def iter_values(self):
+        for _ in self.iter_array():
+            yield self.read_value()
+
+
+# ============================================================
+# Readers for the pipeline JSON layouts
+# ============================================================
+
+def _open(path: str):
+    file_path = Path(path)
+    if not file_path.exists():
+        raise FileNotFoundError(f"JSON file not found: {path}")
+    return open(file_path, "r")
+
+
+def iter_json_array(path: str, chunk_size: int = 64 * 1024):
+    """Items of a top-level array: [ {...}, {...} ]"""
+    with _open(path) as f:
+        yield from JsonStream(f, chunk_size).iter_values()
+
+
+def iter_keyed_arrays(path: str, chunk_size: int = 64 * 1024):
+    """(key, item) pairs of an object of arrays: { "Q1 2025": [ {...} ] }"""
+    with _open(path) as f:
+        stream = JsonStream(f, chunk_size)
+        for key in stream.iter_object():
+            for item in stream.iter_values():
+                yield key, item
+
+
+def iter_quarter_sheets(path: str, chunk_size: int = 64 * 1024):
+    """(quarter, sheet, row) triples of { "quarters": [ { "quarter": ..., "sheets": { name: [rows] } } ] }"""
+    with _open(path) as f:
+        stream = JsonStream(f, chunk_size)
+        for key in stream.iter_object():
+            if key != "quarters":
+                stream.skip_value()
+                continue
+
+            for _ in stream.iter_array():
+                quarter = None
+                pending = None  # "sheets" seen before "quarter": only that quarter is buffered
+
+                for qkey in stream.iter_object():
+                    if qkey == "quarter":
+                        quarter = stream.read_value()
+                    elif qkey == "sheets" and quarter is not None:
+                        for sheet in stream.iter_object():
+                            for row in stream.iter_values():
+                                yield quarter, sheet, row
+                    elif qkey == "sheets":
+                        pending = stream.read_value()
+                    else:
+                        stream.skip_value()
+
+                for sheet, rows in (pending or {}).items():
+                    for row in rows:
+                        yield quarter, sheet, row
@@ -0,0 +1,177 @@
+from dataclasses import dataclass, field
+from fastapi import Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from app.core.db import ReadSessionLocal
+from app.utils.serialization import ORJSONResponse, dumps, hidden_columns
+
+MAX_PAGE_SIZE = 5000
+
+PAGE_HEADERS = ["X-Total-Count", "X-Next-Cursor"]
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# rows fetched per server-side cursor round trip while streaming
+STREAM_CHUNK_SIZE = 1000
+
+
+class PageParams:
+    """
+    Query parameters shared by the list endpoints.
+
+    limit  : page size (omit for the whole result, as before)
+    cursor : keyset cursor, the X-Next-Cursor value of the previous page
+    fields : comma separated columns to return, e.g. fields=nik,name,quarter
+    stream : NDJSON streaming (same as sending Accept: application/x-ndjson)
+    """
+
+    def __init__(
+        self,
+        limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE),
+        cursor: int | None = Query(None, ge=0),
+        fields: str | None = Query(None),
+        stream: bool = Query(False),
+        accept: str | None = Header(None),
+    ):
+        self.limit = limit
+        self.cursor = cursor
+        self.fields = [f.strip() for f in fields.split(",") if f.strip()] if fields else None
+        self.stream = stream or NDJSON_MEDIA_TYPE in (accept or "")
+
+
+@dataclass
+class Page:
+    rows: list
+    total: int | None = None
+    next_cursor: int | None = None
+    headers: dict = field(default_factory=dict)
+
+
+def output_columns(model, fields: list[str] | None = None):
+    """Columns selected for the response (validated `fields` or every public column)."""
+    hidden = hidden_columns(model)
+    columns = {c.name: c for c in model.__table__.columns if c.name not in hidden}
+    if not fields:
+        return list(columns.values())
+
+    unknown = [f for f in fields if f not in columns]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown field(s): {', '.join(unknown)}. Available: {', '.join(columns)}"
+        )
+    return [columns[f] for f in fields]
+
+
+def page_statement(model, filters: list, params: PageParams, columns=None, lookahead: int = 0):
+    """
+    SELECT of the output columns (+ id as cursor) for one keyset page:
+    WHERE id > cursor ORDER BY id LIMIT limit + lookahead.
+    """
+    columns = columns or output_columns(model, params.fields)
+    pk = model.__table__.c.id
+
+    stmt = select(*columns, pk.label("__cursor")).where(*filters).order_by(pk)
+    if params.cursor is not None:
+        stmt = stmt.where(pk > params.cursor)
+    if params.limit is not None:
+        stmt = stmt.limit(params.limit + lookahead)
+    return stmt, [c.name for c in columns]
+
+
+def count_statement(model, filters: list):
+    return select(func.count()).select_from(model).where(*filters)
+
+
+def rows_statement(model, filters: list, fields: list[str] | None = None, limit: int | None = None):
+    """SELECT of the public (or requested) columns ordered by id, as run by fetch_rows."""
+    columns = output_columns(model, fields)
+    stmt = select(*columns).where(*filters).order_by(model.__table__.c.id)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return stmt, [c.name for c in columns]
+
+
+def fetch_page(db: Session, model, filters: list, params: PageParams, columns=None):
+    """
+    Keyset page over `model` ordered by id: WHERE id > cursor ORDER BY id LIMIT n.
+    Only the requested columns (or `columns`) are selected; rows come back as plain dicts.
+    """
+    # one extra row tells whether there is a next page
+    stmt, names = page_statement(model, filters, params, columns, lookahead=1)
+    result = db.execute(stmt).all()
+    page = Page(rows=[])
+
+    if params.limit is not None and len(result) > params.limit:
+        result = result[:params.limit]
+        page.next_cursor = result[-1][-1]
+
+    page.rows = [dict(zip(names, row)) for row in result]
+
+    if params.limit is not None:
+        page.total = db.execute(count_statement(model, filters)).scalar()
+        page.headers["X-Total-Count"] = str(page.total)
+        if page.next_cursor is not None:
+            page.headers["X-Next-Cursor"] = str(page.next_cursor)
+
+    return page
+
+
+def fetch_rows(db: Session, model, filters: list, fields: list[str] | None = None, limit: int | None = None):
+    """All matching rows as dicts (public or requested columns, ordered by id)."""
+    stmt, names = rows_statement(model, filters, fields, limit)
+    return [dict(zip(names, row)) for row in db.execute(stmt)]
+
+
+def _ndjson_lines(stmt, names, transform):
+    # own session: the request-scoped one may be closed before the body is sent
+    db = ReadSessionLocal()
+    try:
+        result = db.execute(stmt.execution_options(stream_results=True, yield_per=STREAM_CHUNK_SIZE))
+        for partition in result.partitions():
+            lines = []
+            for row in partition:
+                item = dict(zip(names, row))
+                if transform:
+                    item = transform(item)
+                lines.append(dumps(item))
+            yield b"\n".join(lines) + b"\n"
+    finally:
+        db.close()
+
+
+def stream_response(model, filters: list, params: PageParams, columns=None, transform=None):
+    """
+    NDJSON body (one row per line) read through a server-side cursor, so
+    memory stays flat and the first rows are sent immediately.
+    """
+    stmt, names = page_statement(model, filters, params, columns)
+    return StreamingResponse(_ndjson_lines(stmt, names, transform), media_type=NDJSON_MEDIA_TYPE)
+
+
+def paginated_response(db: Session, model, filters: list, params: PageParams):
+    if params.stream:
+        return stream_response(model, filters, params)
+    page = fetch_page(db, model, filters, params)
+    return ORJSONResponse(content=page.rows, headers=page.headers)
+
+
+# ============================================================
+# AsyncSession variants (DB_ASYNC_ENABLED): same statements, run
+# through AsyncSession.run_sync so the I/O goes over asyncpg.
+# ============================================================
+
+async def fetch_page_async(db, model, filters: list, params: PageParams, columns=None):
+    return await db.run_sync(fetch_page, model, filters, params, columns)
+
+
+async def fetch_rows_async(db, model, filters: list, fields: list[str] | None = None, limit: int | None = None):
+    return await db.run_sync(fetch_rows, model, filters, fields, limit)
+
+
+async def paginated_response_async(db, model, filters: list, params: PageParams):
+    if params.stream:
+        return stream_response(model, filters, params)
+    page = await fetch_page_async(db, model, filters, params)
+    return ORJSONResponse(content=page.rows, headers=page.headers)
@@ -0,0 +1,19 @@
+import re
+
+_QUARTER_RE = re.compile(r"^\s*Q([1-4])\s*[-_ ]?\s*(\d{4})\s*$", re.IGNORECASE)
+
+
+def parse_quarter(quarter: str):
+    """'Q1 2025' -> ('Q1', 2025); None when the label is not in that format."""
+    match = _QUARTER_RE.match(quarter or "")
+    if not match:
+        return None
+    return f"Q{match.group(1)}", int(match.group(2))
+
+
+def quarter_sort_key(quarter: str):
+    """Chronological sort key, unknown labels first."""
+    parsed = parse_quarter(quarter)
+    if not parsed:
+        return (0, 0)
+    return (parsed[1], int(parsed[0][1]))
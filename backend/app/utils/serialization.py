@@ -0,0 +1,43 @@
+import orjson
+from fastapi.responses import JSONResponse
+
+# loader bookkeeping, never part of an API row
+HIDDEN_COLUMNS = {"row_hash"}
+
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def dumps(content) -> bytes:
+    return orjson.dumps(content, option=_ORJSON_OPTIONS)
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson (default response class of the app)."""
+
+    def render(self, content) -> bytes:
+        return dumps(content)
+
+
+def hidden_columns(model_cls):
+    """HIDDEN_COLUMNS plus the model's own `api_hidden_columns`."""
+    return HIDDEN_COLUMNS.union(getattr(model_cls, "api_hidden_columns", ()))
+
+
+def public_columns(model_cls):
+    hidden = hidden_columns(model_cls)
+    return [c.name for c in model_cls.__table__.columns if c.name not in hidden]
+
+
+def row_to_dict(obj):
+    """ORM instance -> dict of its public columns (no reflection over instance state)."""
+    if obj is None:
+        return None
+    return {name: getattr(obj, name) for name in public_columns(type(obj))}
+
+
+def rows_to_dicts(objs):
+    objs = list(objs)
+    if not objs:
+        return []
+    names = public_columns(type(objs[0]))
+    return [{name: getattr(o, name) for name in names} for o in objs]
@@ -0,0 +1,54 @@
+import os
+import tempfile
+from pathlib import Path
+
+# Settings are read at import time: point every test at a throwaway SQLite
+# file before any app module is imported, never at the DATABASE_URL in .env.
+_DB_DIR = Path(tempfile.mkdtemp(prefix="kams-tests-"))
+os.environ["DATABASE_URL"] = f"sqlite:///{_DB_DIR / 'test.db'}"
+os.environ["DB_ASYNC_ENABLED"] = "false"
+os.environ["PREDICTION_SNAPSHOT_ENABLED"] = "false"
+os.environ["DB_MIGRATE_ON_STARTUP"] = "false"
+os.environ["STARTUP_WARMUP"] = "false"
+os.environ["WP_MODEL_PATH"] = ""
+
+import pytest  # noqa: E402
+
+
+def reset_caches():
+    from app.core.response_cache import clear_response_cache
+    from app.services import version_service
+    from app.services.meta_cache import clear_meta_caches
+    from app.services.search_service import invalidate_memory_index
+
+    version_service._versions = {}
+    version_service._updated_at = {}
+    version_service._checked_at = 0.0
+    clear_response_cache()
+    clear_meta_caches()
+    invalidate_memory_index()
+
+
+@pytest.fixture
+def db():
+    """Session on an empty schema; tables are recreated for every test."""
+    import app.scripts.migrate  # noqa: F401  registers every model
+    from app.core.db import Base, SessionLocal, engine
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    reset_caches()
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def client(db):
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
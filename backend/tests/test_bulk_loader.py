@@ -0,0 +1,196 @@
+import json
+import pytest
+from sqlalchemy import func, select
+from app.models.kinerja import Kinerja
+from app.models.project import Project
+from app.scripts import load_all_json
+from app.scripts.bulk_loader import BulkLoader, _copy_value, build_row, natural_key
+from app.services.version_service import SHEETS, read_dataset_versions
+
+
+def project(i: int, quarter: str = "Q1 2025", **changes):
+    return {
+        "nik": 40100000 + i % 3,
+        "name": f"AE {i % 3}",
+        "lop_id": f"LOP-{i}",
+        "project_name": f"Project {i}",
+        "customer_name": "PT Contoh",
+        "value_projects": 1_000_000.0 * (i + 1),
+        "stage": "F2",
+        "jumlah_aktivitas": i,
+        "status": "OPEN",
+        "periode": quarter,
+        "unit": "DGS",
+        **changes,
+    }
+
+
+def load(db, rows, mode="upsert", batch_size=4):
+    loader = BulkLoader(db, batch_size=batch_size, mode=mode)
+    for row in rows:
+        loader.add(Project, row, quarter=row["periode"], sheet="project")
+    loader.flush()
+    db.commit()
+    return loader.stats.get("project", {})
+
+
+def stored(db):
+    return {p.lop_id: p for p in db.execute(select(Project)).scalars()}
+
+
+# ------------------------------------------------
+# Row building
+# ------------------------------------------------
+
+def test_build_row_coerces_and_hashes():
+    row = build_row(Project, {"jumlah_aktivitas": "12.0", "value_projects": " 5e3 ", "stage": 2, "unknown": 1},
+                    quarter="Q1 2025")
+    assert row["jumlah_aktivitas"] == 12
+    assert row["value_projects"] == 5000.0
+    assert row["stage"] == 2  # text columns are kept as given
+    assert row["nik"] is None and "unknown" not in row and "id" not in row
+    assert build_row(Project, {"value_projects": float("nan"), "jumlah_aktivitas": ""})["value_projects"] is None
+
+    same = build_row(Project, {"jumlah_aktivitas": 12, "value_projects": 5000.0, "stage": 2}, quarter="Q1 2025")
+    assert row["row_hash"] == same["row_hash"]
+    assert build_row(Project, {"jumlah_aktivitas": 13}, quarter="Q1 2025")["row_hash"] != row["row_hash"]
+
+
+def test_natural_key():
+    assert natural_key(Project) == ("lop_id", "quarter")
+    assert natural_key(Kinerja) == ("nik", "quarter")
+
+
+def test_copy_value_escapes():
+    assert _copy_value(None) == "\\N"
+    assert _copy_value(True) == "t"
+    assert _copy_value("a\tb\nc\\d\r") == "a\\tb\\nc\\\\d\\r"
+    assert _copy_value({"k": [1]}) == '{"k": [1]}'
+    assert _copy_value(1.5) == "1.5"
+
+
+# ------------------------------------------------
+# Append (executemany) and upsert
+# ------------------------------------------------
+
+def test_append_mode_inserts_in_batches(db):
+    stats = load(db, [project(i) for i in range(10)], mode="append", batch_size=4)
+    assert stats["rows"] == 10
+    assert stats["batches"] == 3
+    assert len(stored(db)) == 10
+
+
+def test_reload_of_same_rows_updates_nothing(db):
+    rows = [project(i) for i in range(10)]
+    first = load(db, rows)
+    assert (first["inserted"], first["updated"], first["unchanged"]) == (10, 0, 0)
+    ids = {lop: p.id for lop, p in stored(db).items()}
+
+    second = load(db, rows)
+    assert (second["inserted"], second["updated"], second["unchanged"]) == (0, 0, 10)
+    assert second["rows"] == 0  # nothing was sent to the database
+    db.expire_all()
+    assert {lop: p.id for lop, p in stored(db).items()} == ids
+
+
+def test_changed_row_is_updated_in_place(db):
+    load(db, [project(i) for i in range(10)])
+    before = stored(db)
+    ids = {lop: p.id for lop, p in before.items()}
+    hashes = {lop: p.row_hash for lop, p in before.items()}
+
+    rows = [project(i) for i in range(10)]
+    rows[3] = project(3, stage="F5", jumlah_aktivitas=40)
+    stats = load(db, rows)
+    assert (stats["inserted"], stats["updated"], stats["unchanged"]) == (0, 1, 9)
+
+    db.expire_all()
+    after = stored(db)
+    assert {lop: p.id for lop, p in after.items()} == ids
+    assert (after["LOP-3"].stage, after["LOP-3"].jumlah_aktivitas) == ("F5", 40)
+    assert after["LOP-3"].row_hash != hashes["LOP-3"]
+    assert all(after[lop].row_hash == hashes[lop] for lop in ids if lop != "LOP-3")
+
+
+def test_new_quarter_is_inserted_next_to_existing_rows(db):
+    load(db, [project(i) for i in range(5)])
+    stats = load(db, [project(i) for i in range(5)] + [project(i, quarter="Q2 2025") for i in range(5)])
+    assert (stats["inserted"], stats["unchanged"]) == (5, 5)
+    assert db.scalar(select(func.count()).select_from(Project)) == 10
+
+
+def test_upsert_keeps_last_of_repeated_key_and_skips_rows_without_key(db):
+    stats = load(db, [project(1), project(1, stage="F4"), project(2, lop_id=None)])
+    assert stats["skipped"] == 1
+    assert stats["rows"] == 1
+    rows = stored(db)
+    assert list(rows) == ["LOP-1"]
+    assert rows["LOP-1"].stage == "F4"
+
+
+def test_unknown_mode_is_rejected(db):
+    with pytest.raises(ValueError):
+        BulkLoader(db, mode="merge")
+
+
+# ------------------------------------------------
+# load_all_json: re-running the same input (idempotent load)
+# ------------------------------------------------
+
+@pytest.fixture
+def input_dir(tmp_path, monkeypatch):
+    sheets = {
+        "project": [project(i) for i in range(6)],
+        "kinerja": [
+            {"nik": 40100000 + i, "name": f"AE {i}", "revenue": 0.5 * i, "sales_hsi": i, "nps": "7.5", "unit": "DGS"}
+            for i in range(3)
+        ],
+        "unknown sheet": [{"nik": 1}],
+    }
+    data = {"quarters": [{"quarter": "Q1 2025", "sheets": sheets}]}
+    (tmp_path / "input_data_all_quarters.json").write_text(json.dumps(data))
+    monkeypatch.setattr(load_all_json, "BASE_PATH", str(tmp_path))
+    return tmp_path
+
+
+def run_raw_sheets(db):
+    loader = BulkLoader(db, mode="upsert")
+    load_all_json.load_raw_sheets(db, loader)
+    db.commit()
+    return loader.stats
+
+
+def test_load_raw_sheets_twice_changes_nothing(db, input_dir):
+    first = run_raw_sheets(db)
+    assert first["project"]["inserted"] == 6
+    assert first["kinerja"]["inserted"] == 3
+    assert db.get(Kinerja, 1).nps == 7.5
+
+    second = run_raw_sheets(db)
+    for table in ("project", "kinerja"):
+        assert second[table]["inserted"] == second[table]["updated"] == 0
+        assert second[table]["rows"] == 0
+    assert second["project"]["unchanged"] == 6
+    assert db.scalar(select(func.count()).select_from(Project)) == 6
+
+
+def test_dataset_version_moves_only_when_rows_change(db, input_dir):
+    run_raw_sheets(db)
+    assert read_dataset_versions(db) == {SHEETS: 1}
+
+    run_raw_sheets(db)
+    assert read_dataset_versions(db) == {SHEETS: 1}
+
+    data = json.loads((input_dir / "input_data_all_quarters.json").read_text())
+    data["quarters"][0]["sheets"]["project"][0]["stage"] = "F4"
+    (input_dir / "input_data_all_quarters.json").write_text(json.dumps(data))
+    assert run_raw_sheets(db)["project"]["updated"] == 1
+    assert read_dataset_versions(db) == {SHEETS: 2}
+
+
+def test_append_mode_counts_written_rows(db):
+    loader = BulkLoader(db, mode="append")
+    assert not loader.wrote(Project)
+    loader.add(Project, project(0), quarter="Q1 2025", sheet="project")
+    loader.flush()
+    assert loader.wrote(Project) and not loader.wrote(Kinerja)
@@ -0,0 +1,64 @@
+import threading
+import time
+import pytest
+from app.core import concurrency
+from app.core.concurrency import run_in_sessions
+
+
+def sleeper(seconds: float, value):
+    def task(db):
+        time.sleep(seconds)
+        return value, threading.current_thread().name
+    return task
+
+
+def test_results_keep_their_keys():
+    tasks = {f"t{i}": sleeper(0.01 * (5 - i), i) for i in range(5)}
+    results = run_in_sessions(tasks)
+    assert list(results) == list(tasks)
+    assert [v for v, _ in results.values()] == list(range(5))
+
+
+def test_idle_pool_runs_tasks_in_parallel():
+    start = time.perf_counter()
+    results = run_in_sessions({i: sleeper(0.2, i) for i in range(4)})
+    assert time.perf_counter() - start < 0.6
+    assert len({name for _, name in results.values()}) == 4
+
+
+def test_saturated_pool_falls_back_to_the_calling_thread():
+    taken = 0
+    while concurrency._slots.acquire(blocking=False):  # other requests hold every worker
+        taken += 1
+    try:
+        results = run_in_sessions({i: sleeper(0.01, i) for i in range(4)})
+    finally:
+        for _ in range(taken):
+            concurrency._slots.release()
+    assert {name for _, name in results.values()} == {threading.current_thread().name}
+
+
+def test_one_request_takes_at_most_its_share(monkeypatch):
+    monkeypatch.setattr(concurrency.settings, "DB_FANOUT_PER_REQUEST", 2)
+    results = run_in_sessions({i: sleeper(0.01, i) for i in range(6)})
+    names = [name for _, name in results.values()]
+    assert names.count(threading.current_thread().name) == 4
+    # every slot is handed back
+    assert all(concurrency._slots.acquire(blocking=False) for _ in range(concurrency._workers))
+    for _ in range(concurrency._workers):
+        concurrency._slots.release()
+
+
+def test_failure_is_raised_after_the_workers_finish():
+    finished = threading.Event()
+
+    def slow(db):
+        time.sleep(0.1)
+        finished.set()
+
+    def broken(db):
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        run_in_sessions({"broken": broken, "slow": slow})
+    assert finished.is_set()
@@ -0,0 +1,22 @@
+from app.models.kinerja import Kinerja
+from app.scripts.explain_check import endpoint_queries, run_check
+from app.utils.pagination import PageParams, page_statement
+
+
+def test_every_filtered_endpoint_uses_an_index(db):
+    assert run_check() == 0
+
+
+def test_keyset_pages_are_checked_as_the_routers_send_them(db):
+    sql = [str(stmt) for _, stmt in endpoint_queries()]
+    assert any("ORDER BY" in s and "LIMIT" in s and "id >" in s for s in sql)
+    assert any("count(*)" in s for s in sql)
+
+
+def test_page_statement_reads_one_row_ahead():
+    params = PageParams(limit=10, cursor=5, fields="nik", stream=False, accept=None)
+    stmt, names = page_statement(Kinerja, [Kinerja.quarter == "Q1 2025"], params, lookahead=1)
+    assert names == ["nik"]
+    compiled = stmt.compile(compile_kwargs={"literal_binds": True})
+    assert "LIMIT 11" in str(compiled)
+    assert "kinerja.id > 5" in str(compiled)
@@ -0,0 +1,104 @@
+import io
+import json
+from pathlib import Path
+import pytest
+from app.utils.json_stream import JsonStream, iter_json_array, iter_keyed_arrays, iter_quarter_sheets
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "app" / "data"
+
+# tiny sizes split nearly every token; the large ones hit the usual read path
+CHUNK_SIZES = [1, 2, 3, 4, 5, 7, 8, 11, 13, 16, 31, 64, 127, 1024, 64 * 1024]
+
+
+def data_file(name: str):
+    path = DATA_DIR / name
+    if not path.exists():
+        pytest.skip(f"{name} not present")
+    return path
+
+
+def sheet_row(i: int, quarter: str):
+    return {
+        "nik": 40100000 + i,
+        "name": f"AE \"{i}\" \u00e9\t",
+        "periode": quarter,
+        "score": i * 0.85 - 3,
+        "ratio": -12.5e-3 * i,
+        "big": 1e10 + i,
+        "flag": i % 2 == 0,
+        "note": None,
+        "tags": [i, [i + 0.5], {"k": -i}],
+    }
+
+
+@pytest.fixture
+def keyed_arrays_file(tmp_path):
+    """{quarter: [wp rows]} like winprob_predictions_by_quarter.json."""
+    data = {
+        q: [{**sheet_row(i, q), "lop_id": f"LOP-{q}-{i}", "win_probability": i / 7} for i in range(25)]
+        for q in ("Q1 2025", "Q2 2025", "Q3 2025")
+    }
+    data["Q4 2025"] = []
+    path = tmp_path / "wp_by_quarter.json"
+    path.write_text(json.dumps(data, indent=1))
+    return path
+
+
+@pytest.fixture
+def quarter_sheets_file(tmp_path):
+    """{"quarters": [{quarter, sheets}]} like input_data_all_quarters.json."""
+    quarters = [
+        {"quarter": q, "source": {"file": f"{q}.xlsx"}, "sheets": {
+            sheet: [sheet_row(i, q) for i in range(n)]
+            for sheet, n in (("orientasi", 12), ("kinerja", 9), ("project", 0))
+        }}
+        for q in ("Q1 2025", "Q2 2025")
+    ]
+    # "sheets" before "quarter": that quarter is buffered before yielding
+    quarters.append({"sheets": {"kinerja": [sheet_row(i, "Q3 2025") for i in range(5)]}, "quarter": "Q3 2025"})
+    path = tmp_path / "input_all_quarters.json"
+    path.write_text(json.dumps({"version": 1.5, "quarters": quarters}))
+    return path
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_numbers_split_at_chunk_boundary(chunk_size):
+    values = [0.85, 12345, -12.5e-3, 1e5, 1E+10, -0.0, 3.14159, 0, 42, True, None, "7.5"]
+    text = json.dumps(values)
+    stream = JsonStream(io.StringIO(text), chunk_size)
+    assert list(stream.iter_values()) == values
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_every_data_file_as_one_value(chunk_size):
+    for path in sorted(DATA_DIR.glob("*.json")):
+        with open(path) as f:
+            expected = json.load(f)
+        with open(path) as f:
+            assert JsonStream(f, chunk_size).read_value() == expected, path.name
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_iter_json_array(chunk_size):
+    path = data_file("evaluation__predictions__q4_2025.json")
+    expected = json.loads(path.read_text())
+    assert list(iter_json_array(str(path), chunk_size)) == expected
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_iter_keyed_arrays(chunk_size, keyed_arrays_file):
+    path = keyed_arrays_file
+    expected = [(key, item) for key, items in json.loads(path.read_text()).items() for item in items]
+    assert list(iter_keyed_arrays(str(path), chunk_size)) == expected
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_iter_quarter_sheets(chunk_size, quarter_sheets_file):
+    path = quarter_sheets_file
+    expected = [
+        (q["quarter"], sheet, row)
+        for q in json.loads(path.read_text())["quarters"]
+        for sheet, rows in q["sheets"].items()
+        for row in rows
+    ]
+    assert list(iter_quarter_sheets(str(path), chunk_size)) == expected
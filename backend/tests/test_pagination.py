@@ -0,0 +1,96 @@
+import pytest
+from app.models.kinerja import Kinerja
+from app.models.orientasi import Orientasi
+
+QUARTER = "Q1 2025"
+
+
+@pytest.fixture
+def kinerja(db):
+    for i in range(23):
+        db.add(Kinerja(nik=40100000 + i, name=f"AE {i}", quarter=QUARTER, revenue=i * 1.5, nps=7.0, row_hash="x"))
+    for i in range(4):
+        db.add(Kinerja(nik=40100000 + i, name=f"AE {i}", quarter="Q2 2025", revenue=0.0))
+    db.commit()
+    return db
+
+
+def pages(client, path, **params):
+    """Follow X-Next-Cursor until the last page."""
+    result = []
+    while True:
+        response = client.get(path, params=params)
+        assert response.status_code == 200
+        result.append(response)
+        cursor = response.headers.get("x-next-cursor")
+        if cursor is None:
+            return result
+        params["cursor"] = cursor
+
+
+def test_without_limit_the_whole_result_is_returned(client, kinerja):
+    response = client.get(f"/kinerja/{QUARTER}")
+    rows = response.json()
+    assert len(rows) == 23
+    assert [r["nik"] for r in rows] == sorted(r["nik"] for r in rows)
+    assert "x-total-count" not in response.headers
+    assert "row_hash" not in rows[0]
+
+
+def test_keyset_pages_cover_every_row_once(client, kinerja):
+    responses = pages(client, f"/kinerja/{QUARTER}", limit=5)
+    assert [len(r.json()) for r in responses] == [5, 5, 5, 5, 3]
+    assert {r.headers["x-total-count"] for r in responses} == {"23"}
+
+    niks = [row["nik"] for r in responses for row in r.json()]
+    assert niks == [40100000 + i for i in range(23)]
+
+
+def test_cursor_is_the_last_id_of_the_page(client, kinerja):
+    first = client.get(f"/kinerja/{QUARTER}", params={"limit": 5})
+    ids = [row["id"] for row in first.json()]
+    assert first.headers["x-next-cursor"] == str(ids[-1])
+
+    second = client.get(f"/kinerja/{QUARTER}", params={"limit": 5, "cursor": ids[-1]})
+    assert all(row["id"] > ids[-1] for row in second.json())
+
+
+def test_exact_multiple_has_no_next_cursor(client, kinerja):
+    response = client.get("/kinerja/Q2 2025", params={"limit": 4})
+    assert len(response.json()) == 4
+    assert "x-next-cursor" not in response.headers
+
+
+def test_cursor_past_the_end_is_an_empty_page(client, kinerja):
+    response = client.get(f"/kinerja/{QUARTER}", params={"limit": 5, "cursor": 10_000})
+    assert response.json() == []
+    assert response.headers["x-total-count"] == "23"
+
+
+def test_fields_projection(client, kinerja):
+    rows = client.get(f"/kinerja/{QUARTER}", params={"limit": 2, "fields": "nik, revenue"}).json()
+    assert rows == [{"nik": 40100000, "revenue": 0.0}, {"nik": 40100001, "revenue": 1.5}]
+
+
+@pytest.mark.parametrize("params, status", [
+    ({"fields": "nik,secret"}, 400),
+    ({"fields": "row_hash"}, 400),
+    ({"limit": 0}, 422),
+    ({"limit": 5001}, 422),
+    ({"limit": "ten"}, 422),
+    ({"cursor": -1}, 422),
+    ({"cursor": "abc"}, 422),
+])
+def test_invalid_parameters(client, kinerja, params, status):
+    response = client.get(f"/kinerja/{QUARTER}", params=params)
+    assert response.status_code == status
+    if status == 400:
+        assert "Unknown field" in response.json()["detail"]
+
+
+def test_orientasi_summary_fields_are_validated(client, db):
+    db.add(Orientasi(nik=1, name="A", quarter=QUARTER, basic_understanding=3.5, twinning=2.0))
+    db.commit()
+    rows = client.get(f"/orientasi/quarter/{QUARTER}", params={"fields": "nik,twinning"}).json()
+    assert rows == [{"nik": 1, "twinning": 2.0}]
+    assert client.get(f"/orientasi/quarter/{QUARTER}", params={"fields": "solution"}).status_code == 400
@@ -0,0 +1,112 @@
+import time
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+import pytest
+from app.core.response_cache import MemoryBackend, route_datasets, strong_etag
+from app.models.kinerja import Kinerja
+from app.services.version_service import SHEETS, WP, bump_dataset_version
+
+PATH = "/kinerja/Q1 2025"
+
+
+@pytest.fixture
+def kinerja(db):
+    db.add(Kinerja(nik=1, name="A", quarter="Q1 2025", revenue=1.0))
+    bump_dataset_version(db, SHEETS)
+    db.commit()
+    return db
+
+
+def test_second_request_is_a_hit_with_the_same_etag(client, kinerja):
+    first = client.get(PATH)
+    second = client.get(PATH)
+    assert (first.headers["x-cache"], second.headers["x-cache"]) == ("MISS", "HIT")
+    assert first.headers["etag"] == second.headers["etag"] == strong_etag(first.content)
+    assert first.content == second.content
+    assert second.headers["cache-control"] == "no-cache"
+    assert "last-modified" in first.headers
+
+
+def test_query_string_is_part_of_the_key(client, kinerja):
+    assert client.get(PATH, params={"limit": 1}).headers["x-cache"] == "MISS"
+    assert client.get(PATH, params={"limit": 2}).headers["x-cache"] == "MISS"
+    assert client.get(PATH, params={"limit": 1}).headers["x-cache"] == "HIT"
+
+
+def test_page_headers_are_kept(client, kinerja):
+    client.get(PATH, params={"limit": 1})
+    hit = client.get(PATH, params={"limit": 1})
+    assert hit.headers["x-cache"] == "HIT"
+    assert hit.headers["x-total-count"] == "1"
+    assert hit.headers["content-type"] == "application/json"
+
+
+def test_if_none_match_gives_304(client, kinerja):
+    etag = client.get(PATH).headers["etag"]
+    for tags in (etag, f'"other", {etag}', "*"):
+        response = client.get(PATH, headers={"If-None-Match": tags})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+    assert client.get(PATH, headers={"If-None-Match": '"other"'}).status_code == 200
+
+
+def test_if_modified_since(client, kinerja):
+    client.get(PATH)
+    later = format_datetime(datetime.now(timezone.utc) + timedelta(days=1), usegmt=True)
+    earlier = format_datetime(datetime(2000, 1, 1, tzinfo=timezone.utc), usegmt=True)
+    assert client.get(PATH, headers={"If-Modified-Since": later}).status_code == 304
+    assert client.get(PATH, headers={"If-Modified-Since": earlier}).status_code == 200
+    assert client.get(PATH, headers={"If-Modified-Since": "garbage"}).status_code == 200
+
+
+def test_version_bump_invalidates(client, kinerja):
+    before = client.get(PATH)
+    kinerja.add(Kinerja(nik=2, name="B", quarter="Q1 2025", revenue=2.0))
+    bump_dataset_version(kinerja, SHEETS)
+    kinerja.commit()
+
+    after = client.get(PATH)
+    assert after.headers["x-cache"] == "MISS"
+    assert len(after.json()) == 2
+    assert after.headers["etag"] != before.headers["etag"]
+    # the old validator no longer matches
+    assert client.get(PATH, headers={"If-None-Match": before.headers["etag"]}).status_code == 200
+
+
+def test_unrelated_bump_keeps_the_body(client, kinerja):
+    before = client.get(PATH)
+    bump_dataset_version(kinerja, WP)
+    kinerja.commit()
+    after = client.get(PATH)
+    assert after.headers["etag"] == before.headers["etag"]
+
+
+def test_errors_and_other_methods_are_not_cached(client, kinerja):
+    for _ in range(2):
+        response = client.get("/orientasi/nik/999")
+        assert response.status_code == 404
+        assert "x-cache" not in response.headers
+    assert "x-cache" not in client.get("/health/db").headers  # route without datasets
+    assert "x-cache" not in client.post("/wp/projects", json={"lop_ids": ["LOP-1"]}).headers
+
+
+def test_route_datasets():
+    assert route_datasets("/journey/1") == (SHEETS, WP, "ep")
+    assert route_datasets("/wp/all") == (WP,)
+    assert route_datasets("/wpx") is None
+    assert route_datasets("/docs") is None
+
+
+def test_memory_backend_lru_and_ttl():
+    backend = MemoryBackend(max_entries=2, ttl=60)
+    backend.set("a", 1)
+    backend.set("b", 2)
+    backend.get("a")
+    backend.set("c", 3)
+    assert (backend.get("a"), backend.get("b"), backend.get("c")) == (1, None, 3)
+
+    expiring = MemoryBackend(max_entries=2, ttl=0)
+    expiring.set("a", 1)
+    time.sleep(0.01)
+    assert expiring.get("a") is None
@@ -0,0 +1,68 @@
+import pytest
+from app.models.orientasi import Orientasi
+from app.models.project import Project
+from app.services.search_service import normalize_name, rebuild_ae_directory, search_directory
+
+NAMES = ["Budi Santoso", "Andi Wijaya", "Siti Rahayu", "Budiman Hakim"]
+
+
+@pytest.fixture
+def directory(db):
+    for i, name in enumerate(NAMES):
+        for quarter in ("Q1 2025", "Q2 2025"):
+            db.add(Orientasi(nik=40100000 + i, name=name, unit="DGS", quarter=quarter))
+        db.add(Project(nik=40100000 + i, name=name, lop_id=f"LOP-{i}", quarter="Q1 2025"))
+    db.add(Orientasi(nik=40100010, name="Dewi Lestari", unit="DES", quarter="Q2 2025"))
+    db.commit()
+    rebuild_ae_directory(db)
+    db.commit()
+    return db
+
+
+def test_normalize_name():
+    assert normalize_name("  José   ÁLVAREZ ") == "jose alvarez"
+    assert normalize_name(None) == ""
+
+
+def test_digits_match_the_exact_nik_only(directory):
+    assert [a["nik"] for a in search_directory(directory, "40100001")] == [40100001]
+    assert search_directory(directory, "4010000") == []
+
+
+def test_nik_prefix_is_opt_in(directory):
+    matches = search_directory(directory, "4010000", nik_prefix=True)
+    assert sorted(a["nik"] for a in matches) == [40100000, 40100001, 40100002, 40100003]
+
+    exact_first = search_directory(directory, "40100001", nik_prefix=True)
+    assert exact_first[0]["nik"] == 40100001
+    assert exact_first[0]["score"] > 1.0
+
+
+def test_name_search_ranks_prefix_first_and_tolerates_typos(directory):
+    assert [a["name"] for a in search_directory(directory, "budi")] == ["Budi Santoso", "Budiman Hakim"]
+    assert [a["name"] for a in search_directory(directory, "santosa")] == ["Budi Santoso"]
+
+
+def test_quarter_filter(directory):
+    assert [a["nik"] for a in search_directory(directory, "dewi")] == [40100010]
+    assert search_directory(directory, "dewi", quarter="Q1 2025") == []
+
+
+def test_global_search_sections_follow_the_exact_nik(directory, client):
+    body = client.get("/search", params={"query": "40100002"}).json()
+    assert [a["nik"] for a in body["ae"]] == [40100002]
+    assert {r["nik"] for r in body["orientasi"]} == {40100002}
+    assert [r["lop_id"] for r in body["projects"]] == ["LOP-2"]
+
+    body = client.get("/search", params={"query": "4010000"}).json()
+    assert body["ae"] == [] and body["orientasi"] == []
+
+    body = client.get("/search", params={"query": "4010000", "nik_prefix": "true"}).json()
+    assert len(body["ae"]) == 4
+
+
+def test_typeahead(directory, client):
+    response = client.get("/search/ae", params={"query": "siti", "limit": 5})
+    assert response.status_code == 200
+    assert [a["name"] for a in response.json()] == ["Siti Rahayu"]
+    assert response.json()[0]["quarters"] == ["Q1 2025", "Q2 2025"]
@@ -0,0 +1,86 @@
+import statistics
+import numpy as np
+import pytest
+from app.models.evaluasi_kinerja import EvaluasiKinerja
+from app.models.kinerja import Kinerja
+
+QUARTER = "Q1 2025"
+REVENUE = {"DGS": [1.0, 2.0, 4.0, 8.0, 10.0], "DES": [3.0, 5.0, 6.0]}
+
+
+@pytest.fixture
+def cohort(db):
+    i = 0
+    for unit, values in REVENUE.items():
+        for value in values:
+            db.add(Kinerja(nik=40100000 + i, name=f"AE {i}", unit=unit, quarter=QUARTER, revenue=value, nps=None))
+            i += 1
+    db.add(Kinerja(nik=40199999, name="Other quarter", unit="DGS", quarter="Q2 2025", revenue=1000.0))
+    db.add(EvaluasiKinerja(nik=40100000, name="AE 0", unit="DGS", quarter=QUARTER, overall_score=80.0, kuadran=1))
+    db.commit()
+    return db
+
+
+def get_stats(client, **params):
+    params.setdefault("metrics", "revenue")
+    return client.get(f"/stats/kinerja/{QUARTER}", params=params)
+
+
+def test_aggregates_and_percentiles_match_numpy(client, cohort):
+    body = get_stats(client, percentiles="10,50,90", bins=0).json()
+    values = REVENUE["DGS"] + REVENUE["DES"]
+    [group] = body["groups"]
+    revenue = group["metrics"]["revenue"]
+
+    assert group["count"] == len(values)
+    assert revenue["count"] == len(values)
+    assert revenue["avg"] == pytest.approx(statistics.fmean(values))
+    assert revenue["stddev"] == pytest.approx(statistics.pstdev(values))
+    assert (revenue["min"], revenue["max"]) == (1.0, 10.0)
+    assert revenue["percentiles"] == pytest.approx(dict(zip(("p10", "p50", "p90"), np.percentile(values, [10, 50, 90]))))
+    assert "histogram" not in revenue
+    assert body["histogram_edges"] == {}
+
+
+def test_group_by_unit(client, cohort):
+    body = get_stats(client, group_by="unit", percentiles="50", bins=0).json()
+    groups = {g["group"]: g["metrics"]["revenue"] for g in body["groups"]}
+    assert list(groups) == ["DES", "DGS"]
+    for unit, values in REVENUE.items():
+        assert groups[unit]["avg"] == pytest.approx(statistics.fmean(values))
+        assert groups[unit]["stddev"] == pytest.approx(statistics.pstdev(values))
+        assert groups[unit]["percentiles"]["p50"] == pytest.approx(statistics.median(values))
+
+
+def test_histogram_on_shared_edges(client, cohort):
+    body = get_stats(client, bins=3).json()
+    assert body["histogram_edges"]["revenue"] == pytest.approx([1.0, 4.0, 7.0, 10.0])
+    # [1, 4) [4, 7) [7, 10] -- the last bucket keeps the maximum
+    assert body["groups"][0]["metrics"]["revenue"]["histogram"] == [3, 3, 2]
+
+
+def test_metric_without_values(client, cohort):
+    nps = get_stats(client, metrics="nps", bins=5).json()["groups"][0]["metrics"]["nps"]
+    assert nps["count"] == 0
+    assert nps["avg"] is None and nps["stddev"] is None
+    assert "percentiles" not in nps and "histogram" not in nps
+
+
+@pytest.mark.parametrize("params", [
+    {"metrics": "revenue,unknown"},
+    {"metrics": "nik"},
+    {"group_by": "kuadran"},
+    {"percentiles": "50,abc"},
+    {"percentiles": "101"},
+    {"percentiles": "-1"},
+    {"percentiles": "nan"},
+    {"percentiles": "inf"},
+])
+def test_bad_parameters_are_rejected(client, cohort, params):
+    assert get_stats(client, **params).status_code == 400
+
+
+def test_unknown_sheet_and_empty_quarter(client, cohort):
+    assert client.get(f"/stats/unknown/{QUARTER}").status_code == 404
+    assert client.get("/stats/kinerja/Q4 2030").status_code == 404
+    assert client.get(f"/stats/evaluasi/{QUARTER}", params={"group_by": "kuadran"}).status_code == 200
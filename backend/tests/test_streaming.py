@@ -0,0 +1,63 @@
+import json
+import pytest
+from app.models.kinerja import Kinerja
+from app.models.wp import WinProbPrediction
+from app.utils import pagination
+
+QUARTER = "Q1 2025"
+
+
+@pytest.fixture
+def kinerja(db, monkeypatch):
+    monkeypatch.setattr(pagination, "STREAM_CHUNK_SIZE", 7)  # several server-side cursor round trips
+    for i in range(30):
+        db.add(Kinerja(nik=40100000 + i, name=f"AE \"{i}\"\n", quarter=QUARTER, revenue=i / 3))
+    db.add(Kinerja(nik=1, quarter="Q2 2025"))
+    db.commit()
+    return db
+
+
+def ndjson(response):
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert response.text.endswith("\n")
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def test_stream_matches_the_json_body(client, kinerja):
+    expected = client.get(f"/kinerja/{QUARTER}").json()
+    assert ndjson(client.get(f"/kinerja/{QUARTER}", params={"stream": "true"})) == expected
+    assert ndjson(client.get(f"/kinerja/{QUARTER}", headers={"Accept": "application/x-ndjson"})) == expected
+
+
+def test_stream_honours_limit_cursor_and_fields(client, kinerja):
+    first = client.get(f"/kinerja/{QUARTER}", params={"limit": 10, "fields": "id,nik"}).json()
+    rows = ndjson(client.get(f"/kinerja/{QUARTER}", params={
+        "stream": "true", "limit": 10, "cursor": first[4]["id"], "fields": "nik",
+    }))
+    assert rows == [{"nik": r["nik"]} for r in client.get(f"/kinerja/{QUARTER}").json()[5:15]]
+
+
+def test_stream_of_an_empty_result(client, kinerja):
+    response = client.get("/kinerja/Q9 2099", params={"stream": "true"})
+    assert response.status_code == 200
+    assert response.text == ""
+
+
+def test_streams_are_not_cached(client, kinerja):
+    for _ in range(2):
+        response = client.get(f"/kinerja/{QUARTER}", params={"stream": "true"})
+        assert "x-cache" not in response.headers
+        assert "etag" not in response.headers
+
+
+def test_wp_stream_carries_rows_only(client, db):
+    for i in range(3):
+        db.add(WinProbPrediction(quarter=QUARTER, lop_id=f"LOP-{i}", win_probability=i / 4))
+    db.commit()
+    rows = ndjson(client.get(f"/wp/{QUARTER}", params={"stream": "true", "fields": "lop_id,win_probability"}))
+    assert rows == [{"lop_id": f"LOP-{i}", "win_probability": i / 4} for i in range(3)]
+
+
+def test_invalid_fields_fail_before_streaming(client, kinerja):
+    assert client.get(f"/kinerja/{QUARTER}", params={"stream": "true", "fields": "nope"}).status_code == 400
@@ -0,0 +1,33 @@
+from app.core.db import SessionLocal
+from app.models.dataset_version import DatasetVersion
+from app.services import version_service
+from app.services.version_service import SHEETS, WP, bump_dataset_version, read_dataset_versions
+
+
+def test_bump_creates_then_increments(db):
+    bump_dataset_version(db, SHEETS)
+    bump_dataset_version(db, SHEETS, WP)
+    db.commit()
+    assert read_dataset_versions(db) == {SHEETS: 2, WP: 1}
+
+
+def test_bump_is_not_lost_next_to_another_loader(db):
+    bump_dataset_version(db, WP)
+    db.commit()
+
+    with SessionLocal() as other:
+        seen = other.get(DatasetVersion, WP)  # read before the first loader commits
+        assert seen.version == 1
+        bump_dataset_version(db, WP)
+        db.commit()
+        bump_dataset_version(other, WP)
+        other.commit()
+
+    assert read_dataset_versions(db)[WP] == 3
+
+
+def test_dataset_versions_pick_up_a_bump_in_the_same_process(db):
+    assert version_service.dataset_versions(db) == {}
+    bump_dataset_version(db, SHEETS)
+    db.commit()
+    assert version_service.dataset_versions(db) == {SHEETS: 1}
@@ -0,0 +1,100 @@
+import pytest
+from app.models.wp import WinProbMeta, WinProbPrediction
+from app.services import prediction_snapshot, version_service
+from app.services.prediction_snapshot import get_snapshot
+from app.services.version_service import WP, bump_dataset_version, refresh_dataset_versions
+
+# the row payload /wp always had (WinProbPrediction.to_dict)
+WP_KEYS = list(WinProbPrediction().to_dict())
+
+
+@pytest.fixture
+def predictions(db):
+    db.add(WinProbMeta(best_model_name="xgboost", metrics={"xgboost": {"auc": 0.9}}))
+    for i in range(5):
+        for quarter in ("Q1 2025", "Q2 2025"):
+            db.add(WinProbPrediction(
+                quarter=quarter, nik=40100000 + i % 2, name=f"AE {i % 2}", lop_id=f"LOP-{i}",
+                value_projects=1e6 * i, jumlah_aktivitas=i, win_probability=i / 10,
+                win_probability_pct=i * 10.0, predicted_class="LOSE",
+            ))
+    db.commit()
+    return db
+
+
+@pytest.fixture(params=["db", "snapshot"])
+def source(request, predictions, monkeypatch):
+    """Every /wp test runs against the DB queries and against the in-memory snapshot."""
+    if request.param == "snapshot":
+        monkeypatch.setattr(prediction_snapshot.settings, "PREDICTION_SNAPSHOT_ENABLED", True)
+        prediction_snapshot.load_snapshot()
+    yield request.param
+    prediction_snapshot._snapshot = None
+
+
+@pytest.mark.parametrize("path", [
+    "/wp/project/LOP-1",
+    "/wp/project/LOP-1/Q1 2025",
+    "/wp/ae/40100001",
+    "/wp/ae/40100001/Q2 2025",
+    "/wp/Q1 2025",
+    "/wp/Q1 2025?limit=2",
+    "/wp/all",
+])
+def test_rows_keep_the_baseline_payload(client, source, path):
+    body = client.get(path).json()
+    assert body["meta"] == {"best_model": "xgboost", "metrics": {"auc": 0.9}}
+    assert body["data"]
+    assert all(list(row) == WP_KEYS for row in body["data"])
+
+
+def test_batch_rows_keep_the_baseline_payload(client, source):
+    data = client.post("/wp/projects", json={"lop_ids": ["LOP-1", "LOP-9"], "quarter": "Q1 2025"}).json()["data"]
+    assert list(data["LOP-1"]) == WP_KEYS
+    assert data["LOP-9"] is None
+
+
+def test_id_is_not_a_selectable_field(client, source):
+    assert client.get("/wp/Q1 2025", params={"fields": "id"}).status_code == 400
+    rows = client.get("/wp/Q1 2025", params={"fields": "lop_id,win_probability"}).json()["data"]
+    assert rows[0] == {"lop_id": "LOP-0", "win_probability": 0.0}
+
+
+def test_cursor_still_pages_without_an_id_in_the_rows(client, source):
+    first = client.get("/wp/Q1 2025", params={"limit": 3})
+    assert first.headers["x-total-count"] == "5"
+    second = client.get("/wp/Q1 2025", params={"limit": 3, "cursor": first.headers["x-next-cursor"]})
+    lops = [r["lop_id"] for r in first.json()["data"] + second.json()["data"]]
+    assert lops == [f"LOP-{i}" for i in range(5)]
+    assert "x-next-cursor" not in second.headers
+
+
+# ------------------------------------------------
+# Snapshot freshness check
+# ------------------------------------------------
+
+@pytest.fixture
+def snapshot(predictions, monkeypatch):
+    monkeypatch.setattr(prediction_snapshot.settings, "PREDICTION_SNAPSHOT_ENABLED", True)
+    yield prediction_snapshot.load_snapshot()
+    prediction_snapshot._snapshot = None
+    prediction_snapshot._wake.clear()
+
+
+def test_snapshot_check_never_queries_the_database(snapshot, monkeypatch):
+    def blocked(db):
+        raise AssertionError("version query from get_snapshot")
+
+    monkeypatch.setattr(version_service, "_checked_at", 0.0)  # interval cache expired
+    monkeypatch.setattr(version_service, "_read_versions", blocked)
+    assert get_snapshot() is snapshot
+
+
+def test_snapshot_is_bypassed_once_a_newer_version_is_seen(db, snapshot):
+    bump_dataset_version(db, WP)
+    db.commit()
+    assert get_snapshot() is snapshot  # not seen by any version check yet
+
+    refresh_dataset_versions(db)  # response cache middleware / refresher thread
+    assert get_snapshot() is None
+    assert prediction_snapshot._wake.is_set()
@@ -0,0 +1,244 @@
+import json
+import pickle
+import numpy as np
+import pytest
+from sqlalchemy import func, select
+from app.models.project import Project
+from app.models.wp import WinProbMeta, WinProbPrediction
+from app.scripts.bulk_loader import BulkLoader
+from app.services import wp_scoring
+from app.services.meta_cache import get_wp_meta
+from app.services.version_service import WP, bump_dataset_version, read_dataset_versions
+from app.services.wp_scoring import (
+    PROJECT_COLUMNS,
+    LinearWPModel,
+    PickledWPModel,
+    feature_matrix,
+    load_model,
+    population_reference,
+    refresh_model_meta,
+    rescore_quarter,
+    score_columns,
+)
+
+FEATURES = ["log1p:value_projects", "jumlah_aktivitas", "stage=F2"]
+
+
+class LogisticEstimator:
+    """Stands in for a pickled scikit-learn estimator: fixed logistic weights."""
+
+    def __init__(self, weights, bias=0.0):
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self.bias = bias
+        # all positive: the importances say nothing about the direction
+        self.feature_importances_ = np.abs(self.weights)
+
+    def predict_proba(self, X):
+        p = 1.0 / (1.0 + np.exp(-(X @ self.weights + self.bias)))
+        return np.c_[1 - p, p]
+
+
+def sigmoid(z):
+    return 1.0 / (1.0 + np.exp(-z))
+
+
+def project(i: int, jumlah_aktivitas=5, value_projects=1_000_000.0, stage="F1", quarter="Q1 2025"):
+    return {
+        "quarter": quarter, "nik": 40100000 + i, "name": f"AE {i}", "unit": "DGS",
+        "lop_id": f"LOP-{i}", "project_name": f"Project {i}", "customer_name": "PT Contoh",
+        "stage": stage, "status": "OPEN", "value_projects": value_projects,
+        "jumlah_aktivitas": jumlah_aktivitas,
+    }
+
+
+def columns(*projects):
+    return {c: [p[c] for p in projects] for c in PROJECT_COLUMNS}
+
+
+# activity lowers the win probability in this model
+DECREASING = PickledWPModel({"model": LogisticEstimator([0.0, -0.3, 1.0]), "features": FEATURES})
+QUARTER = columns(project(0, jumlah_aktivitas=0), project(1, jumlah_aktivitas=5), project(2, jumlah_aktivitas=10))
+
+
+def test_feature_matrix():
+    X = feature_matrix(columns(project(0, value_projects=None, stage="F2")), FEATURES)
+    assert np.isnan(X[0, 0])
+    assert X[0, 1:].tolist() == [5.0, 1.0]
+    assert feature_matrix(columns(project(0)), ["log1p:value_projects"])[0, 0] == pytest.approx(np.log1p(1e6))
+
+    with pytest.raises(ValueError):
+        feature_matrix(columns(project(0)), ["sqrt:value_projects"])
+
+
+# ------------------------------------------------
+# LinearWPModel
+# ------------------------------------------------
+
+LINEAR = {
+    "name": "logistic_regression",
+    "features": ["jumlah_aktivitas", "stage=F1", "stage=F2"],
+    "coef": [0.5, -1.0, 2.0],
+    "intercept": -0.2,
+    "mean": [5.0, 0.5, 0.5],
+    "scale": [2.0, 0.5, 0.0],  # zero scale is read as 1
+}
+
+
+def test_linear_model_probability_and_factors():
+    model = LinearWPModel(LINEAR)
+    X = feature_matrix(columns(project(0, jumlah_aktivitas=9, stage="F2"), project(1, jumlah_aktivitas=None)), model.features)
+
+    z = 0.5 * (9 - 5) / 2 - 1.0 * (0 - 0.5) / 0.5 + 2.0 * (1 - 0.5) - 0.2
+    assert model.predict_proba(X)[0] == pytest.approx(sigmoid(z))
+
+    contrib = model.contributions(X)
+    assert model.sources == ["jumlah_aktivitas", "stage"]
+    assert contrib[0].tolist() == pytest.approx([1.0, 1.0 + 1.0])  # one-hots summed on "stage"
+    assert contrib[1, 0] == 0.0  # NULL -> training mean
+
+    positive, negative = wp_scoring.top_factors(model, X)
+    assert positive[0] == "stage" and negative[0] is None
+    assert positive[1] is None and negative[1] == "stage"
+
+
+# ------------------------------------------------
+# PickledWPModel: signed probability deltas
+# ------------------------------------------------
+
+def test_factor_follows_the_direction_of_the_model():
+    reference = population_reference(DECREASING, QUARTER)
+    assert reference.tolist() == pytest.approx([np.log1p(1e6), 5.0, 0.0])
+
+    rows = score_columns(DECREASING, QUARTER, reference)
+    # more activity than the quarter lowers the probability: a negative factor
+    assert (rows[2]["top_positive_factors"], rows[2]["top_negative_factors"]) == (None, "jumlah_aktivitas")
+    assert (rows[0]["top_positive_factors"], rows[0]["top_negative_factors"]) == ("jumlah_aktivitas", None)
+    assert (rows[1]["top_positive_factors"], rows[1]["top_negative_factors"]) == (None, None)
+
+    increasing = PickledWPModel({"model": LogisticEstimator([0.0, 0.3, 1.0]), "features": FEATURES})
+    rows = score_columns(increasing, QUARTER, reference)
+    assert rows[2]["top_positive_factors"] == "jumlah_aktivitas"
+
+
+def test_contribution_is_the_delta_against_the_reference():
+    reference = np.array([np.log1p(1e6), 5.0, 0.25])
+    X = feature_matrix(columns(project(0, jumlah_aktivitas=8, stage="F2")), FEATURES)
+    contrib = DECREASING.contributions(X, reference)
+
+    assert DECREASING.sources == ["jumlah_aktivitas", "stage", "value_projects"]
+    p = sigmoid(-0.3 * 8 + 1.0)
+    assert contrib[0].tolist() == pytest.approx([
+        p - sigmoid(-0.3 * 5 + 1.0),
+        p - sigmoid(-0.3 * 8 + 0.25),
+        0.0,
+    ])
+
+
+def test_factors_do_not_depend_on_the_batch():
+    reference = population_reference(DECREASING, QUARTER)
+    alone = score_columns(DECREASING, columns(project(2, jumlah_aktivitas=10)), reference)
+    assert alone[0] == score_columns(DECREASING, QUARTER, reference)[2]
+
+
+def test_training_mean_is_the_reference_when_the_artifact_has_one():
+    model = PickledWPModel({
+        "model": LogisticEstimator([0.0, -0.3, 1.0]), "features": FEATURES, "mean": [0.0, 20.0, 0.0],
+    })
+    assert population_reference(model, QUARTER) is None
+    # every project has less activity than in training
+    rows = score_columns(model, QUARTER, reference=np.array([0.0, 0.0, 0.0]))
+    assert [r["top_positive_factors"] for r in rows] == ["jumlah_aktivitas"] * 3
+
+
+def test_pickled_probability_and_threshold():
+    model = PickledWPModel({"model": LogisticEstimator([0.0, -0.3, 1.0]), "features": FEATURES, "threshold": 0.2})
+    rows = score_columns(model, QUARTER)
+    assert [r["win_probability"] for r in rows] == pytest.approx([0.5, sigmoid(-1.5), sigmoid(-3.0)])
+    assert [r["predicted_class"] for r in rows] == ["WIN", "LOSE", "LOSE"]
+    assert rows[0]["win_probability_pct"] == pytest.approx(50.0)
+    assert score_columns(model, columns()) == []
+
+
+# ------------------------------------------------
+# Artifacts
+# ------------------------------------------------
+
+def test_load_model_reads_json_and_pickle(tmp_path, monkeypatch):
+    linear = tmp_path / "wp.json"
+    linear.write_text(json.dumps(LINEAR))
+    pickled = tmp_path / "wp.pkl"
+    pickled.write_bytes(pickle.dumps({
+        "model": LogisticEstimator([0.0, -0.3, 1.0]), "features": FEATURES, "name": "xgboost",
+    }))
+
+    assert isinstance(load_model(str(linear)), LinearWPModel)
+    model = load_model(str(pickled))
+    assert (model.name, model.features) == ("xgboost", FEATURES)
+    assert load_model(str(pickled)) is model  # cached until the file changes
+
+    monkeypatch.setattr(wp_scoring.settings, "WP_MODEL_PATH", "")
+    with pytest.raises(RuntimeError):
+        load_model()
+
+
+# ------------------------------------------------
+# rescore_quarter
+# ------------------------------------------------
+
+@pytest.fixture
+def projects(db):
+    for i, jumlah in enumerate([0, 5, 10]):
+        db.add(Project(**project(i, jumlah_aktivitas=jumlah)))
+    db.add(Project(**project(3, quarter="Q2 2025")))
+    db.add(WinProbMeta(best_model_name="xgboost", metrics={"xgboost": {"auc": 0.9}}))
+    bump_dataset_version(db, WP)  # loaded before, as in production
+    db.commit()
+    return db
+
+
+def rescore(db, model, *quarters):
+    """One rescore_wp run: every quarter in one transaction."""
+    loader = BulkLoader(db, mode="upsert")
+    count = sum(rescore_quarter(db, model, quarter, loader) for quarter in quarters or ["Q1 2025"])
+    db.commit()
+    return count, loader.stats["wp_predictions"]
+
+
+def test_rescore_quarter_writes_predictions_and_meta(projects):
+    model = PickledWPModel({
+        "model": LogisticEstimator([0.0, -0.3, 1.0]), "features": FEATURES,
+        "name": "gradient_boosting", "metrics": {"auc": 0.8},
+    })
+    count, stats = rescore(projects, model)
+    assert count == stats["inserted"] == 3
+
+    stored = {p.lop_id: p for p in projects.execute(select(WinProbPrediction)).scalars()}
+    assert list(stored) == ["LOP-0", "LOP-1", "LOP-2"]
+    assert stored["LOP-2"].win_probability == pytest.approx(sigmoid(-3.0))
+    assert stored["LOP-2"].top_negative_factors == "jumlah_aktivitas"
+    assert stored["LOP-0"].top_positive_factors == "jumlah_aktivitas"
+
+    # the meta names the model that scored the rows, earlier metrics are kept
+    assert get_wp_meta(projects) == {"best_model": "gradient_boosting", "metrics": {"auc": 0.8}}
+    latest = projects.execute(select(WinProbMeta).order_by(WinProbMeta.id.desc())).scalars().first()
+    assert latest.metrics == {"xgboost": {"auc": 0.9}, "gradient_boosting": {"auc": 0.8}}
+    assert read_dataset_versions(projects) == {WP: 2}
+
+
+def test_rescoring_again_changes_nothing(projects):
+    model = PickledWPModel({"model": LogisticEstimator([0.0, -0.3, 1.0]), "features": FEATURES, "name": "gbm"})
+    assert rescore(projects, model, "Q1 2025", "Q2 2025")[0] == 4
+    count, stats = rescore(projects, model)
+
+    assert count == 3
+    assert stats["inserted"] == stats["updated"] == 0
+    assert projects.scalar(select(func.count()).select_from(WinProbMeta)) == 2
+    assert read_dataset_versions(projects) == {WP: 2}
+
+
+def test_refresh_model_meta_without_a_previous_row(db):
+    model = LinearWPModel({**LINEAR, "metrics": {"auc": 0.7}})
+    assert refresh_model_meta(db, model)
+    db.commit()
+    assert get_wp_meta(db) == {"best_model": "logistic_regression", "metrics": {"auc": 0.7}}
+    assert not refresh_model_meta(db, model)
@@ -0,0 +1,93 @@
+import pickle
+import numpy as np
+import pytest
+from app.models.project import Project
+from app.routers.win_probability import MAX_SCENARIOS
+from app.services import wp_scoring
+from app.services.wp_simulation import clear_simulation_cache
+
+
+class ActivityEstimator:
+    """Pickled stand-in estimator: the probability only follows jumlah_aktivitas."""
+
+    def __init__(self, slope: float):
+        self.slope = slope
+
+    def predict_proba(self, X):
+        p = 1.0 / (1.0 + np.exp(-self.slope * (X[:, 1] - 5)))
+        return np.c_[1 - p, p]
+
+
+def model_file(tmp_path, slope: float):
+    path = tmp_path / f"wp_{slope}.pkl"
+    path.write_bytes(pickle.dumps({
+        "model": ActivityEstimator(slope),
+        "features": ["log1p:value_projects", "jumlah_aktivitas", "stage=F2"],
+        "name": "activity",
+    }))
+    return str(path)
+
+
+@pytest.fixture
+def projects(db):
+    # LOP-1 sits on the quarter mean of every feature
+    for i, jumlah in enumerate([0, 5, 10]):
+        db.add(Project(
+            quarter="Q1 2025", nik=40100000 + i, name=f"AE {i}", lop_id=f"LOP-{i}",
+            value_projects=1_000_000.0, jumlah_aktivitas=jumlah, stage="F1", status="OPEN",
+        ))
+    db.commit()
+    clear_simulation_cache()
+    yield db
+    clear_simulation_cache()
+
+
+@pytest.fixture(params=[0.8, -0.8], ids=["increasing", "decreasing"])
+def model_path(request, projects, tmp_path, monkeypatch):
+    monkeypatch.setattr(wp_scoring.settings, "WP_MODEL_PATH", model_file(tmp_path, request.param))
+    return request.param
+
+
+def simulate(client, lop_id="LOP-1", **scenario_fields):
+    scenarios = scenario_fields.pop("scenarios", None) or [scenario_fields]
+    return client.post("/wp/simulate", json={"lop_id": lop_id, "scenarios": scenarios})
+
+
+def test_no_model_is_503(client, projects):
+    assert simulate(client, jumlah_aktivitas=3).status_code == 503
+
+
+def test_unknown_project_is_404(client, model_path):
+    assert simulate(client, "LOP-404", jumlah_aktivitas=3).status_code == 404
+
+
+def test_too_many_scenarios_is_422(client, model_path):
+    response = simulate(client, scenarios=[{"jumlah_aktivitas": 1}] * (MAX_SCENARIOS + 1))
+    assert response.status_code == 422
+
+
+def test_factor_signs_follow_the_deltas(client, model_path):
+    body = simulate(client, scenarios=[{"jumlah_aktivitas": 9}, {"jumlah_aktivitas": 1}, {"value_projects": 5e6}]).json()
+    assert body["baseline"]["top_positive_factors"] is None
+    assert body["baseline"]["top_negative_factors"] is None
+
+    for scenario in body["scenarios"]:
+        if scenario["delta"] > 0:
+            assert (scenario["top_positive_factors"], scenario["top_negative_factors"]) == ("jumlah_aktivitas", None)
+        elif scenario["delta"] < 0:
+            assert (scenario["top_positive_factors"], scenario["top_negative_factors"]) == (None, "jumlah_aktivitas")
+        else:
+            assert (scenario["top_positive_factors"], scenario["top_negative_factors"]) == (None, None)
+
+    more, less, value = [s["delta"] for s in body["scenarios"]]
+    assert np.sign(more) == np.sign(model_path) == -np.sign(less)
+    assert value == 0.0
+
+
+def test_repeated_scenarios_come_from_the_cache(client, model_path):
+    first = simulate(client, scenarios=[{"jumlah_aktivitas": 2}, {"jumlah_aktivitas": 7}]).json()
+    assert (first["scored"], first["cached"]) == (3, 0)
+
+    again = simulate(client, scenarios=[{"jumlah_aktivitas": 7}, {"jumlah_aktivitas": 8}]).json()
+    assert (again["scored"], again["cached"]) == (1, 2)
+    assert again["scenarios"][0] == first["scenarios"][1]